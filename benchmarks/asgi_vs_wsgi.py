@@ -0,0 +1,99 @@
+"""
+Compare the projects endpoints under WSGI (gunicorn) and ASGI (uvicorn).
+
+Usage, from the repository root::
+
+    python -m benchmarks.asgi_vs_wsgi --seed 200 --requests 2000 --concurrency 32
+
+Three targets are measured with the same number of worker processes:
+
+* ``/api/projects/`` under gunicorn sync workers (WSGI)
+* ``/api/projects/`` under uvicorn workers (DRF view adapted to ASGI)
+* ``/api/async/projects/`` under uvicorn workers (native async view)
+
+The response cache is disabled with a dummy cache backend so every request
+reaches the database.
+"""
+
+import argparse
+import os
+import sys
+
+from benchmarks.http_load import (
+    print_results,
+    run_load,
+    run_server,
+    seed_projects,
+    temporary_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--query", default="?limit=20")
+    args = parser.parse_args()
+
+    # A fresh database, deleted afterwards, so the configured one is left alone
+    with temporary_database():
+        benchmark(args)
+
+
+def benchmark(args):
+    os.environ["CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    seed_projects(args.seed)
+
+    # An empty config instead of ./gunicorn.conf.py, which gunicorn would load
+    # from the working directory: the production profile picks its own worker
+    # class, preloads, warms caches and recycles workers during the run
+    gunicorn = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "-c",
+        os.devnull,
+        "-w",
+        str(args.workers),
+    ]
+    targets = [
+        (
+            "wsgi gunicorn sync /api/projects/",
+            gunicorn + ["-k", "sync", "portfolio_api.wsgi:application"],
+            "/api/projects/",
+        ),
+        (
+            "asgi uvicorn /api/projects/",
+            gunicorn
+            + ["-k", "uvicorn.workers.UvicornWorker", "portfolio_api.asgi:application"],
+            "/api/projects/",
+        ),
+        (
+            "asgi uvicorn /api/async/projects/",
+            gunicorn
+            + ["-k", "uvicorn.workers.UvicornWorker", "portfolio_api.asgi:application"],
+            "/api/async/projects/",
+        ),
+    ]
+
+    rows = []
+    for name, command, path in targets:
+        command = command + ["-b", f"127.0.0.1:{args.port}"]
+        with run_server(command, args.port):
+            rows.append(
+                (
+                    name,
+                    run_load(
+                        args.port, path + args.query, args.requests, args.concurrency
+                    ),
+                )
+            )
+
+    print_results(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Time the contact admin changelist on a large inbox.
+
+Usage, from the repository root::
+
+    python -m benchmarks.contact_admin --contacts 500000 --max-ms 500
+
+Seeds a temporary database with ``--contacts`` contacts, then loads the
+changelist, a later page, a date drill-down and an email search through the
+test client as a superuser. Exits with an error when the median of any of them
+exceeds ``--max-ms``.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+from benchmarks.http_load import setup_django, temporary_database
+
+BATCH_SIZE = 5000
+
+
+def seed_contacts(total):
+    from django.core.management import call_command
+    from django.db.models import Max, Min
+    from django.utils import timezone
+
+    from contacts.models import Contact
+
+    call_command("migrate", verbosity=0)
+    existing = Contact.objects.count()
+    now = timezone.now()
+    for start in range(existing, total, BATCH_SIZE):
+        contacts = [
+            Contact(
+                name=f"Contacto {index}",
+                email=f"contacto{index}@example.com",
+                message="Mensaje creado por el benchmark. " * 5,
+            )
+            for index in range(start, min(start + BATCH_SIZE, total))
+        ]
+        Contact.objects.bulk_create(contacts)
+
+    # Spread created_at over two years so the date drill-down has data
+    if existing < total:
+        bounds = Contact.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        pks = range(bounds["first"], bounds["last"] + 1, BATCH_SIZE)
+        for index, pk in enumerate(pks):
+            Contact.objects.filter(pk__gte=pk, pk__lt=pk + BATCH_SIZE).update(
+                created_at=now - timedelta(days=index * 7)
+            )
+
+
+def get_client():
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    user = User.objects.filter(username="benchmark").first()
+    if user is None:
+        user = User.objects.create_superuser("benchmark", "benchmark@example.com")
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def measure(client, url, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--contacts", type=int, default=500_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    # A fresh database, deleted afterwards, so the configured one is left alone
+    with temporary_database():
+        benchmark(args)
+
+
+def benchmark(args):
+    setup_django()
+
+    from django.conf import settings
+    from django.urls import reverse
+    from django.utils import timezone
+
+    settings.ALLOWED_HOSTS.append("testserver")
+    seed_contacts(args.contacts)
+    client = get_client()
+
+    changelist = reverse("admin:contacts_contact_changelist")
+    year = timezone.now().year
+    targets = [
+        ("changelist", changelist),
+        ("page 50", f"{changelist}?p={max(1, min(50, args.contacts // 100))}"),
+        ("year drill-down", f"{changelist}?created_at__year={year}"),
+        ("email search", f"{changelist}?q=contacto1234@example.com"),
+    ]
+
+    failed = False
+    print(f"{'target':<20} {'median ms':>10}")
+    for name, url in targets:
+        median = measure(client, url, args.runs)
+        failed |= median > args.max_ms
+        print(f"{name:<20} {median:>10.1f}")
+
+    if failed:
+        print(f"A changelist load exceeded {args.max_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Helpers shared by the HTTP benchmarks: a server launcher and a load generator.
+
+Only the standard library is used so the benchmarks run in any environment
+that can run the project itself.
+"""
+
+import http.client
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio_api.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def temporary_database():
+    """
+    Point this process, and the servers it starts, at a new SQLite database
+    that is deleted on exit, so seeding never touches the configured one.
+
+    Must be entered before ``setup_django``.
+    """
+    directory = tempfile.mkdtemp(prefix="portfolio-benchmark-")
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+    os.environ["BENCHMARK_DATABASE"] = os.path.join(directory, "db.sqlite3")
+    try:
+        yield
+    finally:
+        shutil.rmtree(directory)
+
+
+def seed_projects(total):
+    """
+    Migrate the database and create ``total`` projects with technologies.
+    """
+    setup_django()
+
+    from django.core.management import call_command
+
+    from projects.models import Project, Technology
+
+    call_command("migrate", verbosity=0)
+    technologies = [
+        Technology.objects.get_or_create(name=name)[0]
+        for name in ("Python", "Django", "PostgreSQL", "React")
+    ]
+    for index in range(Project.objects.count(), total):
+        project = Project.objects.create(
+            name=f"Benchmark project {index}",
+            description="Project created by the benchmark seed. " * 10,
+            url=f"https://example.com/{index}",
+            project_status="available",
+        )
+        project.technologies.set(technologies)
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+@contextmanager
+def run_server(command, port):
+    process = subprocess.Popen(
+        command,
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        yield process
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def run_load(port, path, requests, concurrency):
+    """
+    Send ``requests`` GETs to ``path`` from ``concurrency`` keep-alive clients.
+
+    Returns throughput (requests per second) and latency percentiles in ms.
+    """
+    per_client = max(1, requests // concurrency)
+
+    def client(_):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies = []
+        errors = 0
+        for _ in range(per_client):
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        return latencies, errors
+
+    # Warm up caches, connections and lazy imports before measuring
+    run_client_requests(port, path, 20)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def run_client_requests(port, path, total):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for _ in range(total):
+        connection.request("GET", path)
+        connection.getresponse().read()
+    connection.close()
+
+
+def print_results(rows):
+    header = f"{'target':<40} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in rows:
+        print(
+            f"{name:<40} {result['throughput']:>10.1f} {result['p50']:>10.2f} "
+            f"{result['p99']:>10.2f} {result['errors']:>8}"
+        )
@@ -0,0 +1,16 @@
+"""
+Project settings with the database replaced by the SQLite file at
+``BENCHMARK_DATABASE``, see ``benchmarks.http_load.temporary_database``.
+"""
+
+import os
+
+from portfolio_api.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["BENCHMARK_DATABASE"],
+    }
+}
+DATABASE_REPLICAS = []
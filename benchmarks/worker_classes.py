@@ -0,0 +1,106 @@
+"""
+Compare gunicorn worker classes on the projects endpoints.
+
+Usage, from the repository root::
+
+    python -m benchmarks.worker_classes --seed 200 --requests 2000 --concurrency 32
+
+Each worker class runs with the production configuration in
+``portfolio_api/server.py`` and the same number of worker processes:
+
+* ``sync``: one request at a time per process
+* ``gthread``: ``--threads`` requests per process
+* ``uvicorn``: the ASGI application, with the native async list endpoint too
+
+The list, a detail and the unfiltered list past the snapshot (a filter) are
+loaded for each one.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.http_load import (
+    print_results,
+    run_load,
+    run_server,
+    seed_projects,
+    temporary_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    # A fresh database, deleted afterwards, so the configured one is left alone
+    with temporary_database():
+        benchmark(args)
+
+
+def benchmark(args):
+    seed_projects(args.seed)
+
+    from projects.models import Project
+
+    detail = f"/api/projects/{Project.objects.order_by('pk').first().pk}/"
+    paths = [
+        "/api/projects/?limit=20",
+        detail,
+        "/api/projects/?project_status=available&limit=20",
+    ]
+
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    os.environ["GUNICORN_THREADS"] = str(args.threads)
+    # The benchmark would recycle workers mid-run
+    os.environ["GUNICORN_MAX_REQUESTS"] = "0"
+    # Several workers need a cache they all see
+    cache_dir = None
+    if "CACHE_BACKEND" not in os.environ:
+        cache_dir = tempfile.mkdtemp()
+        os.environ["CACHE_BACKEND"] = (
+            "django.core.cache.backends.filebased.FileBasedCache"
+        )
+        os.environ["CACHE_LOCATION"] = cache_dir
+
+    try:
+        rows = run_worker_classes(args, paths)
+    finally:
+        if cache_dir is not None:
+            shutil.rmtree(cache_dir)
+    print_results(rows)
+
+
+def run_worker_classes(args, paths):
+    rows = []
+    for worker_class in ("sync", "gthread", "uvicorn"):
+        os.environ["GUNICORN_WORKER_CLASS"] = worker_class
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "python:portfolio_api.server",
+            "-b",
+            f"127.0.0.1:{args.port}",
+        ]
+        targets = paths + (
+            ["/api/async/projects/"] if worker_class == "uvicorn" else []
+        )
+        with run_server(command, args.port):
+            for path in targets:
+                result = run_load(args.port, path, args.requests, args.concurrency)
+                rows.append((f"{worker_class} {path}", result))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
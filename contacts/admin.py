@@ -1,11 +1,166 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.functions import Upper
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from portfolio_api.exports import ExportActionForm, ModelExport, make_export_action
+
+from .models import Contact, ContactNotification
+
+
+def estimate_count(queryset):
+    """
+    Return a cheap estimate of the rows in the table of ``queryset``.
+
+    PostgreSQL reads the planner statistics; SQLite uses the highest primary
+    key, which only overestimates after deletions. Returns ``None`` when no
+    estimate is available.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 means the table was never analyzed
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) "
+                f"FROM {connection.ops.quote_name(model._meta.db_table)}"
+            )
+            row = cursor.fetchone()
+            return row[0] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts more than ``CONTACT_ADMIN_EXACT_COUNT_LIMIT``.
+
+    Counting stops at the limit. Past it an unfiltered table reports the
+    estimate from ``estimate_count()``, while a filtered list, such as a wide
+    date drill-down, reports the limit itself.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.CONTACT_ADMIN_EXACT_COUNT_LIMIT
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return super().count
+
+        count = self.object_list[: limit + 1].count()
+        if count <= limit:
+            return count
+        if not query.where:
+            return max(estimate_count(self.object_list) or limit, limit)
+        return limit
+
+
+def truncate(value, kind):
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind in ("year", "month"):
+        value = value.replace(day=1)
+    if kind == "year":
+        value = value.replace(month=1)
+    return value
+
 
-from .models import Contact
+def next_period(value, kind):
+    if kind == "year":
+        return value.replace(year=value.year + 1)
+    if kind == "month":
+        if value.month == 12:
+            return value.replace(year=value.year + 1, month=1)
+        return value.replace(month=value.month + 1)
+    return truncate(value + timedelta(days=1), kind)
+
+
+class IndexedDatesQuerySet(QuerySet):
+    """
+    QuerySet whose ``datetimes()`` skips through the index.
+
+    The admin date hierarchy lists the years, months or days that have rows
+    with ``datetimes()``, a ``SELECT DISTINCT`` over a truncated date that
+    reads every row. Here each period is found by jumping to the first row at
+    or after the end of the previous one (``ORDER BY ... LIMIT 1``), so the
+    cost is one index lookup per listed period.
+    """
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month", "day"):
+            return super().datetimes(field_name, kind, order, tzinfo)
+
+        if settings.USE_TZ:
+            tzinfo = tzinfo or timezone.get_current_timezone()
+
+        values = self.order_by(field_name).values_list(field_name, flat=True)
+        periods = []
+        value = values.first()
+        while value is not None:
+            if settings.USE_TZ:
+                value = timezone.localtime(value, tzinfo)
+            period = truncate(value, kind)
+            periods.append(period)
+            lookup = {f"{field_name}__gte": next_period(period, kind)}
+            value = values.filter(**lookup).first()
+        return periods if order == "ASC" else periods[::-1]
+
+
+class ContactExport(ModelExport):
+    model = Contact
+    name = "contacts"
+    fields = ("id", "name", "email", "message", "created_at")
 
 
 class ContactAdmin(admin.ModelAdmin):
     model = Contact
     list_display = ["name", "email", "created_at"]
+    # Served by the (-created_at, -id) index
+    ordering = ["-created_at", "-id"]
+    date_hierarchy = "created_at"
+    search_fields = ["email"]
+    search_help_text = "Email exacto"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [
+        make_export_action(ContactExport, "csv"),
+        make_export_action(ContactExport, "jsonl"),
+    ]
+    action_form = ExportActionForm
+
+    def get_search_results(self, request, queryset, search_term):
+        # UPPER(email) = UPPER(term) matches the expression index on any backend
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        queryset = queryset.alias(email_upper=Upper("email"))
+        return queryset.filter(email_upper=term.upper()), False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return IndexedDatesQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset._db
+        )
+
+
+class ContactNotificationAdmin(admin.ModelAdmin):
+    model = ContactNotification
+    list_display = ["contact", "status", "attempts", "next_attempt_at", "sent_at"]
+    list_filter = ["status"]
+    list_select_related = ["contact"]
+    readonly_fields = ["created_at"]
 
 
 admin.site.register(Contact, ContactAdmin)
+admin.site.register(ContactNotification, ContactNotificationAdmin)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from portfolio_api.metrics import registry
+
+from .models import Contact
+
+
+def normalize(text):
+    return " ".join(text.split()).casefold()
+
+
+def get_content_hash(email, message):
+    """
+    Hash of an ``(email, message)`` pair that ignores case and whitespace.
+    """
+    content = f"{normalize(email)}\0{normalize(message)}"
+    return sha256(content.encode()).hexdigest()
+
+
+def get_cache():
+    return caches[settings.CONTACT_DUPLICATE_CACHE_ALIAS]
+
+
+def cache_key(content_hash):
+    return f"contacts:seen:{content_hash}"
+
+
+def claim(content_hash):
+    """
+    Return ``True`` when a submission with ``content_hash`` may be stored.
+
+    ``cache.add()`` is the prefilter: it is atomic, so of two identical
+    submissions only the first claims the key, and repeats within
+    ``CONTACT_DUPLICATE_WINDOW`` seconds are rejected without a query. The
+    indexed lookup on ``content_hash`` catches the duplicates the cache does
+    not know about, after an eviction or in another process's local memory
+    cache. Rejections are counted in ``contact_duplicates_total``.
+    """
+    window = settings.CONTACT_DUPLICATE_WINDOW
+    if not window:
+        return True
+
+    if not get_cache().add(cache_key(content_hash), 1, timeout=window):
+        registry.inc("contact_duplicates_total", source="cache")
+        return False
+
+    since = timezone.now() - timedelta(seconds=window)
+    if Contact.objects.filter(
+        content_hash=content_hash, created_at__gte=since
+    ).exists():
+        registry.inc("contact_duplicates_total", source="database")
+        return False
+    return True
+
+
+def release(content_hash):
+    # The submission was not stored after all
+    if settings.CONTACT_DUPLICATE_WINDOW:
+        get_cache().delete(cache_key(content_hash))
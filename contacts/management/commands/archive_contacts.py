@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from contacts.retention import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve los contactos más antiguos que CONTACT_RETENTION_DAYS a archivos "
+        "JSONL comprimidos y los borra de la base de datos por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CONTACT_RETENTION_DAYS,
+            help="Antigüedad en días a partir de la que se archiva un contacto.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CONTACT_ARCHIVE_BATCH_SIZE,
+            help="Contactos por archivo y por transacción de borrado.",
+        )
+        parser.add_argument(
+            "--output",
+            default=settings.CONTACT_ARCHIVE_DIR,
+            help="Directorio de los archivos, por defecto CONTACT_ARCHIVE_DIR.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Detiene el archivado tras este número de lotes.",
+        )
+
+    def handle(self, *args, **options):
+        result = archive(
+            days=options["days"],
+            batch_size=options["batch_size"],
+            directory=options["output"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(
+            f"Archived: {result['archived']}, files: {len(result['files'])}"
+        )
@@ -0,0 +1,7 @@
+from contacts.admin import ContactExport
+from portfolio_api.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Exporta los contactos como CSV o JSONL."
+    export_class = ContactExport
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from contacts.retention import restore
+
+
+class Command(BaseCommand):
+    help = "Restaura contactos desde archivos creados por archive_contacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help="Archivos .jsonl.gz o directorios que los contienen.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CONTACT_ARCHIVE_BATCH_SIZE,
+            help="Contactos insertados por transacción.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for path in options["paths"]:
+            try:
+                total += restore(path, batch_size=options["batch_size"])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot restore {path}: {e}")
+        self.stdout.write(f"Restored: {total}")
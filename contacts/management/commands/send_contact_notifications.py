@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from contacts.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Envía las notificaciones de contacto pendientes del outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CONTACT_OUTBOX_BATCH_SIZE,
+            help="Notificaciones enviadas por conexión SMTP.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Sigue ejecutándose y revisa el outbox periódicamente.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.CONTACT_OUTBOX_POLL_INTERVAL,
+            help="Segundos entre revisiones con --loop.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            result = drain(options["batch_size"])
+            self.stdout.write(
+                f"Sent: {result['sent']}, failed attempts: {result['failed']}"
+            )
+            return
+
+        while True:
+            result = drain(options["batch_size"])
+            if result["sent"] or result["failed"]:
+                self.stdout.write(
+                    f"Sent: {result['sent']}, failed attempts: {result['failed']}"
+                )
+            close_old_connections()
+            time.sleep(options["interval"])
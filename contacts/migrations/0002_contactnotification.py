@@ -0,0 +1,33 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próximo intento')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de envío')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='contacts.contact', verbose_name='Contacto')),
+            ],
+            options={
+                'verbose_name': 'Notificación de contacto',
+                'verbose_name_plural': 'Notificaciones de contacto',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='notification_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contacts", "0002_contactnotification"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="contact_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="contact_email_upper_idx",
+            ),
+        ),
+    ]
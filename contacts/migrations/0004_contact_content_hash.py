@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contacts", "0003_contact_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contact",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                verbose_name="Hash del contenido",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["content_hash", "created_at"], name="contact_content_hash_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 
 
 class Contact(models.Model):
@@ -7,11 +9,72 @@ class Contact(models.Model):
     )
     email: models.EmailField = models.EmailField(verbose_name="Email contacto")
     message: models.TextField = models.TextField(verbose_name="Mensaje contacto")
+    content_hash: models.CharField = models.CharField(
+        max_length=64, blank=True, editable=False, verbose_name="Hash del contenido"
+    )
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Contacto"
         verbose_name_plural = "Contactos"
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="contact_created_at_id_idx"
+            ),
+            # Case insensitive email search in the admin (UPPER(email) = UPPER(term))
+            models.Index(Upper("email"), name="contact_email_upper_idx"),
+            # Duplicate submissions within CONTACT_DUPLICATE_WINDOW
+            models.Index(
+                fields=["content_hash", "created_at"], name="contact_content_hash_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class ContactNotification(models.Model):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS = (
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    contact: models.ForeignKey = models.ForeignKey(
+        Contact,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        verbose_name="Contacto",
+    )
+    status: models.CharField = models.CharField(
+        max_length=10, choices=STATUS, default=PENDING, verbose_name="Estado"
+    )
+    attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Intentos"
+    )
+    next_attempt_at: models.DateTimeField = models.DateTimeField(
+        default=timezone.now, verbose_name="Próximo intento"
+    )
+    last_error: models.TextField = models.TextField(
+        blank=True, verbose_name="Último error"
+    )
+    sent_at: models.DateTimeField = models.DateTimeField(
+        blank=True, null=True, verbose_name="Fecha de envío"
+    )
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Notificación de contacto"
+        verbose_name_plural = "Notificaciones de contacto"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="notification_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contact} ({self.status})"
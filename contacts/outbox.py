@@ -0,0 +1,180 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections
+from django.utils import timezone
+
+from portfolio_api.metrics import registry
+from portfolio_api.performance import timing
+
+from .models import ContactNotification
+
+logger = logging.getLogger(__name__)
+
+# Time a claimed notification stays hidden from other workers while it is sent
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def build_message(contact, connection=None):
+    return EmailMessage(
+        f"New contact from portfolio: {contact.name}",
+        f"{contact.message} | Contact email: {contact.email}",
+        settings.EMAIL_HOST_USER,
+        [settings.EMAIL_TO_USER],
+        connection=connection,
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(
+        seconds=settings.CONTACT_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1)
+    )
+
+
+def claim_pending(batch_size, now):
+    """
+    Return up to ``batch_size`` due notifications owned by this worker.
+
+    A notification is claimed by moving ``next_attempt_at`` forward with a
+    conditional UPDATE, so concurrent workers never send the same one and a
+    crashed worker's claims become due again once the lease expires.
+    """
+    candidates = (
+        ContactNotification.objects.select_related("contact")
+        .filter(status=ContactNotification.PENDING, next_attempt_at__lte=now)
+        .order_by("next_attempt_at", "id")[:batch_size]
+    )
+    claimed = []
+    for notification in candidates:
+        updated = ContactNotification.objects.filter(
+            pk=notification.pk, next_attempt_at=notification.next_attempt_at
+        ).update(next_attempt_at=now + CLAIM_LEASE)
+        if updated:
+            claimed.append(notification)
+    return claimed
+
+
+def mark_sent(notification, now):
+    notification.status = ContactNotification.SENT
+    notification.attempts += 1
+    notification.sent_at = now
+    notification.last_error = ""
+    notification.save(update_fields=["status", "attempts", "sent_at", "last_error"])
+    registry.inc("contact_emails_total", outcome="sent")
+
+
+def mark_failed_attempt(notification, error, now):
+    notification.attempts += 1
+    notification.last_error = str(error)
+    if notification.attempts >= settings.CONTACT_OUTBOX_MAX_ATTEMPTS:
+        notification.status = ContactNotification.FAILED
+        registry.inc("contact_emails_total", outcome="failed")
+        logger.error(
+            "Contact notification %s failed after %s attempts: %s",
+            notification.pk,
+            notification.attempts,
+            error,
+        )
+    else:
+        notification.next_attempt_at = now + get_retry_delay(notification.attempts)
+        registry.inc("contact_emails_total", outcome="retry")
+    notification.save(
+        update_fields=["status", "attempts", "last_error", "next_attempt_at"]
+    )
+
+
+def deliver_pending(batch_size=None):
+    """
+    Send one batch of due notifications over a single SMTP connection.
+
+    Returns a dict with the number of ``sent`` and ``failed`` attempts.
+    """
+    now = timezone.now()
+    notifications = claim_pending(batch_size or settings.CONTACT_OUTBOX_BATCH_SIZE, now)
+    result = {"sent": 0, "failed": 0}
+    if not notifications:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for notification in notifications:
+            mark_failed_attempt(notification, error, now)
+        result["failed"] = len(notifications)
+        return result
+
+    try:
+        for notification in notifications:
+            message = build_message(notification.contact, connection)
+            try:
+                if not message.recipients():
+                    raise ValueError("EMAIL_TO_USER is not configured")
+                with timing("email"):
+                    sent = connection.send_messages([message])
+                if not sent:
+                    raise ValueError("The message was not sent")
+            except Exception as error:
+                mark_failed_attempt(notification, error, now)
+                result["failed"] += 1
+            else:
+                mark_sent(notification, now)
+                result["sent"] += 1
+    finally:
+        connection.close()
+
+    return result
+
+
+def drain(batch_size=None):
+    """
+    Deliver batches until no notification is due.
+    """
+    totals = {"sent": 0, "failed": 0}
+    while True:
+        result = deliver_pending(batch_size)
+        totals["sent"] += result["sent"]
+        totals["failed"] += result["failed"]
+        if not result["sent"] and not result["failed"]:
+            return totals
+
+
+class OutboxWorker(threading.Thread):
+    """
+    In-process sender for small deployments without a separate worker.
+
+    It is woken after each committed contact and otherwise polls every
+    ``CONTACT_OUTBOX_POLL_INTERVAL`` seconds to pick up retries.
+    """
+
+    def __init__(self):
+        super().__init__(name="contact-outbox", daemon=True)
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(timeout=settings.CONTACT_OUTBOX_POLL_INTERVAL)
+            self.wakeup.clear()
+            try:
+                drain()
+            except Exception:
+                logger.exception("Contact outbox worker failed")
+            finally:
+                close_old_connections()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def wake_worker():
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = OutboxWorker()
+            _worker.start()
+    _worker.wakeup.set()
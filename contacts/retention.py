@@ -0,0 +1,142 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from portfolio_api.exports import to_json_line
+
+from .models import Contact, ContactNotification
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("id", "name", "email", "message", "content_hash", "created_at")
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def get_archive_name(rows):
+    first, last = rows[0], rows[-1]
+    day = timezone.localtime(first["created_at"]).strftime("%Y%m%d")
+    return f"contacts-{day}-{first['id']}-{last['id']}{ARCHIVE_SUFFIX}"
+
+
+def write_archive(directory, rows):
+    """
+    Write ``rows`` to a gzipped JSONL file in ``directory`` and return its path.
+
+    The file is written under a temporary name, synced to disk and then
+    renamed, so an archive is either complete or absent.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, get_archive_name(rows))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            with gzip.GzipFile(fileobj=f, mode="wb") as archive:
+                for row in rows:
+                    archive.write(to_json_line(row))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def get_expired(days):
+    """
+    Contacts created more than ``days`` days ago, oldest first.
+
+    Contacts whose notification is still pending are kept until it is sent
+    or fails.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return (
+        Contact.objects.filter(created_at__lt=cutoff)
+        .exclude(notifications__status=ContactNotification.PENDING)
+        .order_by("created_at", "id")
+    )
+
+
+def archive(days=None, batch_size=None, directory=None, max_batches=None):
+    """
+    Move the contacts older than ``days`` days to archive files.
+
+    Each batch of ``batch_size`` contacts is written to its own archive and
+    only then deleted, in a transaction of its own, so locks stay short. A
+    batch's file name comes from its rows: after an interruption the next run
+    selects the same oldest rows again and rewrites the same file instead of
+    duplicating them.
+    """
+    if days is None:
+        days = settings.CONTACT_RETENTION_DAYS
+    batch_size = batch_size or settings.CONTACT_ARCHIVE_BATCH_SIZE
+    directory = directory or settings.CONTACT_ARCHIVE_DIR
+    expired = get_expired(days).values(*FIELDS)
+
+    result = {"archived": 0, "files": []}
+    while max_batches is None or len(result["files"]) < max_batches:
+        rows = list(expired[:batch_size])
+        if not rows:
+            break
+
+        path = write_archive(directory, rows)
+        with transaction.atomic():
+            Contact.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+        logger.info("Archived %d contacts to %s", len(rows), path)
+        result["archived"] += len(rows)
+        result["files"].append(path)
+    return result
+
+
+def get_archive_paths(path):
+    path = Path(path)
+    if path.is_dir():
+        return sorted(str(name) for name in path.glob(f"*{ARCHIVE_SUFFIX}"))
+    return [str(path)]
+
+
+def read_archive(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def restore(path, batch_size=None):
+    """
+    Insert the contacts of an archive file, or of every archive in a
+    directory, back into the table and return how many were read.
+
+    Contacts that already exist are left as they are, so restoring twice is
+    harmless. Archives written before ``content_hash`` was archived restore
+    with an empty hash, like contacts stored before it existed. The archive
+    files are not removed.
+    """
+    batch_size = batch_size or settings.CONTACT_ARCHIVE_BATCH_SIZE
+    total = 0
+    for archive_path in get_archive_paths(path):
+        rows = read_archive(archive_path)
+        while batch := list(islice(rows, batch_size)):
+            contacts = [
+                Contact(**{**row, "created_at": parse_datetime(row["created_at"])})
+                for row in batch
+            ]
+            created_at = [contact.created_at for contact in contacts]
+            with transaction.atomic():
+                Contact.objects.bulk_create(contacts, ignore_conflicts=True)
+                # auto_now_add replaced the archived dates on insert
+                for contact, value in zip(contacts, created_at):
+                    contact.created_at = value
+                Contact.objects.bulk_update(contacts, ["created_at"])
+            total += len(batch)
+    return total
@@ -1,14 +1,46 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
 from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
 from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core import mail
+from django.core.cache import caches
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db.models import Max
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 from rest_framework.test import APIClient
 
-from .models import Contact
+from portfolio_api.exports import to_json_line
+from portfolio_api.metrics import registry
+from portfolio_api.throttling import TokenBucketThrottle
+
+from .admin import ContactAdmin, EstimatedCountPaginator
+from .duplicates import get_content_hash
+from .models import Contact, ContactNotification
+from .outbox import deliver_pending, drain, wake_worker
+from .retention import FIELDS, archive, read_archive, restore
+from .throttling import limiter
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
 
 
 class ContactModelTest(TestCase):
@@ -96,6 +128,9 @@ class ContactModelTest(TestCase):
 
 class ContactCreateViewTest(TestCase):
     def setUp(self):
+        # La caché de duplicados se comparte entre pruebas
+        clear_caches()
+        registry.clear()
         self.client = APIClient()
         self.url = reverse("contact")
         self.valid_payload = {
@@ -113,13 +148,24 @@ class ContactCreateViewTest(TestCase):
             "message": "Este es un mensaje de prueba.",
         }
 
-    @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    @override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        EMAIL_HOST_USER="portfolio@example.com",
+        EMAIL_TO_USER="admin@example.com",
+    )
     def test_create_contact_and_send_email_success(self):
         # Prueba de creación exitosa de contacto y envío de correo electrónico
         response = self.client.post(self.url, data=self.valid_payload, format="json")
         self.assertEqual(response.status_code, HTTP_201_CREATED)
         self.assertEqual(response.data["message"], "success")
 
+        # El correo queda en el outbox y se envía fuera de la petición
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            ContactNotification.objects.get().status, ContactNotification.PENDING
+        )
+        deliver_pending()
+
         # Verificar que el contacto fue creado en la base de datos
         self.assertEqual(Contact.objects.count(), 1)
         contact = Contact.objects.first()
@@ -137,6 +183,21 @@ class ContactCreateViewTest(TestCase):
         self.assertIn(self.valid_payload["message"], email.body)
         self.assertIn(self.valid_payload["email"], email.body)
 
+    @override_settings(CONTACT_OUTBOX_MODE="thread")
+    def test_thread_mode_wakes_worker_after_commit(self):
+        # En modo hilo el worker se despierta cuando se confirma la transacción
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(callbacks, [wake_worker])
+
+    @override_settings(CONTACT_OUTBOX_MODE="command")
+    def test_command_mode_leaves_delivery_to_worker(self):
+        # En modo comando la petición solo registra la notificación
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ContactNotification.objects.count(), 1)
+
     def test_create_contact_invalid_email(self):
         # Prueba de validación de formato de correo electrónico
         response = self.client.post(
@@ -179,3 +240,503 @@ class ContactCreateViewTest(TestCase):
         # Prueba de permisos para asegurar que el endpoint esté accesible para todos
         response = self.client.post(self.url, data=self.valid_payload, format="json")
         self.assertEqual(response.status_code, HTTP_201_CREATED)
+
+    def get_duplicates(self, source):
+        return registry.counters.get(
+            ("contact_duplicates_total", (("source", source),)), 0
+        )
+
+    def test_duplicate_submission_is_dropped(self):
+        # Los reenvíos reciben la misma respuesta sin guardar ni enviar nada
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        repeated = {
+            **self.valid_payload,
+            "email": "JUAN.PEREZ@example.com",
+            "message": "  Este es un   mensaje de prueba. ",
+        }
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, data=repeated, format="json")
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+        self.assertEqual(response.data["message"], "success")
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(ContactNotification.objects.count(), 1)
+        self.assertEqual(self.get_duplicates("cache"), 1)
+
+    def test_duplicate_found_in_database(self):
+        # Sin la entrada en caché el índice por hash detecta el duplicado
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        clear_caches()
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(self.get_duplicates("database"), 1)
+
+    def test_duplicate_allowed_after_window(self):
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        Contact.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        clear_caches()
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(Contact.objects.count(), 2)
+
+    @override_settings(CONTACT_DUPLICATE_WINDOW=0)
+    def test_duplicate_check_disabled(self):
+        for _ in range(2):
+            self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_failed_insert_releases_hash(self):
+        # Si el guardado falla, el reintento no cuenta como duplicado
+        with mock.patch.object(
+            ContactNotification.objects, "create", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.post(self.url, data=self.valid_payload, format="json")
+        self.client.post(self.url, data=self.valid_payload, format="json")
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(
+            Contact.objects.get().content_hash,
+            get_content_hash(
+                self.valid_payload["email"], self.valid_payload["message"]
+            ),
+        )
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {"contact_ip": "2/min", "contact_email": "2/hour"},
+    }
+)
+class ContactThrottleTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        registry.clear()
+        self.client = APIClient()
+        self.url = reverse("contact")
+
+    def post(self, index, email="ana@example.com", ip="10.0.0.1"):
+        return self.client.post(
+            self.url,
+            {"name": "Ana", "email": email, "message": f"Mensaje {index}"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_ip_bucket(self):
+        # La ráfaga del tamaño del cubo pasa y después se exige esperar
+        self.assertEqual(self.post(1, "a@example.com").status_code, 201)
+        self.assertEqual(self.post(2, "b@example.com").status_code, 201)
+        response = self.post(3, "c@example.com")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+        self.assertEqual(Contact.objects.count(), 2)
+        self.assertEqual(
+            registry.counters[("throttled_requests_total", (("scope", "contact_ip"),))],
+            1,
+        )
+
+    def test_spoofed_forwarded_for(self):
+        # Detrás de un proxy, cambiar X-Forwarded-For no da un cubo nuevo
+        rest_framework = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            responses = [
+                self.client.post(
+                    self.url,
+                    {"name": "Ana", "email": f"{index}@example.com", "message": "Hola"},
+                    format="json",
+                    REMOTE_ADDR="10.0.0.100",
+                    HTTP_X_FORWARDED_FOR=f"198.51.100.{index}, 203.0.113.7",
+                )
+                for index in range(3)
+            ]
+        self.assertEqual(
+            [response.status_code for response in responses], [201, 201, 429]
+        )
+
+    def test_email_bucket_across_ips(self):
+        self.post(1, ip="10.0.0.1")
+        self.post(2, ip="10.0.0.2")
+        response = self.post(3, email=" ANA@example.com", ip="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+
+    def test_body_that_is_not_an_object(self):
+        # Un cuerpo JSON que no es un objeto es un 400, no un error del servidor
+        for body in (["ana@example.com"], "ana@example.com"):
+            with self.subTest(body=body):
+                response = self.client.post(self.url, body, format="json")
+                self.assertEqual(response.status_code, 400)
+
+    def test_tokens_refill(self):
+        now = time.time()
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=now):
+            self.post(1, "a@example.com")
+            self.post(2, "b@example.com")
+            self.assertEqual(self.post(3, "c@example.com").status_code, 429)
+        # Cada 30 segundos se recupera una ficha
+        with mock.patch.object(TokenBucketThrottle, "timer", return_value=now + 30):
+            self.assertEqual(self.post(4, "d@example.com").status_code, 201)
+            self.assertEqual(self.post(5, "e@example.com").status_code, 429)
+
+    @override_settings(CONTACT_MAX_CONCURRENCY=0, CONTACT_MAX_QUEUE=0)
+    def test_load_shedding(self):
+        # Sin hueco ni cola libre la petición se rechaza sin esperar
+        response = self.post(1)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(Contact.objects.count(), 0)
+        self.assertEqual(limiter.get_active(), 0)
+
+
+class CountingEmailBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return True
+
+
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP no disponible")
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_HOST_USER="portfolio@example.com",
+    EMAIL_TO_USER="admin@example.com",
+    CONTACT_OUTBOX_BATCH_SIZE=10,
+    CONTACT_OUTBOX_MAX_ATTEMPTS=3,
+    CONTACT_OUTBOX_RETRY_BACKOFF=60,
+)
+class ContactOutboxTest(TestCase):
+    def create_notifications(self, total):
+        for index in range(total):
+            contact = Contact.objects.create(
+                name=f"Contacto {index}",
+                email=f"contacto{index}@example.com",
+                message=f"Mensaje {index}",
+            )
+            ContactNotification.objects.create(contact=contact)
+
+    def test_batch_reuses_one_connection(self):
+        # Un lote se envía con una sola conexión SMTP
+        self.create_notifications(5)
+        CountingEmailBackend.opened = 0
+        with self.settings(EMAIL_BACKEND="contacts.tests.CountingEmailBackend"):
+            result = deliver_pending()
+
+        self.assertEqual(result, {"sent": 5, "failed": 0})
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            ContactNotification.objects.exclude(
+                status=ContactNotification.SENT
+            ).exists()
+        )
+
+    def test_drain_sends_every_batch(self):
+        # drain() procesa lotes hasta vaciar el outbox
+        self.create_notifications(25)
+        self.assertEqual(drain(), {"sent": 25, "failed": 0})
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(deliver_pending(), {"sent": 0, "failed": 0})
+
+    @override_settings(EMAIL_BACKEND="contacts.tests.FailingEmailBackend")
+    def test_failed_delivery_is_retried_with_backoff(self):
+        # Un fallo reprograma el envío con espera exponencial
+        self.create_notifications(1)
+        before = timezone.now()
+        self.assertEqual(deliver_pending(), {"sent": 0, "failed": 1})
+
+        notification = ContactNotification.objects.get()
+        self.assertEqual(notification.status, ContactNotification.PENDING)
+        self.assertEqual(notification.attempts, 1)
+        self.assertIn("SMTP no disponible", notification.last_error)
+        self.assertGreaterEqual(
+            notification.next_attempt_at, before + timedelta(seconds=60)
+        )
+
+        # No se reintenta antes de tiempo
+        self.assertEqual(deliver_pending(), {"sent": 0, "failed": 0})
+
+        ContactNotification.objects.update(next_attempt_at=timezone.now())
+        deliver_pending()
+        notification.refresh_from_db()
+        self.assertEqual(notification.attempts, 2)
+        self.assertGreaterEqual(
+            notification.next_attempt_at, before + timedelta(seconds=120)
+        )
+
+    @override_settings(EMAIL_BACKEND="contacts.tests.FailingEmailBackend")
+    def test_notification_fails_after_max_attempts(self):
+        # Tras agotar los intentos la notificación queda como fallida
+        self.create_notifications(1)
+        for _ in range(3):
+            ContactNotification.objects.update(next_attempt_at=timezone.now())
+            deliver_pending()
+
+        notification = ContactNotification.objects.get()
+        self.assertEqual(notification.status, ContactNotification.FAILED)
+        self.assertEqual(notification.attempts, 3)
+
+    @override_settings(EMAIL_TO_USER=None)
+    def test_missing_recipient_is_not_silently_dropped(self):
+        # Sin destinatario el envío cuenta como fallido
+        self.create_notifications(1)
+        self.assertEqual(deliver_pending(), {"sent": 0, "failed": 1})
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_claimed_notification_is_not_sent_twice(self):
+        # Una notificación reclamada por otro worker no se vuelve a enviar
+        self.create_notifications(1)
+        ContactNotification.objects.update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertEqual(deliver_pending(), {"sent": 0, "failed": 0})
+
+    def test_file_backend(self):
+        # El outbox funciona con el backend de archivos de Django
+        self.create_notifications(2)
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(
+                EMAIL_BACKEND="django.core.mail.backends.filebased.EmailBackend",
+                EMAIL_FILE_PATH=directory,
+            ):
+                deliver_pending()
+
+            # Una conexión reutilizada escribe todos los mensajes en un archivo
+            files = list(Path(directory).iterdir())
+            self.assertEqual(len(files), 1)
+            self.assertEqual(files[0].read_text().count("Subject:"), 2)
+
+    def test_management_command(self):
+        # El comando envía las notificaciones pendientes
+        self.create_notifications(3)
+        stdout = StringIO()
+        call_command("send_contact_notifications", stdout=stdout)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("Sent: 3", stdout.getvalue())
+
+
+class ContactAdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com")
+        self.client.force_login(self.user)
+        self.url = reverse("admin:contacts_contact_changelist")
+        now = timezone.now()
+        Contact.objects.bulk_create(
+            Contact(
+                name=f"Contacto {index}",
+                email=f"contacto{index}@example.com",
+                message="Hola",
+            )
+            for index in range(5)
+        )
+        # Contactos repartidos en dos años distintos
+        for index, contact in enumerate(Contact.objects.order_by("pk")):
+            contact.created_at = now - timedelta(days=200 * index)
+            contact.save(update_fields=["created_at"])
+
+    def test_changelist(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 5)
+
+    @override_settings(CONTACT_ADMIN_EXACT_COUNT_LIMIT=3)
+    def test_count_is_capped(self):
+        # Sin filtros se usa la estimación y con filtros el límite
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("pk"), 2)
+        self.assertEqual(
+            paginator.count, Contact.objects.aggregate(Max("pk"))["pk__max"]
+        )
+        filtered = Contact.objects.filter(message="Hola").order_by("pk")
+        self.assertEqual(EstimatedCountPaginator(filtered, 2).count, 3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_search_ignores_case(self):
+        response = self.client.get(self.url, {"q": " CONTACTO3@Example.com "})
+        self.assertEqual(
+            [contact.email for contact in response.context["cl"].result_list],
+            ["contacto3@example.com"],
+        )
+
+    def test_date_hierarchy_matches_distinct_dates(self):
+        # Las fechas por índice coinciden con las de Django
+        queryset = ContactAdmin(Contact, admin.site).get_queryset(None)
+        for kind in ("year", "month", "day"):
+            with self.subTest(kind=kind):
+                self.assertEqual(
+                    list(queryset.datetimes("created_at", kind)),
+                    list(Contact.objects.datetimes("created_at", kind)),
+                )
+        self.assertEqual(
+            list(queryset.datetimes("created_at", "month", order="DESC")),
+            list(Contact.objects.datetimes("created_at", "month", order="DESC")),
+        )
+
+        year = timezone.localtime(
+            Contact.objects.earliest("created_at").created_at
+        ).year
+        response = self.client.get(self.url, {"created_at__year": year})
+        self.assertEqual(response.status_code, 200)
+
+    def post_action(self, action, **data):
+        return self.client.post(
+            self.url,
+            {
+                "action": action,
+                "select_across": 1,
+                "index": 0,
+                "_selected_action": Contact.objects.values_list("pk", flat=True)[:1],
+                **data,
+            },
+        )
+
+    def test_export_action_csv(self):
+        Contact.objects.filter(email="contacto0@example.com").update(
+            message='=HYPERLINK("http://example.com")'
+        )
+        response = self.post_action("export_csv")
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="contacts-', response["Content-Disposition"])
+        rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ["id", "name", "email", "message", "created_at"])
+        self.assertEqual(len(rows), 6)
+        # Los valores que una hoja de cálculo ejecutaría como fórmula se escapan
+        self.assertIn('\'=HYPERLINK("http://example.com")', [row[3] for row in rows])
+
+    def test_export_action_date_range_and_gzip(self):
+        today = timezone.localdate()
+        response = self.post_action(
+            "export_jsonl",
+            export_from=(today - timedelta(days=250)).isoformat(),
+            export_to=today.isoformat(),
+            export_gzip="on",
+        )
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        content = gzip.decompress(b"".join(response.streaming_content))
+        emails = [json.loads(line)["email"] for line in content.splitlines()]
+        # Solo los creados hoy y hace 200 días
+        self.assertEqual(emails, ["contacto0@example.com", "contacto1@example.com"])
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contacts.csv")
+            stdout = StringIO()
+            call_command(
+                "export_contacts",
+                "--output",
+                path,
+                "--from",
+                (timezone.localdate() - timedelta(days=450)).isoformat(),
+                stdout=stdout,
+            )
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertIn("Exported 3 rows", stdout.getvalue())
+        self.assertEqual(
+            [row["email"] for row in rows],
+            [f"contacto{index}@example.com" for index in range(3)],
+        )
+
+
+class ContactRetentionTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        now = timezone.now()
+        for index in range(5):
+            contact = Contact.objects.create(
+                name=f"Contacto {index}",
+                email=f"contacto{index}@example.com",
+                message="Hola",
+                content_hash=f"hash{index}",
+            )
+            # Tres contactos antiguos y dos recientes
+            days = 400 + index if index < 3 else index
+            contact.created_at = now - timedelta(days=days)
+            contact.save(update_fields=["created_at"])
+
+    def archive(self, **kwargs):
+        return archive(days=365, batch_size=2, directory=self.directory, **kwargs)
+
+    def test_archives_and_deletes_in_batches(self):
+        old = list(Contact.objects.order_by("created_at").values(*FIELDS)[:3])
+        result = self.archive()
+        self.assertEqual(result["archived"], 3)
+        self.assertEqual(len(result["files"]), 2)
+        self.assertEqual(Contact.objects.count(), 2)
+
+        rows = [row for path in result["files"] for row in read_archive(path)]
+        self.assertEqual([row["id"] for row in rows], [row["id"] for row in old])
+        self.assertEqual(parse_datetime(rows[0]["created_at"]), old[0]["created_at"])
+
+    def test_pending_notifications_are_kept(self):
+        contact = Contact.objects.order_by("created_at").first()
+        ContactNotification.objects.create(contact=contact)
+        self.assertEqual(self.archive()["archived"], 2)
+        self.assertTrue(Contact.objects.filter(pk=contact.pk).exists())
+
+    def test_resumes_after_interruption(self):
+        # Si el borrado falla tras escribir el archivo, la siguiente ejecución
+        # reescribe el mismo archivo en lugar de duplicar los contactos
+        with mock.patch(
+            "contacts.retention.transaction.atomic", side_effect=KeyboardInterrupt
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                self.archive()
+        self.assertEqual(Contact.objects.count(), 5)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+        result = self.archive()
+        self.assertEqual(result["archived"], 3)
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            sorted(os.path.basename(path) for path in result["files"]),
+        )
+
+    def test_restore(self):
+        expected = list(Contact.objects.order_by("pk").values(*FIELDS))
+        self.archive()
+
+        stdout = StringIO()
+        call_command("restore_contacts", self.directory, stdout=stdout)
+        self.assertIn("Restored: 3", stdout.getvalue())
+        self.assertEqual(list(Contact.objects.order_by("pk").values(*FIELDS)), expected)
+
+        # Restaurar dos veces no duplica contactos
+        restore(self.directory)
+        self.assertEqual(Contact.objects.count(), 5)
+
+    def test_restore_archive_without_content_hash(self):
+        # Los archivos anteriores a content_hash se restauran con el hash vacío
+        contact = Contact.objects.order_by("created_at").values(*FIELDS).first()
+        path = os.path.join(self.directory, "contacts-old.jsonl.gz")
+        with gzip.open(path, "wb") as f:
+            row = {
+                key: value for key, value in contact.items() if key != "content_hash"
+            }
+            f.write(to_json_line(row))
+        Contact.objects.filter(pk=contact["id"]).delete()
+
+        self.assertEqual(restore(path), 1)
+        restored = Contact.objects.get(pk=contact["id"])
+        self.assertEqual(restored.content_hash, "")
+        self.assertEqual(restored.created_at, contact["created_at"])
+
+    def test_zero_days_archives_everything(self):
+        result = archive(days=0, batch_size=10, directory=self.directory)
+        self.assertEqual(result["archived"], 5)
+
+    def test_management_command(self):
+        stdout = StringIO()
+        call_command(
+            "archive_contacts",
+            "--days",
+            "365",
+            "--output",
+            self.directory,
+            stdout=stdout,
+        )
+        self.assertIn("Archived: 3, files: 1", stdout.getvalue())
@@ -0,0 +1,31 @@
+from collections.abc import Mapping
+from hashlib import sha256
+
+from portfolio_api.throttling import ConcurrencyLimiter, TokenBucketThrottle
+
+# ContactCreateView requests being handled by all workers
+limiter = ConcurrencyLimiter("contact")
+
+
+class ContactIPThrottle(TokenBucketThrottle):
+    scope = "contact_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class ContactEmailThrottle(TokenBucketThrottle):
+    scope = "contact_email"
+
+    def get_cache_key(self, request, view):
+        # The serializer rejects bodies that are not objects
+        if not isinstance(request.data, Mapping):
+            return None
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
@@ -1,30 +1,68 @@
-from django.core.mail import send_mail
+import math
+
 from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import Throttled
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.status import HTTP_201_CREATED
 
-from .models import Contact
+from portfolio_api.metrics import registry
+from portfolio_api.performance import timing
+
+from .duplicates import claim, get_content_hash, release
+from .models import Contact, ContactNotification
+from .outbox import wake_worker
 from .serializers import ContactSerializer
+from .throttling import ContactEmailThrottle, ContactIPThrottle, limiter
 
 
 class ContactCreateView(CreateAPIView):
     permission_classes = [AllowAny]
     serializer_class = ContactSerializer
     queryset = Contact.objects.all()
+    throttle_classes = [ContactIPThrottle, ContactEmailThrottle]
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Throttled requests never take a slot
+        timeout = settings.CONTACT_QUEUE_TIMEOUT
+        self.holds_slot = limiter.acquire(
+            settings.CONTACT_MAX_CONCURRENCY, settings.CONTACT_MAX_QUEUE, timeout
+        )
+        if not self.holds_slot:
+            registry.inc("throttled_requests_total", scope="contact_concurrency")
+            raise Throttled(wait=max(1, math.ceil(timeout)))
+
+    def dispatch(self, request, *args, **kwargs):
+        self.holds_slot = False
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self.holds_slot:
+                limiter.release()
 
     def create(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-
-        send_mail(
-            f"New contact from portfolio: {serializer.data['name']}",
-            f"{serializer.data['message']} | Contact email: {serializer.data['email']}",
-            settings.EMAIL_HOST_USER,
-            [settings.EMAIL_TO_USER],
-            fail_silently=True,
+
+        # Repeated submissions get the same answer but are not stored or sent
+        content_hash = get_content_hash(
+            serializer.validated_data["email"], serializer.validated_data["message"]
         )
+        if not claim(content_hash):
+            return Response({"message": "success"}, status=HTTP_201_CREATED)
+
+        try:
+            with transaction.atomic():
+                contact = serializer.save(content_hash=content_hash)
+                with timing("outbox_enqueue"):
+                    ContactNotification.objects.create(contact=contact)
+                    if settings.CONTACT_OUTBOX_MODE == "thread":
+                        transaction.on_commit(wake_worker)
+        except Exception:
+            release(content_hash)
+            raise
 
         return Response({"message": "success"}, status=HTTP_201_CREATED)
@@ -0,0 +1,2 @@
+# Loaded by gunicorn from the working directory; see portfolio_api/server.py
+from portfolio_api.server import *  # noqa: F401,F403
@@ -3,6 +3,15 @@ ASGI config for portfolio_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+ASGI deployment mode runs the same project under uvicorn workers:
+
+    gunicorn portfolio_api.asgi:application -k uvicorn.workers.UvicornWorker
+
+Under ASGI the native async endpoints in ``projects.async_views``
+(``/api/async/projects/`` and ``/api/async/projects/<pk>/``) stay on the event
+loop and use the async ORM, while the DRF views run in a thread as usual.
+``python -m benchmarks.asgi_vs_wsgi`` compares both modes.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -0,0 +1,123 @@
+import zlib
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+CHUNK_SIZE = 64 * 1024
+
+# HTML is left alone: admin and browsable API pages carry CSRF tokens (BREACH)
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+}
+
+
+def get_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding):
+    """
+    Return the preferred supported encoding in ``Accept-Encoding`` or ``None``.
+
+    Highest quality wins and ties prefer brotli; ``*`` stands for any encoding
+    not listed explicitly.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if name:
+            qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0
+    for encoding in get_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def get_compressor(encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def compress(content, encoding):
+    process, finish = get_compressor(encoding)
+    return process(content) + finish()
+
+
+def compress_chunks(chunks, encoding):
+    process, finish = get_compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_chunks(chunks, encoding):
+    process, finish = get_compressor(encoding)
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def split(content):
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start : start + CHUNK_SIZE]
+
+
+def get_cache():
+    return caches[settings.COMPRESSION_CACHE_ALIAS]
+
+
+def cache_key(etag, encoding):
+    # A strong ETag identifies the exact bytes of one representation
+    return f"compression:{encoding}:{md5(etag.encode(), usedforsecurity=False).hexdigest()}"
+
+
+def get_cached(etag, encoding):
+    return get_cache().get(cache_key(etag, encoding))
+
+
+def set_cached(etag, encoding, content):
+    get_cache().set(
+        cache_key(etag, encoding), content, timeout=settings.COMPRESSION_CACHE_TIMEOUT
+    )
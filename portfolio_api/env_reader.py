@@ -1,21 +1,63 @@
 import os
-
+import re
+from functools import lru_cache
 from pathlib import Path
 
+DEFAULT_ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
 
-def read_env_file() -> None:
-    base_path = Path(__file__).resolve().parent.parent
-    env_file = base_path / ".env"
+LINE_RE = re.compile(r"^(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(.*)$")
+ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
 
-    if not env_file.exists():
-        return
 
-    with open(env_file, "r") as f:
-        for line in f.readlines():
-            line = line.strip()
+def parse_value(value):
+    if value[:1] in ("'", '"'):
+        quote = value[0]
+        end = value.find(quote, 1)
+        while quote == '"' and end > 0 and value[end - 1] == "\\":
+            end = value.find(quote, end + 1)
+        if end > 0:
+            value = value[1:end]
+            if quote == '"':
+                value = re.sub(r"\\(.)", lambda m: ESCAPES.get(m[1], m[0]), value)
+            return value
+
+    # Unquoted values end at an inline comment
+    return re.split(r"\s+#", value, maxsplit=1)[0].strip()
+
+
+def parse_env(text):
+    """
+    Parse the ``KEY=value`` lines of a .env file into a dict.
+
+    Values may contain ``=``, be wrapped in single quotes (taken literally) or
+    double quotes (with ``\\n``-style escapes), and be followed by a
+    ``# comment`` when unquoted. An ``export`` prefix is ignored, as are
+    blank lines, comments and lines that are not assignments.
+    """
+    env = {}
+    for line in text.splitlines():
+        match = LINE_RE.match(line.strip())
+        if match:
+            env[match[1]] = parse_value(match[2])
+    return env
 
-            if not line or line.startswith("#"):
-                continue
 
-            key, value = line.split("=")
-            os.environ[key] = value
+@lru_cache
+def load_env_file(path, mtime_ns):
+    # Keyed on the modification time, so an edited file is read again
+    return parse_env(Path(path).read_text(encoding="utf-8"))
+
+
+def read_env_file(path=DEFAULT_ENV_FILE) -> None:
+    """
+    Add the variables of ``path`` to ``os.environ``.
+
+    As before the parser was rewritten, the file wins over variables already
+    set in the environment.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return
+
+    os.environ.update(load_env_file(str(path), mtime_ns))
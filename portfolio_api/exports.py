@@ -0,0 +1,324 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.core.management.base import BaseCommand, CommandError
+from django.http import StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+from .compression import compress_chunks
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+BUFFER_SIZE = 64 * 1024
+
+# Spreadsheets run cells starting with these as formulas (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def start_of_day(value):
+    value = datetime.combine(value, time.min)
+    return timezone.make_aware(value) if settings.USE_TZ else value
+
+
+def filter_dates(queryset, field, start=None, end=None):
+    """
+    Keep the rows whose ``field`` falls between the dates ``start`` and
+    ``end``, both included, in the current time zone.
+    """
+    if start:
+        queryset = queryset.filter(**{f"{field}__gte": start_of_day(start)})
+    if end:
+        end = start_of_day(end + timedelta(days=1))
+        queryset = queryset.filter(**{f"{field}__lt": end})
+    return queryset
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def to_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        value = "|".join(str(item) for item in value)
+    elif isinstance(value, (date, datetime)):
+        return value.isoformat()
+    elif not isinstance(value, str):
+        return value
+    if value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def from_csv_value(value):
+    # Undo the formula guard of to_csv_value
+    if value.startswith("'") and value[1:2] in FORMULA_PREFIXES:
+        return value[1:]
+    return value
+
+
+def read_rows(file, format):
+    """
+    Yield the rows of a binary ``file`` in ``format`` (CSV, JSONL or a JSON
+    array) as dicts.
+    """
+    if format == "csv":
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        for row in csv.DictReader(text, restval=""):
+            yield {
+                key: from_csv_value(value)
+                for key, value in row.items()
+                if key is not None
+            }
+    elif format == "jsonl":
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        yield from json.load(file)
+
+
+def encode_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_line(row):
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+    line = json.dumps(
+        row, default=encode_default, ensure_ascii=False, separators=(",", ":")
+    )
+    return f"{line}\n".encode()
+
+
+class ModelExport:
+    """
+    Rows of a queryset streamed as CSV or JSONL.
+
+    ``fields`` are read with ``values()`` and ``iterator(chunk_size)``, and
+    the output is yielded in chunks of about ``BUFFER_SIZE`` bytes, so memory
+    stays the same whatever the number of rows. Subclasses add columns per
+    chunk of rows in ``prepare()``.
+    """
+
+    model = None
+    name = None
+    fields = ()
+    date_field = "created_at"
+    chunk_size = 2000
+
+    def __init__(self, queryset=None, chunk_size=None):
+        if queryset is None:
+            queryset = self.model._default_manager.order_by("pk")
+        self.queryset = queryset
+        self.chunk_size = chunk_size or self.chunk_size
+        self.count = 0
+
+    def get_columns(self):
+        return list(self.fields)
+
+    def prepare(self, rows):
+        return rows
+
+    def iter_rows(self):
+        rows = self.queryset.values(*self.fields).iterator(chunk_size=self.chunk_size)
+        for chunk in batched(rows, self.chunk_size):
+            for row in self.prepare(chunk):
+                self.count += 1
+                yield row
+
+    def iter_csv(self):
+        columns = self.get_columns()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in self.iter_rows():
+            writer.writerow([to_csv_value(row[column]) for column in columns])
+            if buffer.tell() >= BUFFER_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+
+    def iter_jsonl(self):
+        columns = self.get_columns()
+        lines = []
+        size = 0
+        for row in self.iter_rows():
+            line = to_json_line({column: row[column] for column in columns})
+            lines.append(line)
+            size += len(line)
+            if size >= BUFFER_SIZE:
+                yield b"".join(lines)
+                lines, size = [], 0
+        yield b"".join(lines)
+
+    def stream(self, format, compress=False):
+        chunks = self.iter_csv() if format == "csv" else self.iter_jsonl()
+        return compress_chunks(chunks, "gzip") if compress else chunks
+
+    def get_filename(self, format, compress=False):
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S")
+        suffix = ".gz" if compress else ""
+        return f"{self.name}-{stamp}.{format}{suffix}"
+
+    def get_response(self, format, compress=False):
+        content_type = "application/gzip" if compress else CONTENT_TYPES[format]
+        response = StreamingHttpResponse(
+            self.stream(format, compress), content_type=content_type
+        )
+        filename = self.get_filename(format, compress)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ExportOptionsForm(forms.Form):
+    export_from = forms.DateField(label="Desde", required=False)
+    export_to = forms.DateField(label="Hasta", required=False)
+    export_gzip = forms.BooleanField(label="gzip", required=False)
+
+
+class ExportActionForm(ActionForm, ExportOptionsForm):
+    def full_clean(self):
+        super().full_clean()
+        # An invalid option would make the admin refuse to run any action, so
+        # the export action checks them and shows the errors itself
+        for name in ExportOptionsForm.base_fields:
+            self._errors.pop(name, None)
+
+
+def make_export_action(export_class, format):
+    """
+    Return an admin action that streams the selected rows as ``format``.
+
+    The admin must use ``ExportActionForm``, whose date range and gzip fields
+    apply to the export. Invalid options render the form again with their
+    errors.
+    """
+
+    @admin.action(description=f"Exportar seleccionados como {format.upper()}")
+    def action(modeladmin, request, queryset):
+        form = ExportOptionsForm(request.POST)
+        if not form.is_valid():
+            return TemplateResponse(
+                request,
+                "admin/export_options.html",
+                {
+                    **modeladmin.admin_site.each_context(request),
+                    "title": action.short_description,
+                    "opts": modeladmin.model._meta,
+                    "form": form,
+                    "action": action.__name__,
+                    "selected": request.POST.getlist(ACTION_CHECKBOX_NAME),
+                    "select_across": request.POST.get("select_across", "0"),
+                },
+            )
+
+        options = form.cleaned_data
+        queryset = filter_dates(
+            queryset,
+            export_class.date_field,
+            options.get("export_from"),
+            options.get("export_to"),
+        )
+        return export_class(queryset).get_response(
+            format, compress=options.get("export_gzip", False)
+        )
+
+    action.__name__ = f"export_{format}"
+    return action
+
+
+class ExportCommand(BaseCommand):
+    """
+    Base of the commands that write a ``ModelExport`` to a file or stdout.
+    """
+
+    export_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default="csv",
+            help="Formato de salida.",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Archivo de salida; '-' escribe en stdout.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Comprime la salida con gzip; implícito si --output acaba en .gz.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="from_date",
+            type=date.fromisoformat,
+            help="Primera fecha incluida (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--to",
+            dest="to_date",
+            type=date.fromisoformat,
+            help="Última fecha incluida (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.export_class.chunk_size,
+            help="Filas leídas de la base de datos por consulta.",
+        )
+
+    def handle(self, *args, **options):
+        if options["from_date"] and options["to_date"]:
+            if options["from_date"] > options["to_date"]:
+                raise CommandError("--from must not be after --to.")
+
+        output = options["output"]
+        compress = options["gzip"] or output.endswith(".gz")
+        queryset = filter_dates(
+            self.export_class.model._default_manager.order_by("pk"),
+            self.export_class.date_field,
+            options["from_date"],
+            options["to_date"],
+        )
+        export = self.export_class(queryset, chunk_size=options["chunk_size"])
+        chunks = export.stream(options["format"], compress=compress)
+
+        if output == "-":
+            # Keep stdout for the data
+            self.stdout.flush()
+            for chunk in chunks:
+                self.stdout.buffer.write(chunk)
+            self.stdout.buffer.flush()
+            self.stderr.write(f"Exported {export.count} rows")
+            return
+
+        with open(output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stdout.write(f"Exported {export.count} rows to {output}")
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_api.startup import get_eager_deferred, get_total_ms, measure_imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el tiempo de importación de cada módulo al arrancar un worker y "
+        "falla si el total supera STARTUP_IMPORT_BUDGET_MS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Número de módulos listados.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Ordena por tiempo acumulado o propio de cada módulo.",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=settings.STARTUP_IMPORT_BUDGET_MS,
+            help="Tiempo máximo de importación en milisegundos.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            modules = measure_imports()
+        except RuntimeError as e:
+            raise CommandError(f"Startup failed: {e}")
+
+        index = 2 if options["sort"] == "cumulative" else 1
+        modules_by_time = sorted(
+            modules, key=lambda module: module[index], reverse=True
+        )
+        self.stdout.write(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+        for name, self_us, cumulative_us, _ in modules_by_time[: options["limit"]]:
+            self.stdout.write(
+                f"{name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}"
+            )
+
+        total = get_total_ms(modules)
+        self.stdout.write(
+            f"Total: {total:.1f} ms in {len(modules)} modules "
+            f"(budget {options['budget']:.0f} ms)"
+        )
+
+        eager = get_eager_deferred(modules)
+        if eager:
+            raise CommandError(f"Imported at startup: {', '.join(eager)}")
+        if total > options["budget"]:
+            raise CommandError(
+                f"Startup imports took {total:.1f} ms, over the "
+                f"{options['budget']:.0f} ms budget."
+            )
@@ -0,0 +1,323 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name: (type, help, buckets)
+METRICS = {
+    "http_requests_total": (
+        "counter",
+        "Requests by route, method and status.",
+        None,
+    ),
+    "http_requests_in_progress": (
+        "gauge",
+        "Requests being handled by live processes.",
+        None,
+    ),
+    "http_request_duration_seconds": (
+        "histogram",
+        "Request latency by route and method.",
+        DURATION_BUCKETS,
+    ),
+    "http_response_size_bytes": (
+        "histogram",
+        "Response body size by route.",
+        SIZE_BUCKETS,
+    ),
+    "http_request_queries": (
+        "histogram",
+        "SQL queries per request by route.",
+        QUERY_BUCKETS,
+    ),
+    "projects_cache_responses_total": (
+        "counter",
+        "Project responses by route and cache result (X-Cache).",
+        None,
+    ),
+    "contact_emails_total": (
+        "counter",
+        "Contact notification delivery attempts by outcome.",
+        None,
+    ),
+    "throttled_requests_total": (
+        "counter",
+        "Requests refused with 429 by throttle scope.",
+        None,
+    ),
+    "contact_duplicates_total": (
+        "counter",
+        "Duplicate contact submissions dropped, by where they were detected.",
+        None,
+    ),
+    "database_replica_checks_total": (
+        "counter",
+        "Read replica health checks by alias and result.",
+        None,
+    ),
+}
+
+
+def get_key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Registry:
+    """
+    Metric values of this process.
+
+    Updates only touch dicts under one short lock. When ``METRICS_DIR`` is set
+    the values are written every ``METRICS_FLUSH_INTERVAL`` seconds to a file
+    of their own, which is how the ``/metrics`` view of any gunicorn worker
+    sees the values of all of them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start()
+
+    def start(self):
+        # The start time keeps the file of a reused pid apart from the old one
+        self.pid = os.getpid()
+        self.name = f"{self.pid}-{time.time_ns()}.json"
+        self.next_flush = 0
+        self.clear()
+
+    def after_fork(self):
+        # Forked workers inherit the parent's values and lock state
+        self.lock = threading.Lock()
+        self.start()
+
+    def clear(self):
+        with self.lock:
+            self.counters = {}
+            self.gauges = {}
+            self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = get_key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.maybe_flush()
+
+    def add_gauge(self, name, value, **labels):
+        key = get_key(name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = get_key(name, labels)
+        index = bisect_left(buckets, value)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(buckets), 0, 0]
+            if index < len(buckets):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+        self.maybe_flush()
+
+    def dump(self):
+        with self.lock:
+            return {
+                "pid": self.pid,
+                "counters": [[*key, value] for key, value in self.counters.items()],
+                "gauges": [[*key, value] for key, value in self.gauges.items()],
+                "histograms": [
+                    [*key, list(counts), total, count]
+                    for key, (counts, total, count) in self.histograms.items()
+                ],
+            }
+
+    def maybe_flush(self):
+        if settings.METRICS_DIR and time.monotonic() >= self.next_flush:
+            self.flush()
+
+    def flush(self):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+
+        self.next_flush = time.monotonic() + settings.METRICS_FLUSH_INTERVAL
+        os.makedirs(directory, exist_ok=True)
+        write_dump(directory, self.name, self.dump())
+
+
+registry = Registry()
+atexit.register(registry.flush)
+os.register_at_fork(after_in_child=registry.after_fork)
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def load_dumps():
+    """
+    Return the dumps of every process, this one included.
+
+    Counters and histograms of exited processes are kept so totals never go
+    down; their gauges are dropped.
+    """
+    directory = settings.METRICS_DIR
+    if not directory:
+        return [registry.dump()]
+
+    registry.flush()
+    dumps = []
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        dump = read_dump(os.path.join(directory, name))
+        if dump is None:
+            continue
+        if dump["pid"] and not is_alive(dump["pid"]):
+            dump["gauges"] = []
+        dumps.append(dump)
+    return dumps
+
+
+EXITED_NAME = "exited.json"
+
+
+def write_dump(directory, name, dump):
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(dump, f)
+    os.replace(path, os.path.join(directory, name))
+
+
+def read_dump(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_directory():
+    directory = settings.METRICS_DIR
+    if not directory or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            os.remove(os.path.join(directory, name))
+
+
+def collect_exited(pid):
+    """
+    Fold the counters and histograms of the exited process ``pid`` into
+    ``exited.json``.
+
+    Workers recycled after ``max_requests`` would otherwise each leave a file
+    behind, read on every scrape. Called by the gunicorn master.
+    """
+    directory = settings.METRICS_DIR
+    if not directory or not os.path.isdir(directory):
+        return
+
+    names = [
+        name
+        for name in os.listdir(directory)
+        if name.startswith(f"{pid}-") and name.endswith(".json")
+    ]
+    if not names:
+        return
+
+    dumps = []
+    for name in [EXITED_NAME, *names]:
+        dump = read_dump(os.path.join(directory, name))
+        if dump is not None:
+            dump["gauges"] = []
+            dumps.append(dump)
+
+    exited = {"pid": 0, "counters": [], "gauges": [], "histograms": []}
+    for (name, labels), value in merge(dumps).items():
+        if isinstance(value, list):
+            exited["histograms"].append([name, labels, *value])
+        else:
+            exited["counters"].append([name, labels, value])
+    write_dump(directory, EXITED_NAME, exited)
+    for name in names:
+        os.remove(os.path.join(directory, name))
+
+
+def merge(dumps):
+    values = {}
+    for dump in dumps:
+        for kind in ("counters", "gauges"):
+            for name, labels, value in dump[kind]:
+                key = get_key(name, dict(labels))
+                values[key] = values.get(key, 0) + value
+        for name, labels, counts, total, count in dump["histograms"]:
+            key = get_key(name, dict(labels))
+            merged = values.setdefault(key, [[0] * len(counts), 0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+    return values
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    items = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels
+    )
+    return f"{{{items}}}"
+
+
+def format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def render():
+    """
+    Render the merged metrics in the Prometheus text exposition format.
+    """
+    values = merge(load_dumps())
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(values.items()):
+            if metric != name:
+                continue
+            if kind != "histogram":
+                lines.append(f"{name}{format_labels(labels)} {format_number(value)}")
+                continue
+
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels(labels + (("le", format_number(bound)),))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = format_labels(labels + (("le", "+Inf"),))
+            lines.append(f"{name}_bucket{inf_labels} {count}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_number(total)}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
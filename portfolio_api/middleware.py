@@ -0,0 +1,365 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from projects.static_names import is_hashed_name
+
+from . import compression, metrics, performance, routers
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that stays on the event loop under ASGI.
+
+    WhiteNoise is sync-only, so Django would run it and every middleware and
+    view below it through a thread hop on each request. This version only
+    leaves the event loop to serve an actual static file.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+    def immutable_file_test(self, path, url):
+        # Exported API files carry their content hash, like collectstatic ones
+        if url.startswith(self.static_prefix) and is_hashed_name(
+            url[len(self.static_prefix) :]
+        ):
+            return True
+        return super().immutable_file_test(path, url)
+
+
+class PerformanceMiddleware:
+    """
+    Measure each request and report it in ``Server-Timing`` and the logs.
+
+    Reports total time, SQL count and time, response rendering time and any
+    phase timed with ``performance.timing``, such as project serialization or
+    the contact outbox. With ``PERFORMANCE_PROFILE`` a sample of requests is
+    also profiled to disk. Removed from the stack unless
+    ``PERFORMANCE_METRICS`` is set.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_METRICS:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.profiler = None
+        if settings.PERFORMANCE_PROFILE:
+            self.profiler = performance.SlowRequestProfiler(
+                settings.PERFORMANCE_PROFILE_DIR,
+                settings.PERFORMANCE_PROFILE_SAMPLE_RATE,
+                settings.PERFORMANCE_PROFILE_KEEP,
+            )
+        performance.install_query_recorder()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics, token = performance.start_request()
+        try:
+            if self.profiler is not None and self.profiler.should_sample():
+                response = self.profiler.capture(request, self.get_response)
+            else:
+                response = self.get_response(request)
+        finally:
+            performance.end_request(token)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        # Profiling is sync only: cProfile would mix concurrent coroutines
+        metrics, token = performance.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            performance.end_request(token)
+        return self.report(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        metrics = performance.get_current()
+        if metrics is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: metrics.add("render", time.perf_counter() - start)
+            )
+        return response
+
+    def report(self, request, response, metrics):
+        metrics.finish()
+        response["Server-Timing"] = metrics.server_timing()
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **metrics.as_log_fields(),
+        }
+        performance.logger.info(
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"performance": fields},
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record request counts, latency, response size and SQL queries per route.
+
+    Routes are URL patterns, such as ``api/projects/<int:pk>/``, so labels
+    stay bounded. Values are exposed by the ``/metrics`` view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        performance.install_query_recorder()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request_metrics, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.finish(token)
+        self.record(request, response, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        request_metrics, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.finish(token)
+        self.record(request, response, request_metrics)
+        return response
+
+    def start(self, request):
+        metrics.registry.add_gauge("http_requests_in_progress", 1)
+        # Reuse the measurements of PerformanceMiddleware when it is enabled
+        request_metrics = performance.get_current()
+        if request_metrics is not None:
+            return request_metrics, None
+        return performance.start_request()
+
+    def finish(self, token):
+        metrics.registry.add_gauge("http_requests_in_progress", -1)
+        if token is not None:
+            performance.end_request(token)
+
+    def record(self, request, response, request_metrics):
+        duration = time.perf_counter() - request_metrics.start
+        match = request.resolver_match
+        route = match.route if match is not None else "unmatched"
+        registry = metrics.registry
+
+        registry.inc(
+            "http_requests_total",
+            route=route,
+            method=request.method,
+            status=str(response.status_code),
+        )
+        registry.observe(
+            "http_request_duration_seconds",
+            duration,
+            route=route,
+            method=request.method,
+        )
+        registry.observe("http_request_queries", request_metrics.queries, route=route)
+        if not response.streaming:
+            registry.observe(
+                "http_response_size_bytes", len(response.content), route=route
+            )
+        if response.has_header("X-Cache"):
+            registry.inc(
+                "projects_cache_responses_total",
+                route=route,
+                result=response["X-Cache"].lower(),
+            )
+
+
+class ReplicaMiddleware:
+    """
+    Keep the reads of a client on the primary database right after it writes.
+
+    Requests that may write, admin requests and requests carrying the
+    ``DATABASE_REPLICA_PIN_COOKIE`` read from the primary. A request that
+    wrote to a replicated model sets that cookie for
+    ``DATABASE_REPLICA_PIN_SECONDS``, the time the replicas may take to catch
+    up. Removed from the stack when no replica is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.admin_prefix = reverse("admin:index")
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        tokens = routers.start_request(self.use_primary(request))
+        try:
+            response = self.get_response(request)
+            return self.process_response(response)
+        finally:
+            routers.end_request(tokens)
+
+    async def __acall__(self, request):
+        tokens = routers.start_request(self.use_primary(request))
+        try:
+            response = await self.get_response(request)
+            return self.process_response(response)
+        finally:
+            routers.end_request(tokens)
+
+    def use_primary(self, request):
+        return (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            or request.path.startswith(self.admin_prefix)
+            or settings.DATABASE_REPLICA_PIN_COOKIE in request.COOKIES
+        )
+
+    def process_response(self, response):
+        if routers.has_written():
+            response.set_cookie(
+                settings.DATABASE_REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip as negotiated by ``Accept-Encoding``.
+
+    Bodies under ``COMPRESSION_MIN_SIZE`` are sent as they are. Responses with
+    a strong ETag are compressed once and the compressed bytes are cached by
+    ETag and encoding, so repeated hits skip the compressor. Streaming
+    responses and uncached bodies over ``COMPRESSION_STREAM_SIZE`` are
+    compressed chunk by chunk while they are sent.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding") or not compression.is_compressible(
+            response.get("Content-Type", "")
+        ):
+            return response
+        min_size = settings.COMPRESSION_MIN_SIZE
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        etag = response.get("ETag", "")
+        if response.streaming:
+            response = self.compress_stream(response, encoding)
+        elif etag.startswith('"'):
+            content = compression.get_cached(etag, encoding)
+            if content is None:
+                content = compression.compress(response.content, encoding)
+                compression.set_cached(etag, encoding, content)
+            response.content = content
+        elif len(response.content) >= settings.COMPRESSION_STREAM_SIZE:
+            response = self.compress_stream(response, encoding)
+        else:
+            response.content = compression.compress(response.content, encoding)
+        if not response.streaming:
+            response["Content-Length"] = str(len(response.content))
+
+        # The compressed body is a different representation of the same content
+        if etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = encoding
+        return response
+
+    def compress_stream(self, response, encoding):
+        if not response.streaming:
+            streaming = StreamingHttpResponse(
+                compression.split(response.content), status=response.status_code
+            )
+            for header, value in response.items():
+                streaming[header] = value
+            streaming.cookies = response.cookies
+            response = streaming
+
+        if response.is_async:
+            response.streaming_content = compression.compress_async_chunks(
+                response.streaming_content, encoding
+            )
+        else:
+            response.streaming_content = compression.compress_chunks(
+                response.streaming_content, encoding
+            )
+        del response["Content-Length"]
+        return response
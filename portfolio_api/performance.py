@@ -0,0 +1,193 @@
+import cProfile
+import heapq
+import logging
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Time spent by one request, split by phase.
+
+    ``durations`` maps a phase name, such as ``render`` or ``outbox_enqueue``,
+    to the seconds spent in it. SQL is tracked separately as a count and a
+    time.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total = None
+        self.queries = 0
+        self.query_time = 0.0
+        self.durations = {}
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def add_query(self, duration):
+        self.queries += 1
+        self.query_time += duration
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def server_timing(self):
+        entries = [
+            f"total;dur={self.total * 1000:.2f}",
+            f'db;dur={self.query_time * 1000:.2f};desc="{self.queries} queries"',
+        ]
+        for name, duration in self.durations.items():
+            entries.append(f"{name};dur={duration * 1000:.2f}")
+        return ", ".join(entries)
+
+    def as_log_fields(self):
+        fields = {
+            "total_ms": round(self.total * 1000, 2),
+            "db_queries": self.queries,
+            "db_ms": round(self.query_time * 1000, 2),
+        }
+        for name, duration in self.durations.items():
+            fields[f"{name}_ms"] = round(duration * 1000, 2)
+        return fields
+
+
+def get_current():
+    return _current.get()
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timing(name):
+    """
+    Add the time spent in the block to phase ``name`` of the current request.
+
+    Outside an instrumented request it only runs the block.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - start)
+
+
+def add_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorder():
+    """
+    Install ``record_query`` on every database connection, present and future.
+
+    Connections are per thread and async views query from a worker thread, so
+    the wrapper stays installed and reports to the request found in its
+    context instead of being pushed around each request.
+    """
+    connection_created.connect(add_query_recorder)
+    for connection in connections.all(initialized_only=True):
+        add_query_recorder(connection)
+
+
+class SlowRequestProfiler:
+    """
+    Profile a sample of requests and keep the captures of the slowest ones.
+
+    Each sampled request runs under cProfile and tracemalloc. The captures are
+    written to ``directory`` only while the request is among the ``keep``
+    slowest sampled in this process, and evicted captures are deleted.
+    tracemalloc is process wide, so only one request is captured at a time.
+    """
+
+    def __init__(self, directory, sample_rate, keep):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.slowest = []
+        self.lock = threading.Lock()
+
+    def should_sample(self):
+        return random.random() < self.sample_rate
+
+    def capture(self, request, get_response):
+        if not self.lock.acquire(blocking=False):
+            return get_response(request)
+
+        try:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                response = get_response(request)
+            finally:
+                profile.disable()
+                duration = time.perf_counter() - start
+                snapshot = tracemalloc.take_snapshot()
+                if not was_tracing:
+                    tracemalloc.stop()
+            self.save(request, duration, profile, snapshot)
+            return response
+        finally:
+            self.lock.release()
+
+    def save(self, request, duration, profile, snapshot):
+        if len(self.slowest) >= self.keep and duration <= self.slowest[0][0]:
+            return
+
+        slug = re.sub(r"[^\w-]+", "_", request.path).strip("_") or "root"
+        name = f"{time.time_ns()}-{request.method}-{slug}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(f"{path}.prof")
+        snapshot.dump(f"{path}.tracemalloc")
+
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, (duration, path))
+            return
+
+        _, evicted = heapq.heapreplace(self.slowest, (duration, path))
+        for suffix in (".prof", ".tracemalloc"):
+            try:
+                os.remove(evicted + suffix)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+
+_use_primary = ContextVar("database_use_primary", default=False)
+_replica = ContextVar("database_replica", default=None)
+_written = ContextVar("database_written", default=False)
+
+# alias: (monotonic time of the next check, healthy)
+_health = {}
+
+# Zero while the replica has replayed everything it received, so an idle
+# primary does not look like lag
+PG_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def start_request(use_primary):
+    return (
+        _use_primary.set(use_primary),
+        _replica.set(None),
+        _written.set(False),
+    )
+
+
+def end_request(tokens):
+    for var, token in zip((_use_primary, _replica, _written), tokens):
+        var.reset(token)
+
+
+def use_primary():
+    """
+    Send the remaining reads of this request, or of this command, to the
+    primary.
+    """
+    _use_primary.set(True)
+
+
+def has_written():
+    return _written.get()
+
+
+def pin_recent_write(written_at):
+    """
+    Read from the primary when ``written_at``, a Unix timestamp, is more
+    recent than the replicas can be trusted to have caught up with.
+    """
+    if time.time() - written_at < settings.DATABASE_REPLICA_PIN_SECONDS:
+        use_primary()
+
+
+def check(alias):
+    """
+    Return whether the replica ``alias`` answers and is not lagging more than
+    ``DATABASE_REPLICA_MAX_LAG`` seconds behind the primary.
+    """
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor != "postgresql":
+                cursor.execute("SELECT 1")
+                return True
+            cursor.execute(PG_LAG_SQL)
+            lag = float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning("Database replica %s is unavailable", alias, exc_info=True)
+        connection.close()
+        return False
+
+    if lag > settings.DATABASE_REPLICA_MAX_LAG:
+        logger.warning("Database replica %s is %.1f s behind", alias, lag)
+        return False
+    return True
+
+
+def is_healthy(alias):
+    now = time.monotonic()
+    next_check, healthy = _health.get(alias, (0, True))
+    if now < next_check:
+        return healthy
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Checking needs a blocking query; the next sync lookup will do it
+        return healthy
+
+    healthy = check(alias)
+    registry.inc(
+        "database_replica_checks_total",
+        alias=alias,
+        result="healthy" if healthy else "unhealthy",
+    )
+    interval = (
+        settings.DATABASE_REPLICA_CHECK_INTERVAL
+        if healthy
+        else settings.DATABASE_REPLICA_RETRY_INTERVAL
+    )
+    _health[alias] = (now + interval, healthy)
+    return healthy
+
+
+def get_read_database():
+    """
+    Return the alias the reads of this request go to.
+
+    One healthy replica is picked at random and kept for the whole request,
+    so its queries see a single consistent state. Falls back to the primary
+    when it is pinned or no replica is healthy.
+    """
+    if _use_primary.get() or not settings.DATABASE_REPLICAS:
+        return PRIMARY
+
+    alias = _replica.get()
+    if alias is None or not is_healthy(alias):
+        healthy = [alias for alias in settings.DATABASE_REPLICAS if is_healthy(alias)]
+        alias = random.choice(healthy) if healthy else PRIMARY
+        _replica.set(alias)
+    return alias
+
+
+class ReplicaRouter:
+    """
+    Send reads of ``DATABASE_REPLICA_APPS`` models to ``DATABASE_REPLICAS``.
+
+    Writes always go to the primary and pin the rest of the request to it,
+    so a request reads its own writes; ``ReplicaMiddleware`` extends that to
+    the following requests of the same client. Replicas are health checked
+    every ``DATABASE_REPLICA_CHECK_INTERVAL`` seconds per process and skipped
+    while they fail or lag. Objects keep reading from the database they were
+    loaded from.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in settings.DATABASE_REPLICA_APPS:
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db is not None:
+            return instance._state.db
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in settings.DATABASE_REPLICA_APPS:
+            _written.set(True)
+            use_primary()
+        # Also for objects read from a replica
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get the schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,212 @@
+"""
+Gunicorn configuration for production.
+
+``gunicorn.conf.py`` at the repository root re-exports this module, so a plain
+``gunicorn portfolio_api.wsgi`` started from there uses it. Every value can be
+overridden with the environment variables below or on the command line.
+
+* ``GUNICORN_WORKER_CLASS``: ``sync``, ``gthread`` or ``uvicorn``. By default
+  ``gthread`` on up to two CPUs, where threads overlap database and cache waits
+  without the memory of more processes, and ``sync`` above that.
+* ``WEB_CONCURRENCY``: worker processes, derived from the CPUs by default.
+  Without a cache shared by all of them, ``CACHE_BACKEND`` set to Redis or
+  Memcached, only one worker is allowed: the project generation tokens, the
+  throttles and the contact concurrency limit would be kept per process.
+* ``GUNICORN_THREADS``, ``GUNICORN_MAX_REQUESTS``,
+  ``GUNICORN_MAX_REQUESTS_JITTER``, ``GUNICORN_KEEPALIVE`` and
+  ``GUNICORN_TIMEOUT``.
+
+The application is preloaded in the master so the workers share its memory
+copy-on-write, and each worker warms the project caches in ``post_fork``,
+before it accepts connections.
+
+``METRICS_DIR`` defaults to a directory of this server in the temporary
+directory, emptied when it starts, so ``/metrics`` reports every worker.
+"""
+
+import math
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio_api.settings")
+
+# Named after the master, which imports this module, so it is one per boot
+DEFAULT_METRICS_DIR = os.path.join(
+    tempfile.gettempdir(), f"portfolio-metrics-{os.getpid()}"
+)
+if "gunicorn" in sys.modules:
+    # Only when gunicorn loads it, not when imported elsewhere, e.g. by tests
+    os.environ.setdefault("METRICS_DIR", DEFAULT_METRICS_DIR)
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+
+def get_env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def get_cpu_count():
+    """
+    CPUs this process may use, honoring CPU affinity and cgroup v2 quotas.
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return count
+    if quota == "max":
+        return count
+    return max(1, min(count, math.ceil(int(quota) / int(period))))
+
+
+def get_worker_class(cpus):
+    name = os.environ.get("GUNICORN_WORKER_CLASS") or (
+        "gthread" if cpus <= 2 else "sync"
+    )
+    if name not in WORKER_CLASSES:
+        raise ValueError(f"Unknown GUNICORN_WORKER_CLASS {name!r}")
+    return name
+
+
+def is_cache_shared():
+    from django.conf import settings
+
+    # Generation tokens and concurrency counts must be seen by every worker
+    return all(
+        cache["BACKEND"] not in settings.PROCESS_CACHE_BACKENDS
+        for cache in settings.CACHES.values()
+    )
+
+
+def get_workers(worker_class, cpus):
+    if not is_cache_shared():
+        workers = get_env_int("WEB_CONCURRENCY", 1)
+        if workers > 1:
+            raise ValueError(
+                f"WEB_CONCURRENCY={workers} needs a CACHE_BACKEND shared by all "
+                "workers, such as Redis or Memcached"
+            )
+        return workers
+
+    if worker_class == "sync":
+        # Workers blocked on I/O leave their CPU to the others
+        default = 2 * cpus + 1
+    else:
+        # Threads and event loops already overlap I/O within one process
+        default = max(2, cpus + 1)
+    return get_env_int("WEB_CONCURRENCY", default)
+
+
+cpus = get_cpu_count()
+_worker_class = get_worker_class(cpus)
+
+worker_class = WORKER_CLASSES[_worker_class]
+workers = get_workers(_worker_class, cpus)
+threads = get_env_int("GUNICORN_THREADS", 4 if _worker_class == "gthread" else 1)
+if _worker_class == "uvicorn":
+    wsgi_app = "portfolio_api.asgi:application"
+else:
+    wsgi_app = "portfolio_api.wsgi:application"
+
+preload_app = True
+
+# Recycle workers to bound slow leaks; the jitter keeps them from all
+# restarting at once
+max_requests = get_env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = get_env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+# Longer than the usual 60 s load balancer idle timeout, so the proxy closes
+# idle connections first and never reuses one the worker just closed. Sync
+# workers do not keep connections alive
+keepalive = get_env_int("GUNICORN_KEEPALIVE", 65)
+timeout = get_env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = timeout
+
+# Worker heartbeats on a memory filesystem, not on a possibly slow disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def warm_imports():
+    """
+    Import what the first request would: the URLconf loads every view.
+    """
+    from django.urls import get_resolver
+
+    from projects.fast import get_field_getters
+
+    get_resolver().url_patterns
+    get_field_getters()
+
+
+def warm_caches():
+    """
+    Build this process's portfolio snapshot for the public origin.
+    """
+    from projects.export import get_default_base_url, make_request
+    from projects.snapshot import get_snapshot
+
+    get_snapshot(make_request(get_default_base_url()))
+
+
+def on_starting(server):
+    # Counters restart with the server
+    from django.conf import settings
+
+    from portfolio_api.metrics import clear_directory
+
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    clear_directory()
+
+
+def when_ready(server):
+    # Runs in the master once the application is preloaded, before forking
+    from django.db import connections
+
+    warm_imports()
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    # Connections must not be shared with the master or other workers
+    connections.close_all()
+    try:
+        warm_caches()
+    except Exception:
+        server.log.exception("Cache warmup failed in worker %s", worker.pid)
+    if _worker_class != "sync":
+        # Requests run in other threads, each with its own connection
+        connections.close_all()
+
+
+def child_exit(server, worker):
+    from portfolio_api.metrics import collect_exited
+
+    collect_exited(worker.pid)
+
+
+def on_exit(server):
+    import atexit
+
+    from django.conf import settings
+
+    from portfolio_api.metrics import registry
+
+    if settings.METRICS_DIR == DEFAULT_METRICS_DIR:
+        # The master's own final flush would create the directory again
+        atexit.unregister(registry.flush)
+        shutil.rmtree(DEFAULT_METRICS_DIR, ignore_errors=True)
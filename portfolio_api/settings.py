@@ -1,7 +1,5 @@
-import dj_database_url
 import os
 
-from django.core.management.utils import get_random_secret_key
 from pathlib import Path
 
 from .env_reader import read_env_file
@@ -10,7 +8,11 @@ read_env_file()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = os.environ.get("SECRET_KEY", get_random_secret_key())
+SECRET_KEY = os.environ.get("SECRET_KEY")
+if not SECRET_KEY:
+    from django.core.management.utils import get_random_secret_key
+
+    SECRET_KEY = get_random_secret_key()
 
 DEBUG = "RENDER" not in os.environ
 
@@ -19,6 +21,9 @@ ALLOWED_HOSTS = []
 RENDER_EXTERNAL_HOSTNAME = os.environ.get("RENDER_EXTERNAL_HOSTNAME")
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
+    # Render terminates TLS and sets this header on every request it forwards,
+    # so the absolute URLs of responses use https
+    SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 BASE_APPS = [
     "django.contrib.admin",
@@ -37,13 +42,18 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "contacts",
     "projects",
+    "portfolio_api",
 ]
 
 INSTALLED_APPS = BASE_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "portfolio_api.middleware.PerformanceMiddleware",
+    "portfolio_api.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "portfolio_api.middleware.AsyncWhiteNoiseMiddleware",
+    "portfolio_api.middleware.CompressionMiddleware",
+    "portfolio_api.middleware.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,6 +65,50 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "portfolio_api.urls"
 
+# Server-Timing headers and per-request log lines, see PerformanceMiddleware
+PERFORMANCE_METRICS = os.environ.get("PERFORMANCE_METRICS", "False") == "True"
+PERFORMANCE_PROFILE = os.environ.get("PERFORMANCE_PROFILE", "False") == "True"
+PERFORMANCE_PROFILE_SAMPLE_RATE = float(
+    os.environ.get("PERFORMANCE_PROFILE_SAMPLE_RATE", "0.01")
+)
+PERFORMANCE_PROFILE_KEEP = 10
+PERFORMANCE_PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+# Prometheus metrics at /metrics, see portfolio_api.metrics. With several worker
+# processes METRICS_DIR must be a directory shared by all of them; the gunicorn
+# config in portfolio_api.server provides one. Unless DEBUG is on, /metrics
+# needs METRICS_TOKEN
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+METRICS_DIR = os.environ.get("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Checked by the import_times command and its test
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", "1000"))
+# Heavy modules imported on first use only. psycopg2 is not listed because
+# rest_framework.compat imports it whenever it is installed
+STARTUP_DEFERRED_MODULES = ("PIL", "dj_database_url", "smtplib", "django.test")
+
+# Brotli/gzip for dynamic responses; WhiteNoise serves precompressed static files
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_SIZE = 512
+COMPRESSION_STREAM_SIZE = 1024 * 1024
+COMPRESSION_CACHE_ALIAS = "default"
+COMPRESSION_CACHE_TIMEOUT = 60 * 15
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "portfolio_api.performance": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -74,6 +128,8 @@ TEMPLATES = [
 WSGI_APPLICATION = "portfolio_api.wsgi.application"
 
 if not DEBUG:
+    import dj_database_url
+
     DATABASES = {
         "default": dj_database_url.config(
             default=os.environ.get("DATABASE_URL"),
@@ -88,6 +144,63 @@ else:
         }
     }
 
+# Read replicas for the projects app, see portfolio_api.routers. A comma
+# separated list of database URLs; locally, copies of db.sqlite3 such as
+# sqlite:///replica1.sqlite3 stand in for them
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+if DATABASE_REPLICA_URLS:
+    import dj_database_url
+
+    for number, url in enumerate(DATABASE_REPLICA_URLS, 1):
+        DATABASES[f"replica{number}"] = {
+            **dj_database_url.parse(
+                url, conn_max_age=DATABASES["default"].get("CONN_MAX_AGE", 0)
+            ),
+            "TEST": {"MIRROR": "default"},
+        }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["portfolio_api.routers.ReplicaRouter"]
+DATABASE_REPLICA_APPS = ("projects",)
+# How long a client reads from the primary after writing, longer than the
+# expected replication lag
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DATABASE_REPLICA_PIN_SECONDS", "5"))
+DATABASE_REPLICA_MAX_LAG = 5
+DATABASE_REPLICA_CHECK_INTERVAL = 10
+DATABASE_REPLICA_RETRY_INTERVAL = 30
+DATABASE_REPLICA_PIN_COOKIE = "use_primary"
+
+# Cache backends that only the current process sees: writes made by other
+# processes, such as management commands, never reach them
+PROCESS_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Throttle and concurrency state, kept apart so response entries never
+    # evict it; a local memory cache gets its own store
+    "throttle": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION") or "throttle",
+        "KEY_PREFIX": "throttle",
+    },
+}
+
+PROJECTS_CACHE_ALIAS = "default"
+PROJECTS_CACHE_TIMEOUT = 60 * 15
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -116,6 +229,11 @@ STATIC_URL = "/static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = "media"
 
+# "upload" genera las variantes al guardar; "lazy" en la primera lectura
+PROJECT_IMAGE_VARIANTS_MODE = os.environ.get("PROJECT_IMAGE_VARIANTS_MODE", "upload")
+PROJECT_IMAGE_WIDTHS = [320, 640, 1280]
+PROJECT_IMAGE_QUALITY = 80
+
 if not DEBUG:
     STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
     STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
@@ -127,8 +245,45 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "portfolio_api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Token buckets, see portfolio_api.throttling.TokenBucketThrottle
+    "DEFAULT_THROTTLE_RATES": {
+        "contact_ip": os.environ.get("CONTACT_IP_RATE", "5/min"),
+        "contact_email": os.environ.get("CONTACT_EMAIL_RATE", "10/hour"),
+    },
+    # Proxies in front of the app, one behind Render; the client IP is the
+    # address that many entries from the end of X-Forwarded-For, so a header
+    # sent by the client cannot pick its own throttle bucket
+    "NUM_PROXIES": (
+        int(os.environ["NUM_PROXIES"])
+        if "NUM_PROXIES" in os.environ
+        else 1 if RENDER_EXTERNAL_HOSTNAME else None
+    ),
 }
 
+# Throttle state must be in a cache shared by all workers for limits to hold
+THROTTLE_CACHE_ALIAS = "throttle"
+
+PROJECTS_PAGINATION_MODE = os.environ.get("PROJECTS_PAGINATION_MODE", "limit_offset")
+PROJECTS_CURSOR_PAGE_SIZE = 20
+# Build project list/detail responses from values() rows instead of the serializer
+PROJECTS_FAST_READ_PATH = os.environ.get("PROJECTS_FAST_READ_PATH", "True") == "True"
+# Serve unfiltered list/detail reads from an in-process snapshot of the portfolio.
+# Workers notice changes through the list generation token, so this needs a cache
+# shared by every process that writes projects, the CLI included; it is off by
+# default otherwise and the projects.E001 check refuses to enable it.
+PROJECTS_SNAPSHOT = (
+    os.environ.get(
+        "PROJECTS_SNAPSHOT",
+        str(CACHES[PROJECTS_CACHE_ALIAS]["BACKEND"] not in PROCESS_CACHE_BACKENDS),
+    )
+    == "True"
+)
+PROJECTS_SNAPSHOT_MAX_AGE = PROJECTS_CACHE_TIMEOUT
+
 """ CORS_ALLOWED_ORIGINS = [
     "*",
 ] """
@@ -147,3 +302,35 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = os.environ.get("EMAIL_USER")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_PASSWORD")
 EMAIL_TO_USER = os.environ.get("EMAIL_TO_USER")
+
+# Above this many rows the contact admin shows an estimated total
+CONTACT_ADMIN_EXACT_COUNT_LIMIT = 10_000
+
+CONTACT_OUTBOX_MODE = os.environ.get("CONTACT_OUTBOX_MODE", "thread")
+CONTACT_OUTBOX_BATCH_SIZE = 50
+CONTACT_OUTBOX_MAX_ATTEMPTS = 5
+CONTACT_OUTBOX_RETRY_BACKOFF = 60
+CONTACT_OUTBOX_POLL_INTERVAL = 30
+
+# Identical (email, message) submissions within this many seconds are dropped;
+# 0 disables the check
+CONTACT_DUPLICATE_WINDOW = int(os.environ.get("CONTACT_DUPLICATE_WINDOW", "3600"))
+CONTACT_DUPLICATE_CACHE_ALIAS = "default"
+
+# ContactCreateView requests handled at once by all workers, counted in
+# THROTTLE_CACHE_ALIAS; up to CONTACT_MAX_QUEUE more wait
+# CONTACT_QUEUE_TIMEOUT seconds, the rest get a 429
+CONTACT_MAX_CONCURRENCY = int(os.environ.get("CONTACT_MAX_CONCURRENCY", "2"))
+CONTACT_MAX_QUEUE = int(os.environ.get("CONTACT_MAX_QUEUE", "4"))
+CONTACT_QUEUE_TIMEOUT = 2
+# Refreshed on every acquire and longer than any request, so the counts
+# only expire once no request has come in for that long, freeing the slots
+# of killed workers
+CONCURRENCY_SLOT_TTL = 60
+
+# archive_contacts moves contacts older than this to gzipped JSONL files
+CONTACT_RETENTION_DAYS = int(os.environ.get("CONTACT_RETENTION_DAYS", "365"))
+CONTACT_ARCHIVE_DIR = os.environ.get(
+    "CONTACT_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive", "contacts")
+)
+CONTACT_ARCHIVE_BATCH_SIZE = 1000
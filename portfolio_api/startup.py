@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# What a worker imports before serving its first request
+BOOT_CODE = """
+from portfolio_api.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+
+def parse_importtime(output):
+    """
+    Return ``(module, self_us, cumulative_us, depth)`` tuples from the output
+    of ``python -X importtime``.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def measure_imports():
+    """
+    Boot a fresh interpreter the way a worker does and return its imports.
+
+    The modules imported by earlier code in this process would otherwise be
+    free, so the measurement always runs in a subprocess.
+    """
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "portfolio_api.settings"
+        ),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_CODE],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def get_total_ms(modules):
+    return sum(cumulative for _, _, cumulative, depth in modules if depth == 0) / 1000
+
+
+def get_eager_deferred(modules):
+    """
+    Return the top-level packages of ``STARTUP_DEFERRED_MODULES`` that were
+    imported at boot.
+    """
+    imported = {name.partition(".")[0] for name, *_ in modules}
+    return [name for name in settings.STARTUP_DEFERRED_MODULES if name in imported]
@@ -0,0 +1,658 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from unittest import mock
+
+import brotli
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from contacts.models import Contact, ContactNotification
+from contacts.outbox import deliver_pending
+from projects.models import Project, Technology
+
+from . import compression, metrics, routers, server, startup
+from .compression import negotiate
+from .env_reader import parse_env, read_env_file
+from .metrics import registry
+from .middleware import PerformanceMiddleware, ReplicaMiddleware
+from .performance import add_query_recorder
+from .throttling import ConcurrencyLimiter
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@override_settings(
+    PERFORMANCE_METRICS=True,
+    PROJECTS_SNAPSHOT=False,
+    CACHES={
+        alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        for alias in ("default", "throttle")
+    },
+)
+class PerformanceMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        project = Project.objects.create(
+            name="Proyecto",
+            description="Proyecto para probar las métricas.",
+            url="https://example.com",
+            project_status="available",
+        )
+        project.technologies.add(Technology.objects.create(name="Python"))
+
+    def test_disabled_by_setting(self):
+        with override_settings(PERFORMANCE_METRICS=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                PerformanceMiddleware(lambda request: None)
+
+    def test_server_timing_header(self):
+        with self.assertLogs("portfolio_api.performance", "INFO") as logs:
+            response = self.client.get(reverse("projects"))
+
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(metrics["db"]["desc"], '"2 queries"')
+        for name in ("total", "db", "serialize", "render"):
+            self.assertGreaterEqual(float(metrics[name]["dur"]), 0)
+        self.assertLessEqual(
+            float(metrics["db"]["dur"]), float(metrics["total"]["dur"])
+        )
+
+        record = logs.records[0]
+        self.assertEqual(record.performance["path"], reverse("projects"))
+        self.assertEqual(record.performance["status"], 200)
+        self.assertEqual(record.performance["db_queries"], 2)
+        self.assertIn("db_queries=2", record.getMessage())
+
+    @override_settings(PROJECTS_FAST_READ_PATH=False)
+    def test_serializer_time(self):
+        # Sin la ruta rápida el tiempo lo mide el serializador de DRF
+        project = Project.objects.get()
+        for url in (reverse("projects"), reverse("project", args=[project.pk])):
+            with self.assertLogs("portfolio_api.performance", "INFO"):
+                response = self.client.get(url)
+            self.assertIn("serialize", parse_server_timing(response["Server-Timing"]))
+
+    def test_contact_email_time(self):
+        with self.assertLogs("portfolio_api.performance", "INFO"):
+            response = self.client.post(
+                reverse("contact"),
+                {
+                    "name": "Ana",
+                    "email": "ana@example.com",
+                    "message": "Hola",
+                },
+                format="json",
+            )
+        self.assertEqual(ContactNotification.objects.count(), 1)
+        # La petición solo encola el aviso; el envío se mide en el outbox
+        timings = parse_server_timing(response["Server-Timing"])
+        self.assertIn("outbox_enqueue", timings)
+        self.assertNotIn("email", timings)
+
+    def test_async_view_queries(self):
+        # Las consultas del ORM asíncrono se ejecutan en otro hilo. La conexión
+        # de pruebas es anterior al middleware; en un servidor el recorder se
+        # instala al abrir cada conexión
+        add_query_recorder(connection)
+        with self.assertLogs("portfolio_api.performance", "INFO"):
+            response = async_to_sync(AsyncClient().get)(reverse("async_projects"))
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(metrics["db"]["desc"], '"2 queries"')
+
+    def test_slowest_requests_profiled(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with override_settings(
+            PERFORMANCE_PROFILE=True,
+            PERFORMANCE_PROFILE_SAMPLE_RATE=1,
+            PERFORMANCE_PROFILE_KEEP=1,
+            PERFORMANCE_PROFILE_DIR=directory,
+        ):
+            client = APIClient()
+            with self.assertLogs("portfolio_api.performance", "INFO"):
+                for _ in range(3):
+                    client.get(reverse("projects"))
+
+        names = sorted(os.listdir(directory))
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[0].endswith(".prof"))
+        self.assertTrue(names[1].endswith(".tracemalloc"))
+
+
+@override_settings(
+    DEBUG=True,
+    METRICS_ENABLED=True,
+    METRICS_DIR=None,
+    METRICS_TOKEN=None,
+    PROJECTS_SNAPSHOT=False,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class MetricsTest(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.project = Project.objects.create(
+            name="Proyecto",
+            description="Proyecto para probar las métricas.",
+            url="https://example.com",
+            project_status="available",
+        )
+
+    def get_metrics(self, **extra):
+        response = self.client.get(reverse("metrics"), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_request_metrics_per_route(self):
+        self.client.get(reverse("projects"))
+        self.client.get(reverse("projects"))
+        self.client.get(reverse("project", args=[self.project.pk]))
+        self.client.get(reverse("project", args=[0]))
+        text = self.get_metrics()
+
+        self.assertIn(
+            'http_requests_total{method="GET",route="api/projects/",status="200"} 2',
+            text,
+        )
+        self.assertIn(
+            'http_requests_total{method="GET",route="api/projects/<int:pk>/",'
+            'status="404"} 1',
+            text,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",'
+            'route="api/projects/"} 2',
+            text,
+        )
+        # La segunda lectura del listado sale de la caché sin consultas
+        self.assertIn(
+            'http_request_queries_bucket{route="api/projects/",le="0"} 1', text
+        )
+        self.assertIn(
+            'projects_cache_responses_total{result="hit",route="api/projects/"} 1',
+            text,
+        )
+        self.assertIn('http_response_size_bytes_count{route="api/projects/"} 2', text)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", text)
+
+    def test_aggregates_worker_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # Archivo de otro worker que ya terminó
+        other = {
+            "pid": 2**22 + 1,
+            "counters": [
+                [
+                    "http_requests_total",
+                    [["method", "GET"], ["route", "api/projects/"], ["status", "200"]],
+                    5,
+                ]
+            ],
+            "gauges": [["http_requests_in_progress", [], 3]],
+            "histograms": [],
+        }
+        with open(os.path.join(directory, "other.json"), "w") as f:
+            json.dump(other, f)
+
+        with override_settings(METRICS_DIR=directory):
+            self.client.get(reverse("projects"))
+            text = self.get_metrics()
+
+        self.assertIn(
+            'http_requests_total{method="GET",route="api/projects/",status="200"} 6',
+            text,
+        )
+        # Solo cuenta la petición a /metrics en curso de este proceso
+        self.assertIn("http_requests_in_progress 1", text)
+
+    def test_exited_workers_folded(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        labels = [["method", "GET"], ["route", "api/projects/"], ["status", "200"]]
+        # Dos archivos del mismo worker reciclado y uno de otro worker
+        for name, value in (("123-1.json", 2), ("123-2.json", 3), ("456-1.json", 7)):
+            dump = {
+                "pid": int(name.split("-")[0]),
+                "counters": [["http_requests_total", labels, value]],
+                "gauges": [["http_requests_in_progress", [], 1]],
+                "histograms": [],
+            }
+            with open(os.path.join(directory, name), "w") as f:
+                json.dump(dump, f)
+
+        with override_settings(METRICS_DIR=directory):
+            metrics.collect_exited(123)
+            metrics.collect_exited(456)
+            self.assertEqual(os.listdir(directory), [metrics.EXITED_NAME])
+            text = metrics.render()
+            self.assertIn(
+                'http_requests_total{method="GET",route="api/projects/",'
+                'status="200"} 12',
+                text,
+            )
+            self.assertNotIn("http_requests_in_progress 1", text)
+
+            metrics.clear_directory()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_email_outcomes(self):
+        contact = Contact.objects.create(
+            name="Ana", email="ana@example.com", message="Hola"
+        )
+        ContactNotification.objects.create(contact=contact)
+        with override_settings(
+            EMAIL_HOST_USER="web@example.com", EMAIL_TO_USER="me@example.com"
+        ):
+            deliver_pending()
+        self.assertIn('contact_emails_total{outcome="sent"} 1', self.get_metrics())
+
+    def test_token(self):
+        with override_settings(METRICS_TOKEN="secreto"):
+            response = self.client.get(reverse("metrics"))
+            self.assertEqual(response.status_code, 403)
+            self.get_metrics(HTTP_AUTHORIZATION="Bearer secreto")
+
+    @override_settings(DEBUG=False)
+    def test_token_required_in_production(self):
+        # Fuera de DEBUG las métricas no se publican sin token
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+        with override_settings(METRICS_TOKEN="secreto"):
+            self.get_metrics(HTTP_AUTHORIZATION="Bearer secreto")
+
+
+@override_settings(
+    COMPRESSION_ENABLED=True,
+    PROJECTS_SNAPSHOT=False,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(10):
+            Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Proyecto para probar la compresión. " * 20,
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+        self.url = reverse("projects")
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate("gzip, deflate, br"), "br")
+        self.assertEqual(negotiate("gzip;q=1.0, br;q=0.5"), "gzip")
+        self.assertEqual(negotiate("br;q=0, *"), "gzip")
+        self.assertEqual(negotiate("*"), "br")
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate(""))
+
+    def test_brotli_and_gzip(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        for encoding, decompress in (
+            ("br", brotli.decompress),
+            ("gzip", gzip.decompress),
+        ):
+            with self.subTest(encoding=encoding):
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=encoding)
+                self.assertEqual(response["Content-Encoding"], encoding)
+                self.assertEqual(decompress(response.content), plain.content)
+                self.assertEqual(int(response["Content-Length"]), len(response.content))
+                self.assertLess(len(response.content), len(plain.content))
+                self.assertTrue(response["ETag"].startswith('W/"'))
+
+    def test_small_bodies_are_not_compressed(self):
+        response = self.client.get(
+            reverse("project", args=[0]), HTTP_ACCEPT_ENCODING="br"
+        )
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_compressed_body_reused(self):
+        with mock.patch.object(
+            compression, "compress", wraps=compression.compress
+        ) as compress:
+            first = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br")
+            second = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(compress.call_count, 1)
+
+        # La ETag débil sigue validando peticiones condicionales
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_large_uncached_bodies_are_streamed(self):
+        with override_settings(
+            COMPRESSION_STREAM_SIZE=1024, METRICS_DIR=None, DEBUG=True
+        ):
+            response = self.client.get(reverse("metrics"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response)
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertIn(b"# TYPE http_requests_total counter", body)
+
+
+class ConcurrencyLimiterTest(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+
+    def test_shared(self):
+        # Dos procesos con el mismo nombre comparten el límite a través de la caché
+        limiter = ConcurrencyLimiter("test")
+        other = ConcurrencyLimiter("test")
+        self.assertTrue(limiter.acquire(1, 0, timeout=1))
+        self.assertFalse(other.acquire(1, 0, timeout=1))
+        self.assertTrue(ConcurrencyLimiter("other").acquire(1, 0, timeout=1))
+        limiter.release()
+        self.assertTrue(other.acquire(1, 0, timeout=1))
+        self.assertEqual(limiter.get_active(), 1)
+
+    def test_queue(self):
+        limiter = ConcurrencyLimiter("test")
+        self.assertTrue(limiter.acquire(1, 1, timeout=1))
+
+        # La petición en cola obtiene el hueco al liberarse
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(limiter.acquire(1, 1, timeout=5))
+        )
+        waiter.start()
+        while not limiter.cache.get(limiter.waiting_key):
+            time.sleep(0.001)
+        # Con la cola llena se rechaza al momento
+        self.assertFalse(limiter.acquire(1, 1, timeout=5))
+        limiter.release()
+        waiter.join()
+        self.assertEqual(results, [True])
+        self.assertEqual(limiter.get_active(), 1)
+
+    def test_timeout(self):
+        limiter = ConcurrencyLimiter("test")
+        limiter.acquire(1, 1, timeout=1)
+        self.assertFalse(limiter.acquire(1, 1, timeout=0.01))
+        self.assertEqual(limiter.cache.get(limiter.waiting_key), 0)
+
+    @override_settings(CONCURRENCY_SLOT_TTL=60)
+    def test_acquire_refreshes_ttl(self):
+        # Mientras lleguen peticiones los huecos ocupados no caducan
+        limiter = ConcurrencyLimiter("test")
+        now = time.time()
+        limiter.acquire(3, 0, timeout=1)
+        with mock.patch("time.time", return_value=now + 50):
+            limiter.acquire(3, 0, timeout=1)
+        with mock.patch("time.time", return_value=now + 100):
+            self.assertEqual(limiter.get_active(), 2)
+
+    def test_release_never_goes_negative(self):
+        # Una liberación de más, tras caducar la clave, no deja la cuenta negativa
+        limiter = ConcurrencyLimiter("test")
+        limiter.acquire(1, 0, timeout=1)
+        limiter.release()
+        limiter.release()
+        self.assertEqual(limiter.get_active(), 0)
+        self.assertTrue(limiter.acquire(1, 0, timeout=1))
+        self.assertFalse(limiter.acquire(1, 0, timeout=0.01))
+
+    @override_settings(CONCURRENCY_SLOT_TTL=1)
+    def test_expire(self):
+        # Los huecos de un proceso que muere caducan
+        limiter = ConcurrencyLimiter("test")
+        limiter.acquire(1, 0, timeout=1)
+        with mock.patch("time.time", return_value=time.time() + 2):
+            self.assertTrue(limiter.acquire(1, 0, timeout=1))
+
+
+class EnvReaderTest(TestCase):
+    def test_parse(self):
+        env = parse_env(
+            "# comentario\n"
+            "\n"
+            "SECRET_KEY=abc=def==\n"
+            "export DATABASE_URL = postgres://u:p@host/db?sslmode=require\n"
+            "SINGLE='literal \\n # no es comentario'\n"
+            'DOUBLE="línea\\nnueva \\"citada\\""\n'
+            "INLINE=valor # comentario\n"
+            "EMPTY=\n"
+            "no es una asignación\n"
+        )
+        self.assertEqual(
+            env,
+            {
+                "SECRET_KEY": "abc=def==",
+                "DATABASE_URL": "postgres://u:p@host/db?sslmode=require",
+                "SINGLE": "literal \\n # no es comentario",
+                "DOUBLE": 'línea\nnueva "citada"',
+                "INLINE": "valor",
+                "EMPTY": "",
+            },
+        )
+
+    def test_file_wins(self):
+        # Como el lector original, el archivo .env sustituye al entorno
+        with tempfile.NamedTemporaryFile("w", suffix=".env", delete=False) as f:
+            f.write("ENV_READER_A=archivo\nENV_READER_B=archivo\n")
+        self.addCleanup(os.remove, f.name)
+        with mock.patch.dict(os.environ, {"ENV_READER_A": "entorno"}):
+            read_env_file(f.name)
+            self.assertEqual(os.environ["ENV_READER_A"], "archivo")
+            self.assertEqual(os.environ["ENV_READER_B"], "archivo")
+
+    def test_missing_file(self):
+        read_env_file(os.path.join(tempfile.gettempdir(), "no-existe.env"))
+
+
+class StartupImportTest(TestCase):
+    def test_cold_start_within_budget(self):
+        # Arranca un intérprete nuevo como un worker; falla si supera el
+        # presupuesto o importa al arrancar un módulo que debe ser diferido
+        stdout = StringIO()
+        call_command("import_times", "--limit", "5", stdout=stdout)
+        self.assertIn("portfolio_api.wsgi", stdout.getvalue())
+        self.assertIn("Total:", stdout.getvalue())
+
+    def test_over_budget(self):
+        modules = [("portfolio_api.wsgi", 1000, 900_000, 0), ("PIL", 1000, 1000, 1)]
+        with mock.patch.object(startup.subprocess, "run") as run:
+            run.return_value.returncode = 0
+            run.return_value.stderr = "\n".join(
+                f"import time: {self_us} | {cumulative_us} | {'  ' * depth}{name}"
+                for name, self_us, cumulative_us, depth in modules
+            )
+            with self.assertRaisesMessage(CommandError, "Imported at startup: PIL"):
+                call_command("import_times", stdout=StringIO())
+            with override_settings(STARTUP_DEFERRED_MODULES=()):
+                with self.assertRaisesMessage(CommandError, "over the 800 ms budget"):
+                    call_command("import_times", "--budget", "800", stdout=StringIO())
+
+
+class ServerConfigTest(TestCase):
+    def test_worker_class(self):
+        with mock.patch.dict(os.environ, {"GUNICORN_WORKER_CLASS": ""}):
+            self.assertEqual(server.get_worker_class(1), "gthread")
+            self.assertEqual(server.get_worker_class(4), "sync")
+        with mock.patch.dict(os.environ, {"GUNICORN_WORKER_CLASS": "uvicorn"}):
+            self.assertEqual(server.get_worker_class(4), "uvicorn")
+        with mock.patch.dict(os.environ, {"GUNICORN_WORKER_CLASS": "eventlet"}):
+            with self.assertRaises(ValueError):
+                server.get_worker_class(4)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            },
+            "throttle": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            },
+        }
+    )
+    def test_workers(self):
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": ""}):
+            self.assertEqual(server.get_workers("sync", 4), 9)
+            self.assertEqual(server.get_workers("gthread", 1), 2)
+            self.assertEqual(server.get_workers("uvicorn", 4), 5)
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "3"}):
+            self.assertEqual(server.get_workers("sync", 4), 3)
+
+    def test_one_worker_without_shared_cache(self):
+        # Con la caché en memoria del proceso solo se permite un worker
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": ""}):
+            self.assertEqual(server.get_workers("sync", 4), 1)
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "3"}):
+            with self.assertRaisesMessage(ValueError, "CACHE_BACKEND"):
+                server.get_workers("sync", 4)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            },
+            "throttle": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+    )
+    def test_one_worker_without_shared_throttle_cache(self):
+        # Los contadores de concurrencia también deben compartirse
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": ""}):
+            self.assertEqual(server.get_workers("sync", 4), 1)
+
+    @override_settings(
+        RENDER_EXTERNAL_HOSTNAME="portfolio.example.com",
+        ALLOWED_HOSTS=["portfolio.example.com"],
+        SECURE_PROXY_SSL_HEADER=("HTTP_X_FORWARDED_PROTO", "https"),
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+        PROJECTS_SNAPSHOT=True,
+    )
+    def test_warmup_matches_proxied_requests(self):
+        # Tras el calentamiento, las peticiones que llegan por el proxy usan el
+        # snapshot ya construido
+        Project.objects.create(
+            name="Proyecto",
+            description="Proyecto para probar el calentamiento.",
+            url="https://example.com",
+            project_status="available",
+        )
+        server.warm_caches()
+        with mock.patch("projects.snapshot.build_snapshot") as build:
+            response = APIClient().get(
+                reverse("projects"),
+                HTTP_HOST="portfolio.example.com",
+                HTTP_X_FORWARDED_PROTO="https",
+            )
+        build.assert_not_called()
+        self.assertEqual(response["X-Cache"], "SNAPSHOT")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+        routers._health.clear()
+        self.addCleanup(routers._health.clear)
+        tokens = routers.start_request(False)
+        self.addCleanup(routers.end_request, tokens)
+        patcher = mock.patch.object(routers, "check", return_value=True)
+        self.check = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_and_writes(self):
+        alias = self.router.db_for_read(Project)
+        self.assertIn(alias, ["replica1", "replica2"])
+        # Toda la petición lee de la misma réplica
+        self.assertEqual(self.router.db_for_read(Technology), alias)
+        self.assertIsNone(self.router.db_for_read(Contact))
+
+        self.assertEqual(self.router.db_for_write(Project), "default")
+        self.assertTrue(routers.has_written())
+        self.assertEqual(self.router.db_for_read(Project), "default")
+
+    def test_recent_generation_reads_primary(self):
+        routers.pin_recent_write(time.time() - 60)
+        self.assertNotEqual(self.router.db_for_read(Project), "default")
+        routers.pin_recent_write(time.time())
+        self.assertEqual(self.router.db_for_read(Project), "default")
+
+    def test_failover(self):
+        self.check.side_effect = lambda alias: alias == "replica1"
+        self.assertEqual(self.router.db_for_read(Project), "replica1")
+
+        # Con ninguna réplica sana se lee de la principal
+        self.check.side_effect = lambda alias: False
+        with mock.patch.object(routers.time, "monotonic", return_value=10**9):
+            tokens = routers.start_request(False)
+            self.assertEqual(self.router.db_for_read(Project), "default")
+            routers.end_request(tokens)
+        self.assertEqual(self.check.call_count, 4)
+
+        # El resultado se reutiliza hasta la siguiente comprobación
+        with mock.patch.object(routers.time, "monotonic", return_value=10**9 + 1):
+            tokens = routers.start_request(False)
+            self.assertEqual(self.router.db_for_read(Project), "default")
+            routers.end_request(tokens)
+        self.assertEqual(self.check.call_count, 4)
+
+    def test_allow_migrate(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "projects"))
+        self.assertIsNone(self.router.allow_migrate("default", "projects"))
+
+    def test_middleware_pins_after_write(self):
+        databases = []
+
+        def read(request):
+            databases.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        def write(request):
+            Project.objects.create(
+                name="Proyecto",
+                description="Proyecto para probar las réplicas.",
+                url="https://example.com",
+                project_status="available",
+            )
+            return read(request)
+
+        factory = RequestFactory()
+        response = ReplicaMiddleware(read)(factory.get("/api/projects/"))
+        self.assertNotIn("use_primary", response.cookies)
+
+        response = ReplicaMiddleware(write)(factory.get("/api/projects/"))
+        self.assertEqual(response.cookies["use_primary"]["max-age"], 5)
+
+        request = factory.get("/api/projects/")
+        request.COOKIES["use_primary"] = "1"
+        ReplicaMiddleware(read)(request)
+        ReplicaMiddleware(read)(factory.post("/api/contact/"))
+        ReplicaMiddleware(read)(factory.get("/admin/projects/project/"))
+
+        self.assertIn(databases[0], ["replica1", "replica2"])
+        self.assertEqual(databases[1:], ["default"] * 4)
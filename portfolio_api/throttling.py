@@ -0,0 +1,137 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .metrics import registry
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket throttle whose state lives in ``THROTTLE_CACHE_ALIAS``.
+
+    A rate of ``"5/min"`` is a bucket of 5 tokens refilled at one token every
+    12 seconds: bursts up to the bucket size pass, then requests are spaced
+    by the refill interval. The bucket is stored as the single timestamp at
+    which it will be full again (GCRA), so each check is one cache read and
+    one write. With a shared cache such as Redis or Memcached the limits hold
+    across all worker processes; like DRF's own throttles the read and write
+    are not atomic, so concurrent requests may slightly exceed the rate.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_rate(self):
+        # Read at request time so settings overrides apply
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        interval = self.duration / self.num_requests
+        now = self.timer()
+        full_at = max(self.cache.get(self.key, now), now) + interval
+        self.wait_time = full_at - self.duration - now
+        if self.wait_time > 0:
+            registry.inc("throttled_requests_total", scope=self.scope)
+            return False
+
+        self.cache.set(self.key, full_at, timeout=math.ceil(full_at - now))
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class ConcurrencyLimiter:
+    """
+    Bound the requests of one view handled at once by all worker processes.
+
+    Up to ``limit`` requests run; up to ``queue_size`` more wait at most
+    ``timeout`` seconds for a slot. Anything beyond that is refused at once,
+    shedding load instead of letting it pile up in front of the workers.
+
+    The counts live in ``THROTTLE_CACHE_ALIAS`` and change with atomic
+    ``incr``/``decr``, so the limit is global with a shared cache such as
+    Redis or Memcached. The keys expire ``CONCURRENCY_SLOT_TTL`` seconds after
+    the last acquire, which frees the slots of killed workers, and never go
+    below zero.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, name):
+        self.active_key = f"concurrency:{name}:active"
+        self.waiting_key = f"concurrency:{name}:waiting"
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def incr(self, key):
+        ttl = settings.CONCURRENCY_SLOT_TTL
+        try:
+            value = self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, timeout=ttl):
+                return 1
+            value = self.cache.incr(key)
+        # Held slots must outlive the TTL of the first acquire
+        self.cache.touch(key, ttl)
+        return value
+
+    def decr(self, key):
+        try:
+            value = self.cache.decr(key)
+        except ValueError:
+            # Expired while held
+            return
+        if value < 0:
+            # A release after the key expired and was created again
+            self.cache.incr(key, -value)
+
+    def try_acquire(self, limit):
+        if self.incr(self.active_key) <= limit:
+            return True
+        self.decr(self.active_key)
+        return False
+
+    def acquire(self, limit, queue_size, timeout):
+        if self.try_acquire(limit):
+            return True
+
+        try:
+            if self.incr(self.waiting_key) > queue_size:
+                return False
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                if self.try_acquire(limit):
+                    return True
+            return False
+        finally:
+            self.decr(self.waiting_key)
+
+    def release(self):
+        self.decr(self.active_key)
+
+    def get_active(self):
+        return self.cache.get(self.active_key, 0)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+
+from . import metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_safe
+def metrics_view(request):
+    """
+    Prometheus metrics of every worker process.
+
+    When ``METRICS_TOKEN`` is set the scraper must send it as a bearer token.
+    Without one the view only exists while ``DEBUG`` is on.
+    """
+    if not settings.METRICS_TOKEN and not settings.DEBUG:
+        raise Http404
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(
+            request.headers.get("Authorization", ""), expected
+        ):
+            return HttpResponseForbidden()
+
+    return HttpResponse(metrics.render(), content_type=CONTENT_TYPE)
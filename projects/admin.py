@@ -1,12 +1,56 @@
 from django.contrib import admin
 
+from portfolio_api.exports import ExportActionForm, ModelExport, make_export_action
+
+from .fast import get_technology_names
 from .models import Project, Technology
+from .search import search_project_ids
+
+
+class ProjectExport(ModelExport):
+    model = Project
+    name = "projects"
+    fields = (
+        "id",
+        "name",
+        "description",
+        "url",
+        "project_status",
+        "project_image",
+        "created_at",
+    )
+
+    def get_columns(self):
+        return [*self.fields, "technologies"]
+
+    def prepare(self, rows):
+        names = get_technology_names([row["id"] for row in rows])
+        for row in rows:
+            row["technologies"] = names.get(row["id"], [])
+        return rows
 
 
 class ProjectAdmin(admin.ModelAdmin):
     model = Project
     list_display = ["name", "description", "url", "project_status"]
     search_fields = ["name", "url", "project_status"]
+    date_hierarchy = "created_at"
+    actions = [
+        make_export_action(ProjectExport, "csv"),
+        make_export_action(ProjectExport, "jsonl"),
+    ]
+    action_form = ExportActionForm
+
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text matches on name, description and technologies, plus the
+        # plain lookups of search_fields for the URL and status
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if not search_term:
+            return results, may_have_duplicates
+        matches = queryset.filter(pk__in=search_project_ids(search_term))
+        return results | matches, may_have_duplicates
 
 
 class TechnologyAdmin(admin.ModelAdmin):
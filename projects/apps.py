@@ -5,3 +5,6 @@ class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
     verbose_name = "Proyectos"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,111 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Project
+from .serializers import ProjectSerializer, get_columns, get_request_field_set
+
+# Rows fetched per database round trip; each chunk gets one prefetch query
+CHUNK_SIZE = 100
+
+
+def render_json(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+def get_int(request, name, default=None, minimum=0):
+    try:
+        value = int(request.GET[name])
+    except (KeyError, ValueError):
+        return default
+    return value if value >= minimum else default
+
+
+def get_queryset(fields):
+    queryset = Project.objects.all()
+    if fields is None or "technologies" in fields:
+        queryset = queryset.prefetch_related("technologies")
+    if fields is not None:
+        queryset = queryset.only(*get_columns(fields))
+    return queryset
+
+
+async def serialize(instance, request, many=False, fields=None):
+    serializer = ProjectSerializer(
+        instance, many=many, fields=fields, context={"request": request}
+    )
+    if settings.PROJECT_IMAGE_VARIANTS_MODE == "lazy":
+        # Lazy image variants may write to the database while serializing
+        return await sync_to_async(lambda: serializer.data)()
+    return serializer.data
+
+
+@require_safe
+async def projects_list(request):
+    """
+    Native async version of ``ProjectsListView`` with limit/offset pagination.
+    """
+    try:
+        fields = get_request_field_set(request)
+    except ValidationError as e:
+        return render_json(e.detail, 400)
+
+    queryset = get_queryset(fields).order_by("-created_at", "-id")
+    # Like LimitOffsetPagination, a limit of 0 or less is no limit; a page of
+    # none would never reach the end
+    limit = get_int(request, "limit", minimum=1)
+
+    if limit is None:
+        projects = [project async for project in queryset.aiterator(CHUNK_SIZE)]
+        return render_json(await serialize(projects, request, True, fields))
+
+    offset = get_int(request, "offset", 0)
+    count = await queryset.acount()
+    page = queryset[offset : offset + limit]
+    projects = [project async for project in page.aiterator(CHUNK_SIZE)]
+
+    url = request.build_absolute_uri()
+    next_url = None
+    if offset + limit < count:
+        next_url = replace_query_param(url, "limit", limit)
+        next_url = replace_query_param(next_url, "offset", offset + limit)
+    previous_url = None
+    if offset > 0:
+        previous_url = replace_query_param(url, "limit", limit)
+        if offset - limit <= 0:
+            previous_url = remove_query_param(previous_url, "offset")
+        else:
+            previous_url = replace_query_param(previous_url, "offset", offset - limit)
+
+    return render_json(
+        {
+            "count": count,
+            "next": next_url,
+            "previous": previous_url,
+            "results": await serialize(projects, request, True, fields),
+        }
+    )
+
+
+@require_safe
+async def project_detail(request, pk):
+    """
+    Native async version of ``ProjectDetailView``.
+    """
+    try:
+        fields = get_request_field_set(request)
+    except ValidationError as e:
+        return render_json(e.detail, 400)
+
+    try:
+        project = await get_queryset(fields).aget(pk=pk)
+    except Project.DoesNotExist:
+        return render_json({"detail": "No Project matches the given query."}, 404)
+
+    return render_json(await serialize(project, request, fields=fields))
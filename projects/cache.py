@@ -0,0 +1,101 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY_PREFIX = "projects"
+LIST_GENERATION_KEY = f"{KEY_PREFIX}:list:generation"
+HITS_KEY = f"{KEY_PREFIX}:stats:hits"
+MISSES_KEY = f"{KEY_PREFIX}:stats:misses"
+
+
+def get_cache():
+    return caches[settings.PROJECTS_CACHE_ALIAS]
+
+
+def get_generation(key):
+    """
+    Return the generation token stored at ``key``, creating it when missing,
+    or ``None`` when the cache does not keep it, e.g. ``DummyCache``.
+
+    Tokens are nanosecond timestamps, so a token lost to eviction is replaced
+    by a new one instead of colliding with a value that was already used.
+    They expire with the responses cached under them, so requests for pks
+    that do not exist leave nothing behind.
+    """
+    cache = get_cache()
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=settings.PROJECTS_CACHE_TIMEOUT)
+        # Read back: a token that was not stored would change on every request
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    get_cache().set(key, time.time_ns(), timeout=settings.PROJECTS_CACHE_TIMEOUT)
+
+
+def project_generation_key(pk):
+    return f"{KEY_PREFIX}:detail:{pk}:generation"
+
+
+def response_cache_key(generation_key, generation, request):
+    return f"{generation_key}:{generation}:{_request_hash(request)}"
+
+
+def make_etag(generation, request):
+    return f'"{generation:x}-{_request_hash(request)}"'
+
+
+def generation_timestamp(generation):
+    return generation / 1_000_000_000
+
+
+def _request_hash(request):
+    # The media type is part of the representation, e.g. JSON vs browsable API,
+    # and so are the scheme and host, since image URLs are absolute
+    media_type = getattr(request, "accepted_media_type", "")
+    value = f"{request.build_absolute_uri()}|{media_type}"
+    return md5(value.encode(), usedforsecurity=False).hexdigest()
+
+
+def invalidate_list():
+    bump_generation(LIST_GENERATION_KEY)
+
+
+def invalidate_projects(pks):
+    for pk in pks:
+        bump_generation(project_generation_key(pk))
+    invalidate_list()
+
+
+def get_cached(key):
+    cache = get_cache()
+    data = cache.get(key)
+    _increment(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_cached(key, data):
+    get_cache().set(key, data, timeout=settings.PROJECTS_CACHE_TIMEOUT)
+
+
+def _increment(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    cache = get_cache()
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {"hits": stats.get(HITS_KEY, 0), "misses": stats.get(MISSES_KEY, 0)}
+
+
+def reset_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
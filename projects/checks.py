@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_snapshot_cache(app_configs, **kwargs):
+    """
+    The snapshot only notices writes through the list generation token, so the
+    cache holding it must be shared with every process that writes projects.
+    """
+    backend = settings.CACHES[settings.PROJECTS_CACHE_ALIAS]["BACKEND"]
+    if settings.PROJECTS_SNAPSHOT and backend in settings.PROCESS_CACHE_BACKENDS:
+        return [
+            Error(
+                f"PROJECTS_SNAPSHOT needs a cache shared between processes, "
+                f"not {backend}.",
+                hint="Set CACHE_BACKEND to Redis or Memcached, or turn off "
+                "PROJECTS_SNAPSHOT.",
+                id="projects.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,163 @@
+import gzip
+import json
+import os
+from hashlib import md5
+from math import ceil
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.test import RequestFactory
+
+from portfolio_api.renderers import FastJSONRenderer
+
+from .facets import get_facets
+from .models import Project
+from .serializers import ProjectSerializer
+from .static_names import EXPORT_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+PAGE_SIZE = 20
+
+renderer = FastJSONRenderer()
+
+
+def get_hashed_name(name, content):
+    file_hash = md5(content, usedforsecurity=False).hexdigest()[:12]
+    root, ext = os.path.splitext(name)
+    return f"{root}.{file_hash}{ext}"
+
+
+def get_static_url(request, name):
+    return request.build_absolute_uri(f"{settings.STATIC_URL}{EXPORT_DIR}/{name}")
+
+
+def get_default_base_url():
+    if settings.RENDER_EXTERNAL_HOSTNAME:
+        return f"https://{settings.RENDER_EXTERNAL_HOSTNAME}"
+    return "http://localhost:8000"
+
+
+def make_request(base_url):
+    parts = urlsplit(base_url)
+    return RequestFactory().get(
+        "/", secure=parts.scheme == "https", HTTP_HOST=parts.netloc
+    )
+
+
+def render_documents(request, page_size=PAGE_SIZE):
+    """
+    Return ``{name: bytes}`` for every public projects endpoint.
+
+    The full list, each detail and the facets are rendered as the API returns
+    them. List pages use limit/offset bodies whose links point to the other
+    exported pages instead of the API.
+    """
+    projects = Project.objects.prefetch_related("technologies").order_by(
+        "-created_at", "-id"
+    )
+    data = ProjectSerializer(projects, many=True, context={"request": request}).data
+
+    documents = {"projects.json": data}
+    for project in data:
+        documents[f"projects/{project['id']}.json"] = project
+    documents["projects/facets.json"] = get_facets(
+        technology_projects=Project.objects.all(),
+        status_projects=Project.objects.all(),
+    )
+
+    pages = max(1, ceil(len(data) / page_size))
+    for number in range(1, pages + 1):
+        start = (number - 1) * page_size
+        documents[f"projects/pages/{number}.json"] = {
+            "count": len(data),
+            "next": (
+                get_static_url(request, f"projects/pages/{number + 1}.json")
+                if number < pages
+                else None
+            ),
+            "previous": (
+                get_static_url(request, f"projects/pages/{number - 1}.json")
+                if number > 1
+                else None
+            ),
+            "results": data[start : start + page_size],
+        }
+
+    return {name: renderer.render(value) for name, value in documents.items()}
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+    # WhiteNoise serves these next to the original when the client accepts them
+    with open(f"{path}.gz", "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(f"{path}.br", "wb") as f:
+            f.write(brotli.compress(content))
+
+
+def remove_file(path):
+    for suffix in ("", ".gz", ".br"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, EXPORT_DIR, MANIFEST_NAME), "rb") as f:
+            return json.load(f)["paths"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+
+
+def export(root, base_url, incremental=False, page_size=PAGE_SIZE):
+    """
+    Write the exported API under ``root`` and return what changed.
+
+    Each document is written under its plain name and a content hashed name,
+    the latter being cached forever by WhiteNoise. ``manifest.json`` maps
+    plain names to hashed ones. In incremental mode documents whose hash did
+    not change are left alone; files of removed documents and the previous
+    hashed copies of changed ones are deleted in both modes.
+    """
+    request = make_request(base_url)
+    documents = render_documents(request, page_size)
+    previous = load_manifest(root)
+    directory = os.path.join(root, EXPORT_DIR)
+
+    paths = {}
+    written = []
+    for name, content in documents.items():
+        hashed_name = get_hashed_name(name, content)
+        paths[name] = hashed_name
+        if incremental and previous.get(name) == hashed_name:
+            continue
+        write_file(os.path.join(directory, name), content)
+        write_file(os.path.join(directory, hashed_name), content)
+        written.append(name)
+
+    removed = []
+    for name, hashed_name in previous.items():
+        if name not in paths:
+            remove_file(os.path.join(directory, name))
+            removed.append(name)
+        if paths.get(name) != hashed_name:
+            remove_file(os.path.join(directory, hashed_name))
+
+    manifest = renderer.render({"version": 1, "paths": paths})
+    write_file(os.path.join(directory, MANIFEST_NAME), manifest)
+    return {
+        "written": written,
+        "unchanged": len(paths) - len(written),
+        "removed": removed,
+    }
@@ -0,0 +1,52 @@
+from django.db.models import Count, F, IntegerField, Q, Value
+
+from .models import Project, Technology
+
+TECHNOLOGY = "technology"
+PROJECT_STATUS = "project_status"
+
+
+def get_facets(technology_projects, status_projects):
+    """
+    Count projects per technology and per status in a single UNION query.
+
+    Technology counts are taken over ``technology_projects`` and status counts
+    over ``status_projects``, so each facet can ignore its own filter.
+    """
+    technologies = (
+        Technology.objects.order_by()
+        .values(facet=Value(TECHNOLOGY), key=F("pk"), label=F("name"))
+        .annotate(
+            count=Count(
+                "technologies",
+                filter=Q(technologies__in=technology_projects.values("pk")),
+            )
+        )
+        .values_list("facet", "key", "label", "count")
+    )
+    statuses = (
+        status_projects.order_by()
+        .values(
+            facet=Value(PROJECT_STATUS),
+            key=Value(None, output_field=IntegerField()),
+            label=F("project_status"),
+        )
+        .annotate(count=Count("pk"))
+        .values_list("facet", "key", "label", "count")
+    )
+
+    technology_counts = []
+    status_counts = dict.fromkeys((value for value, _ in Project.STATUS), 0)
+    for facet, key, label, count in technologies.union(statuses, all=True):
+        if facet == TECHNOLOGY:
+            technology_counts.append({"id": key, "name": label, "count": count})
+        else:
+            status_counts[label] = count
+
+    technology_counts.sort(key=lambda item: (-item["count"], item["name"].lower()))
+    return {
+        "technologies": technology_counts,
+        "project_status": [
+            {"value": value, "count": count} for value, count in status_counts.items()
+        ],
+    }
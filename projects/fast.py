@@ -0,0 +1,114 @@
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from portfolio_api.performance import timing
+
+from .images import build_variant_urls
+from .models import Project, Technology
+from .serializers import ProjectSerializer, get_columns
+
+# Columns read with values(); created_at is only needed for keyset pagination
+COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "url",
+    "project_status",
+    "project_image",
+    "project_image_variants",
+    "created_at",
+)
+
+
+def is_enabled():
+    # Lazy image variants need model instances to write back to
+    return (
+        settings.PROJECTS_FAST_READ_PATH
+        and settings.PROJECT_IMAGE_VARIANTS_MODE != "lazy"
+    )
+
+
+def get_image_url(row, names, storage, request):
+    name = row["project_image"]
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def get_image_variants(row, names, storage, request):
+    if not row["project_image"]:
+        return {}
+    return build_variant_urls(row["project_image_variants"], storage, request)
+
+
+GETTERS = {
+    "id": lambda row, names, storage, request: row["id"],
+    "technologies": lambda row, names, storage, request: names.get(row["id"], []),
+    "project_image_variants": get_image_variants,
+    "name": lambda row, names, storage, request: row["name"],
+    "description": lambda row, names, storage, request: row["description"],
+    "url": lambda row, names, storage, request: row["url"],
+    "project_status": lambda row, names, storage, request: row["project_status"],
+    "project_image": get_image_url,
+}
+
+
+@cache
+def get_field_getters(fields=None):
+    """
+    Return ``(key, getter)`` pairs in ``ProjectSerializer`` field order, for
+    all fields or those of the ``fields`` tuple.
+    """
+    if fields is None:
+        fields = list(ProjectSerializer().fields)
+    missing = [field for field in fields if field not in GETTERS]
+    if missing:
+        raise ImproperlyConfigured(
+            f"The projects fast read path cannot build: {', '.join(missing)}"
+        )
+    return tuple((field, GETTERS[field]) for field in fields)
+
+
+def get_values(queryset, fields=None):
+    columns = COLUMNS if fields is None else get_columns(fields)
+    return queryset.prefetch_related(None).values(*columns)
+
+
+def get_technology_names(project_ids):
+    """
+    Map each project id to its technology names with a single query.
+
+    The order matches ``project.technologies.all()``, which follows
+    ``Technology.Meta.ordering``.
+    """
+    names = defaultdict(list)
+    rows = (
+        Technology.objects.filter(technologies__in=project_ids)
+        .values_list("technologies", "name")
+        .order_by(*Technology._meta.ordering)
+    )
+    for project_id, name in rows:
+        names[project_id].append(name)
+    return names
+
+
+def build_projects(rows, request=None, fields=None):
+    """
+    Build the ``ProjectSerializer`` representation of ``values()`` rows,
+    limited to ``fields`` when given.
+    """
+    rows = list(rows)
+    names = {}
+    if rows and (fields is None or "technologies" in fields):
+        names = get_technology_names([row["id"] for row in rows])
+    storage = Project._meta.get_field("project_image").storage
+    getters = get_field_getters(fields)
+    with timing("serialize"):
+        return [
+            {field: getter(row, names, storage, request) for field, getter in getters}
+            for row in rows
+        ]
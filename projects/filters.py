@@ -0,0 +1,72 @@
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Project
+
+# Largest value of a BigAutoField; larger ids overflow the database driver
+MAX_ID = 2**63 - 1
+
+
+def get_list_param(request, name):
+    values = []
+    for value in request.query_params.getlist(name):
+        values.extend(item.strip() for item in value.split(","))
+    return [value for value in values if value]
+
+
+class ProjectFilterBackend(BaseFilterBackend):
+    """
+    Filter projects by ``?technology=`` (ids or names) and ``?project_status=``.
+
+    Both parameters accept comma separated or repeated values and match any
+    of them. The technology filter is an EXISTS over the through table, so it
+    uses its technology index and never duplicates rows.
+    """
+
+    filter_params = ("technology", "project_status")
+
+    def is_filtered(self, request):
+        return any(get_list_param(request, name) for name in self.filter_params)
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = self.filter_technologies(request, queryset)
+        return self.filter_statuses(request, queryset)
+
+    def filter_technologies(self, request, queryset):
+        technologies = get_list_param(request, "technology")
+        if technologies:
+            queryset = queryset.filter(self.get_technology_filter(technologies))
+        return queryset
+
+    def filter_statuses(self, request, queryset):
+        statuses = get_list_param(request, "project_status")
+        if statuses:
+            valid = {value for value, _ in Project.STATUS}
+            invalid = [status for status in statuses if status not in valid]
+            if invalid:
+                raise ValidationError(
+                    {"project_status": [f"Invalid status: {', '.join(invalid)}."]}
+                )
+            queryset = queryset.filter(project_status__in=statuses)
+
+        return queryset
+
+    def get_technology_filter(self, technologies):
+        # isdecimal, unlike isdigit, rejects "²" and the like, which int() does
+        ids = [int(value) for value in technologies if value.isdecimal()]
+        names = [value for value in technologies if not value.isdecimal()]
+        too_large = [str(pk) for pk in ids if pk > MAX_ID]
+        if too_large:
+            raise ValidationError(
+                {"technology": [f"Invalid technology id: {', '.join(too_large)}."]}
+            )
+
+        match = Q(technology_id__in=ids)
+        for name in names:
+            match |= Q(technology__name__iexact=name)
+
+        through = Project.technologies.through.objects.filter(
+            match, project_id=OuterRef("pk")
+        )
+        return Exists(through)
@@ -0,0 +1,177 @@
+import logging
+from hashlib import sha256
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .cache import invalidate_projects
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+# Pillow format name and file extension of each derivative
+FORMATS = {
+    "avif": ("AVIF", "avif"),
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+
+def get_formats():
+    """
+    Return the derivative formats this Pillow build can encode, best first.
+
+    JPEG is always produced as the fallback every client can decode.
+    """
+    from PIL import Image
+
+    Image.init()
+    return [
+        name
+        for name, (pillow_format, _) in FORMATS.items()
+        if name == "jpeg" or pillow_format in Image.SAVE
+    ]
+
+
+def get_widths(original_width):
+    widths = sorted(
+        width for width in settings.PROJECT_IMAGE_WIDTHS if width < original_width
+    )
+    return widths or [original_width]
+
+
+def needs_variants(project):
+    if not project.project_image:
+        return bool(project.project_image_variants)
+    return project.project_image_variants.get("original") != project.project_image.name
+
+
+def build_variants(image_field):
+    """
+    Encode every configured width and format of ``image_field`` on its storage.
+
+    Files are named after the hash of the original content, so re-uploading
+    the same image reuses the stored derivatives.
+    """
+    storage = image_field.storage
+    with image_field.open("rb") as f:
+        content = f.read()
+
+    # Pillow is only needed here, not on every worker start
+    from PIL import Image, ImageOps
+
+    digest = sha256(content).hexdigest()[:16]
+    directory = PurePosixPath(image_field.name).parent / "variants"
+
+    with Image.open(BytesIO(content)) as original:
+        original = ImageOps.exif_transpose(original)
+        variants = {"original": image_field.name}
+
+        for width in get_widths(original.width):
+            height = max(1, round(original.height * width / original.width))
+            resized = original.resize((width, height), Image.Resampling.LANCZOS)
+
+            for name in get_formats():
+                pillow_format, extension = FORMATS[name]
+                path = str(directory / f"{digest}-{width}.{extension}")
+                if not storage.exists(path):
+                    storage.save(path, ContentFile(encode(resized, pillow_format)))
+                variants.setdefault(name, {})[str(width)] = path
+
+    return variants
+
+
+def encode(image, pillow_format):
+    from PIL import Image
+
+    if pillow_format == "JPEG" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, "white")
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background.paste(image, mask=image.getchannel("A"))
+        else:
+            background.paste(image.convert("RGB"))
+        image = background
+
+    buffer = BytesIO()
+    image.save(buffer, pillow_format, quality=settings.PROJECT_IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def update_variants(project):
+    """
+    Regenerate the derivatives of ``project`` when its image changed.
+
+    Returns the stored variants mapping. An image that cannot be decoded is
+    recorded without variants so it is not retried until it is replaced.
+    """
+    if not needs_variants(project):
+        return project.project_image_variants
+
+    old_variants = project.project_image_variants
+    variants = {}
+    if project.project_image:
+        from PIL import Image
+
+        variants = {"original": project.project_image.name}
+        try:
+            variants = build_variants(project.project_image)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            logger.warning(
+                "Could not build variants for project %s image %s",
+                project.pk,
+                project.project_image.name,
+                exc_info=True,
+            )
+
+    Project.objects.filter(pk=project.pk).update(project_image_variants=variants)
+    project.project_image_variants = variants
+    invalidate_projects([project.pk])
+    delete_unused_variants(project, old_variants)
+    return variants
+
+
+def get_variant_paths(variants):
+    return {path for name in FORMATS for path in variants.get(name, {}).values()}
+
+
+def delete_unused_variants(project, old_variants):
+    """
+    Delete the derivative files of ``old_variants`` that no project uses.
+    """
+    unused = get_variant_paths(old_variants)
+    unused -= get_variant_paths(project.project_image_variants)
+    if not unused:
+        return
+
+    # Projects with the same image share its content hashed derivatives
+    others = Project.objects.exclude(pk=project.pk).exclude(project_image="")
+    for variants in others.values_list("project_image_variants", flat=True):
+        unused -= get_variant_paths(variants)
+
+    storage = project.project_image.storage
+    for path in unused:
+        storage.delete(path)
+
+
+def get_variant_urls(project, request=None):
+    variants = project.project_image_variants
+    if settings.PROJECT_IMAGE_VARIANTS_MODE == "lazy":
+        variants = update_variants(project)
+
+    if not project.project_image:
+        return {}
+    return build_variant_urls(variants, project.project_image.storage, request)
+
+
+def build_variant_urls(variants, storage, request=None):
+    urls = {}
+    for name in FORMATS:
+        for width, path in variants.get(name, {}).items():
+            url = storage.url(path)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls.setdefault(name, {})[width] = url
+    return urls
@@ -0,0 +1,229 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from portfolio_api.exports import batched
+
+from .cache import invalidate_projects
+from .images import update_variants
+from .models import Project, Technology
+from .search import index_rows
+
+FIELDS = ("name", "description", "url", "project_status", "project_image")
+BATCH_SIZE = 500
+
+Through = Project.technologies.through
+
+
+def parse_technologies(value):
+    # CSV exports join the names with "|"
+    if isinstance(value, str):
+        value = value.split("|")
+    names = (str(name).strip() for name in value or ())
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def clean_row(row, number):
+    """
+    Validate one input row and return its project fields and technology
+    names. ``id`` and ``created_at`` columns are ignored.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError(f"Row {number}: expected an object")
+
+    values = {field: row.get(field) for field in FIELDS}
+    values["project_image"] = values["project_image"] or ""
+    errors = {}
+    try:
+        Project(**values).clean_fields()
+    except ValidationError as e:
+        errors = e.message_dict
+
+    technologies = parse_technologies(row.get("technologies"))
+    max_length = Technology._meta.get_field("name").max_length
+    too_long = [name for name in technologies if len(name) > max_length]
+    if too_long:
+        errors["technologies"] = [f"Names over {max_length} characters: {too_long}"]
+
+    if errors:
+        messages = "; ".join(
+            f"{field}: {' '.join(field_errors)}"
+            for field, field_errors in errors.items()
+        )
+        raise ValidationError(f"Row {number}: {messages}")
+    return {**values, "technologies": technologies}
+
+
+def resolve_technologies(names):
+    """
+    Return the ids of the technologies named ``names``, creating the
+    missing ones.
+    """
+    technologies = [Technology(name=name) for name in names]
+    features = connection.features
+    if (
+        features.supports_update_conflicts_with_target
+        and features.can_return_rows_from_bulk_insert
+    ):
+        # One INSERT ... ON CONFLICT DO UPDATE ... RETURNING for all of them
+        Technology.objects.bulk_create(
+            technologies,
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["name"],
+        )
+        return {technology.name: technology.pk for technology in technologies}
+
+    Technology.objects.bulk_create(technologies, ignore_conflicts=True)
+    return dict(Technology.objects.filter(name__in=names).values_list("name", "pk"))
+
+
+def upsert_projects(rows):
+    """
+    Create or update the projects of ``rows`` matched by URL and return
+    ``(project ids by URL, created ids, updated ids, ids with a new image)``.
+    """
+    existing = {}
+    # Of several projects sharing a URL the oldest one is updated
+    for values in (
+        Project.objects.filter(url__in=rows).order_by("-pk").values("pk", *FIELDS)
+    ):
+        values["project_image"] = values["project_image"] or ""
+        existing[values["url"]] = values
+
+    created, updated = [], []
+    for url, row in rows.items():
+        values = {field: row[field] for field in FIELDS}
+        current = existing.get(url)
+        if current is None:
+            created.append(Project(**values))
+        elif any(current[field] != values[field] for field in FIELDS):
+            updated.append(Project(pk=current["pk"], **values))
+
+    Project.objects.bulk_create(created)
+    Project.objects.bulk_update(updated, FIELDS)
+
+    ids = {url: values["pk"] for url, values in existing.items()}
+    if created and created[0].pk is None:
+        # Backends that do not return the ids of inserted rows
+        created = Project.objects.filter(url__in=[project.url for project in created])
+        created = created.exclude(pk__in=ids.values())
+    ids.update((project.url, project.pk) for project in created)
+
+    new_images = {
+        project.pk
+        for project in [*created, *updated]
+        if project.project_image
+        and (
+            project.url not in existing
+            or existing[project.url]["project_image"] != project.project_image.name
+        )
+    }
+    return (
+        ids,
+        {project.pk for project in created},
+        {project.pk for project in updated},
+        new_images,
+    )
+
+
+def link_technologies(project_ids, links):
+    """
+    Make the technologies of the projects ``project_ids`` exactly those of
+    ``links``, a set of ``(project_id, technology_id)`` pairs. Return the ids
+    of the projects whose technologies changed.
+    """
+    current = {
+        (project_id, technology_id): pk
+        for pk, project_id, technology_id in Through.objects.filter(
+            project_id__in=project_ids
+        ).values_list("pk", "project_id", "technology_id")
+    }
+    stale = [pk for link, pk in current.items() if link not in links]
+    missing = links - current.keys()
+
+    if stale:
+        Through.objects.filter(pk__in=stale).delete()
+    Through.objects.bulk_create(
+        [
+            Through(project_id=project_id, technology_id=technology_id)
+            for project_id, technology_id in missing
+        ],
+        ignore_conflicts=True,
+    )
+    return {project_id for project_id, _ in missing} | {
+        project_id for project_id, _ in current.keys() - links
+    }
+
+
+def import_batch(rows):
+    """
+    Upsert one batch of clean rows in a single transaction.
+
+    Unchanged projects and links are left alone, so importing the same file
+    again updates nothing and does not invalidate the caches. Returns the
+    ``created``, ``updated`` and ``unchanged`` counts.
+    """
+    # The last row wins when a URL repeats
+    rows = {row["url"]: row for row in rows}
+    with transaction.atomic():
+        technology_ids = resolve_technologies(
+            list(
+                dict.fromkeys(
+                    name for row in rows.values() for name in row["technologies"]
+                )
+            )
+        )
+        ids, created, updated, new_images = upsert_projects(rows)
+        links = {
+            (ids[url], technology_ids[name])
+            for url, row in rows.items()
+            for name in row["technologies"]
+        }
+        updated |= link_technologies(ids.values(), links) - created
+        changed = created | updated
+        index_rows(
+            [
+                (
+                    ids[url],
+                    row["name"],
+                    row["description"],
+                    " ".join(row["technologies"]),
+                )
+                for url, row in rows.items()
+                if ids[url] in changed
+            ]
+        )
+
+    # Bulk writes send no signals, so do what the project signals would
+    if changed:
+        invalidate_projects(changed)
+    if new_images and settings.PROJECT_IMAGE_VARIANTS_MODE == "upload":
+        for project in Project.objects.filter(pk__in=new_images):
+            update_variants(project)
+
+    return {
+        "created": len(created),
+        "updated": len(updated),
+        "unchanged": len(rows) - len(changed),
+    }
+
+
+def import_projects(rows, batch_size=BATCH_SIZE, progress=None):
+    """
+    Validate and upsert ``rows``, dicts with the columns of
+    ``export_projects``, in transactions of ``batch_size`` rows.
+
+    Projects are matched by URL. ``progress`` is called with the running
+    totals after each batch. A row that fails validation raises
+    ``ValidationError``; the batches before it stay imported.
+    """
+    result = {"rows": 0, "created": 0, "updated": 0, "unchanged": 0}
+    for batch in batched(enumerate(rows, 1), batch_size):
+        counts = import_batch([clean_row(row, number) for number, row in batch])
+        result["rows"] += len(batch)
+        for key, value in counts.items():
+            result[key] += value
+        if progress is not None:
+            progress(result)
+    return result
@@ -0,0 +1,7 @@
+from portfolio_api.exports import ExportCommand
+from projects.admin import ProjectExport
+
+
+class Command(ExportCommand):
+    help = "Exporta los proyectos con sus tecnologías como CSV o JSONL."
+    export_class = ProjectExport
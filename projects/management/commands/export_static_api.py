@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.export import PAGE_SIZE, export, get_default_base_url
+
+
+class Command(BaseCommand):
+    help = "Exporta los endpoints públicos de proyectos como JSON estático."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.STATIC_ROOT,
+            help="Directorio de salida, por defecto STATIC_ROOT.",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=get_default_base_url(),
+            help="URL base de las URLs absolutas de imágenes y páginas.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=PAGE_SIZE,
+            help="Proyectos por página del listado paginado.",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Solo reescribe los archivos cuyo contenido cambió.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            # Without STATIC_ROOT, e.g. with DEBUG on, nothing serves the files
+            self.stdout.write("STATIC_ROOT is not set and no --output given, skipping.")
+            return
+
+        try:
+            result = export(
+                options["output"],
+                options["base_url"],
+                incremental=options["incremental"],
+                page_size=options["page_size"],
+            )
+        except DisallowedHost as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Written: {len(result['written'])}, unchanged: {result['unchanged']}, "
+            f"removed: {len(result['removed'])}"
+        )
@@ -0,0 +1,82 @@
+import gzip
+import sys
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_api.exports import read_rows
+from projects.imports import BATCH_SIZE, import_projects
+
+FORMATS = ("csv", "jsonl", "json")
+
+
+def get_format(path):
+    if path.endswith(".gz"):
+        path = path[: -len(".gz")]
+    extension = path.rpartition(".")[2]
+    return extension if extension in FORMATS else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa proyectos con sus tecnologías desde CSV, JSONL o JSON, como los "
+        "de export_projects. Los proyectos se identifican por su URL, así que "
+        "importar dos veces el mismo archivo no duplica nada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "input",
+            help="Archivo de entrada, opcionalmente .gz; '-' lee de stdin.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Formato de entrada; por defecto según la extensión del archivo.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Filas por transacción.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["input"]
+        format = options["format"] or get_format(path)
+        if format is None:
+            raise CommandError("Cannot tell the format of the input, use --format.")
+
+        start = time.perf_counter()
+
+        def report(result):
+            elapsed = time.perf_counter() - start
+            return (
+                f"{result['rows']} rows in {elapsed:.2f} s "
+                f"({result['rows'] / elapsed:.0f} rows/s): "
+                f"{result['created']} created, {result['updated']} updated, "
+                f"{result['unchanged']} unchanged"
+            )
+
+        def progress(result):
+            if options["verbosity"] >= 2:
+                self.stdout.write(report(result))
+
+        try:
+            if path == "-":
+                file = sys.stdin.buffer
+            elif path.endswith(".gz"):
+                file = gzip.open(path, "rb")
+            else:
+                file = open(path, "rb")
+            with file:
+                result = import_projects(
+                    read_rows(file, format), options["batch_size"], progress
+                )
+        except ValidationError as e:
+            raise CommandError(e.message)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot import {path}: {e}")
+
+        self.stdout.write(f"Imported {report(result)}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from projects.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de proyectos."
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write("Search index rebuilt")
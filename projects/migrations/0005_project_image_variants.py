@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='project_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de la imagen'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.db import migrations
+
+# The search index as it was when this migration was written; later changes to
+# projects.search get their own migrations
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_project_fts USING fts5("
+    "name, description, technologies, "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+]
+SQLITE_INSERT = (
+    "INSERT INTO projects_project_fts (rowid, name, description, technologies) "
+    "VALUES (%s, %s, %s, %s)"
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS projects_project_fts"
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS projects_project_search ("
+    "project_id bigint PRIMARY KEY "
+    "REFERENCES projects_project (id) ON DELETE CASCADE "
+    "DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS projects_project_search_document_gin "
+    "ON projects_project_search USING GIN (document)",
+]
+POSTGRES_INSERT = (
+    "INSERT INTO projects_project_search (project_id, document) VALUES (%s, "
+    "setweight(to_tsvector('simple', %s), 'A') || "
+    "setweight(to_tsvector('simple', %s), 'C') || "
+    "setweight(to_tsvector('simple', %s), 'B')) "
+    "ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document"
+)
+POSTGRES_DROP = "DROP TABLE IF EXISTS projects_project_search"
+
+STATEMENTS = {
+    "sqlite": (SQLITE_CREATE, SQLITE_INSERT, SQLITE_DROP),
+    "postgresql": (POSTGRES_CREATE, POSTGRES_INSERT, POSTGRES_DROP),
+}
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in STATEMENTS:
+        return
+    create, insert, _ = STATEMENTS[connection.vendor]
+
+    Project = apps.get_model("projects", "Project")
+    projects = Project.objects.using(connection.alias).prefetch_related(
+        "technologies"
+    )
+    rows = [
+        (
+            project.pk,
+            project.name,
+            project.description,
+            " ".join(technology.name for technology in project.technologies.all()),
+        )
+        for project in projects
+    ]
+    with connection.cursor() as cursor:
+        for statement in create:
+            cursor.execute(statement)
+        if rows:
+            cursor.executemany(insert, rows)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in STATEMENTS:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(STATEMENTS[connection.vendor][2])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
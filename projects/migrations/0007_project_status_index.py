@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='project_status',
+            field=models.CharField(choices=[('available', 'Available'), ('unavailable', 'Unavailable')], db_index=True, max_length=15, verbose_name='Estado del proyecto'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0007_project_status_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="technology",
+            options={
+                "ordering": ["id"],
+                "verbose_name": "Tecnología",
+                "verbose_name_plural": "Tecnologías",
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:12
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_technologies(apps, schema_editor):
+    # Keep the oldest technology of each name and move the links of the others
+    Technology = apps.get_model("projects", "Technology")
+    Through = apps.get_model("projects", "Project").technologies.through
+    db = schema_editor.connection.alias
+
+    duplicates = (
+        Technology.objects.using(db)
+        .values("name")
+        .annotate(keep=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        keep = duplicate["keep"]
+        others = Technology.objects.using(db).filter(name=duplicate["name"])
+        others = others.exclude(pk=keep)
+        links = Through.objects.using(db)
+        project_ids = set(
+            links.filter(technology__in=others).values_list("project_id", flat=True)
+        )
+        project_ids -= set(
+            links.filter(technology_id=keep).values_list("project_id", flat=True)
+        )
+        links.bulk_create(
+            Through(project_id=project_id, technology_id=keep)
+            for project_id in project_ids
+        )
+        # Deleting them also deletes their links
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0008_technology_ordering"),
+    ]
+
+    operations = [
+        # The unique constraint is added by the next migration: on PostgreSQL
+        # ALTER TABLE fails in the transaction that deleted rows with deferred
+        # foreign keys ("pending trigger events")
+        migrations.RunPython(merge_duplicate_technologies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0009_merge_duplicate_technologies"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="technology",
+            constraint=models.UniqueConstraint(
+                fields=("name",), name="technology_name_unique"
+            ),
+        ),
+    ]
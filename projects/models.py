@@ -10,6 +10,10 @@ class Technology(models.Model):
     class Meta:
         verbose_name = "Tecnología"
         verbose_name_plural = "Tecnologías"
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(fields=["name"], name="technology_name_unique"),
+        ]
 
     def __str__(self):
         return self.name
@@ -32,16 +36,27 @@ class Project(models.Model):
         Technology, verbose_name="Tecnologías", related_name="technologies"
     )
     project_status: models.CharField = models.CharField(
-        max_length=15, choices=STATUS, verbose_name="Estado del proyecto"
+        max_length=15,
+        choices=STATUS,
+        verbose_name="Estado del proyecto",
+        db_index=True,
     )
     project_image: models.ImageField = models.ImageField(
         verbose_name="Imagen del proyecto", blank=True, null=True
     )
+    project_image_variants: models.JSONField = models.JSONField(
+        verbose_name="Variantes de la imagen", default=dict, blank=True, editable=False
+    )
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="project_created_at_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,140 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+LIMIT_OFFSET = "limit_offset"
+CURSOR = "cursor"
+
+
+class ProjectPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an optional keyset (cursor) mode.
+
+    The cursor mode pages over ``(created_at, id)`` descending, so every page
+    is an index range scan instead of an OFFSET scan plus a ``COUNT(*)``. It is
+    selected with ``?pagination=cursor``, by sending a ``cursor`` or by setting
+    ``PROJECTS_PAGINATION_MODE = "cursor"``.
+    """
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_mode(self, request):
+        if self.cursor_query_param in request.query_params:
+            return CURSOR
+
+        mode = request.query_params.get(
+            self.mode_query_param, settings.PROJECTS_PAGINATION_MODE
+        )
+        return CURSOR if mode == CURSOR else LIMIT_OFFSET
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.mode = self.get_mode(request)
+        if self.mode == LIMIT_OFFSET:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request) or settings.PROJECTS_CURSOR_PAGE_SIZE
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            reverse = False
+        else:
+            created_at, pk, reverse = self.cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        if reverse:
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return results
+
+    def get_paginated_response(self, data):
+        if self.mode == LIMIT_OFFSET:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if self.mode == LIMIT_OFFSET:
+            return super().get_next_link()
+
+        if not self.has_next or not self.page:
+            return None
+        return self.build_cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.mode == LIMIT_OFFSET:
+            return super().get_previous_link()
+
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_cursor_link(self.page[0], reverse=True)
+
+    def build_cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(row, reverse)
+        )
+
+    def encode_cursor(self, row, reverse):
+        created_at, pk = get_position(row)
+        token = f"{created_at.isoformat()}|{pk}|{int(reverse)}"
+        return urlsafe_b64encode(token.encode("ascii")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            token = urlsafe_b64decode(encoded + padding).decode("ascii")
+            created_at, pk, reverse = token.split("|")
+            return datetime.fromisoformat(created_at), int(pk), bool(int(reverse))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+def get_position(row):
+    # Rows are model instances, or dicts on the values() fast read path
+    if isinstance(row, dict):
+        return row["created_at"], row["id"]
+    return row.created_at, row.pk
@@ -0,0 +1,211 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Project
+
+TERM_RE = re.compile(r"\w+")
+
+
+def get_terms(query):
+    return TERM_RE.findall(query.lower())
+
+
+class SQLiteSearchIndex:
+    """
+    FTS5 virtual table whose rowid is the project id.
+    """
+
+    table = "projects_project_fts"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "name, description, technologies, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def remove(self, cursor, pks):
+        cursor.executemany(
+            f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk in pks]
+        )
+
+    def index(self, cursor, rows):
+        self.remove(cursor, [row[0] for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {self.table} (rowid, name, description, technologies) "
+            "VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+    def search(self, cursor, terms):
+        match = " ".join(f'"{term}"*' for term in terms)
+        cursor.execute(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+            f"ORDER BY bm25({self.table}, 10.0, 3.0, 5.0), rowid DESC",
+            [match],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchIndex:
+    """
+    Weighted ``tsvector`` per project behind a GIN index.
+    """
+
+    table = "projects_project_search"
+    config = "simple"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "project_id bigint PRIMARY KEY "
+            "REFERENCES projects_project (id) ON DELETE CASCADE "
+            "DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_document_gin "
+            f"ON {self.table} USING GIN (document)"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def remove(self, cursor, pks):
+        cursor.execute(
+            f"DELETE FROM {self.table} WHERE project_id = ANY(%s)", [list(pks)]
+        )
+
+    def index(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {self.table} (project_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+            f"setweight(to_tsvector('{self.config}', %s), 'C') || "
+            f"setweight(to_tsvector('{self.config}', %s), 'B')) "
+            "ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document",
+            rows,
+        )
+
+    def search(self, cursor, terms):
+        query = " & ".join(f"{term}:*" for term in terms)
+        cursor.execute(
+            f"SELECT project_id FROM {self.table}, "
+            f"to_tsquery('{self.config}', %s) AS query "
+            "WHERE document @@ query "
+            "ORDER BY ts_rank(document, query) DESC, project_id DESC",
+            [query],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchIndex,
+    "postgresql": PostgresSearchIndex,
+}
+
+
+def get_backend(db_connection=connection):
+    backend = BACKENDS.get(db_connection.vendor)
+    return backend() if backend else None
+
+
+def get_rows(projects):
+    """
+    Build ``(id, name, description, technologies)`` rows for the index.
+
+    ``projects`` must have their technologies prefetched.
+    """
+    return [
+        (
+            project.pk,
+            project.name,
+            project.description,
+            " ".join(technology.name for technology in project.technologies.all()),
+        )
+        for project in projects
+    ]
+
+
+def index_projects(pks):
+    backend = get_backend()
+    pks = list(pks)
+    if backend is None or not pks:
+        return
+
+    projects = Project.objects.filter(pk__in=pks).prefetch_related("technologies")
+    rows = get_rows(projects)
+    missing = set(pks) - {row[0] for row in rows}
+    with connection.cursor() as cursor:
+        if missing:
+            backend.remove(cursor, missing)
+        if rows:
+            backend.index(cursor, rows)
+
+
+def index_rows(rows):
+    """
+    Index rows built by the caller, as ``get_rows`` would return them.
+    """
+    backend = get_backend()
+    if backend is None or not rows:
+        return
+
+    with connection.cursor() as cursor:
+        backend.index(cursor, rows)
+
+
+def remove_projects(pks):
+    backend = get_backend()
+    if backend is None:
+        return
+
+    with connection.cursor() as cursor:
+        backend.remove(cursor, list(pks))
+
+
+def rebuild_index(batch_size=500):
+    backend = get_backend()
+    if backend is None:
+        return
+
+    with connection.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+
+    pks = list(Project.objects.values_list("pk", flat=True))
+
+    for start in range(0, len(pks), batch_size):
+        index_projects(pks[start : start + batch_size])
+
+
+def search_project_ids(query):
+    """
+    Return the ids of the projects matching ``query``, best match first.
+
+    Every word must match, as a prefix, the project's name, description or
+    technology names.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return []
+
+    backend = get_backend()
+    if backend is not None:
+        with connection.cursor() as cursor:
+            return backend.search(cursor, terms)
+
+    queryset = Project.objects.all()
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term)
+            | Q(description__icontains=term)
+            | Q(technologies__name__icontains=term)
+        )
+    return list(
+        queryset.order_by("-created_at", "-id").values_list("pk", flat=True).distinct()
+    )
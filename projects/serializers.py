@@ -1,11 +1,112 @@
-from rest_framework.serializers import ModelSerializer, StringRelatedField
+from functools import lru_cache
 
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import (
+    ListSerializer,
+    ModelSerializer,
+    SerializerMethodField,
+    StringRelatedField,
+)
+
+from portfolio_api.performance import timing
+
+from .images import get_variant_urls
 from .models import Project
 
+# Model columns behind serializer fields that are not columns themselves
+FIELD_COLUMNS = {
+    "technologies": (),
+    "project_image_variants": ("project_image", "project_image_variants"),
+}
+# Always read: the pk for the technologies lookup, created_at for keyset
+# pagination
+REQUIRED_COLUMNS = ("id", "created_at")
+
+
+class ProjectListSerializer(ListSerializer):
+    @property
+    def data(self):
+        with timing("serialize"):
+            return super().data
+
 
 class ProjectSerializer(ModelSerializer):
     technologies = StringRelatedField(many=True)
-    
+    project_image_variants = SerializerMethodField()
+
     class Meta:
         model = Project
         exclude = ["created_at"]
+        list_serializer_class = ProjectListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        ``fields``, as returned by ``get_field_set``, limits the output to
+        those fields.
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @property
+    def data(self):
+        # Reported as the ``serialize`` phase of the Server-Timing header
+        with timing("serialize"):
+            return super().data
+
+    def get_project_image_variants(self, obj):
+        return get_variant_urls(obj, self.context.get("request"))
+
+
+def split_names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+@lru_cache(maxsize=256)
+def get_field_set(fields=None, omit=None):
+    """
+    Return the ``ProjectSerializer`` fields selected by the comma separated
+    ``?fields=`` and ``?omit=`` values, in serializer order, or ``None`` when
+    neither is given.
+
+    Unknown names raise ``ValidationError``. Results are cached per distinct
+    combination, so repeated requests skip the parsing and checks.
+    """
+    if fields is None and omit is None:
+        return None
+
+    available = list(ProjectSerializer().fields)
+    errors = {}
+    for param, value in (("fields", fields), ("omit", omit)):
+        unknown = [name for name in split_names(value or "") if name not in available]
+        if unknown:
+            errors[param] = [
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(available)}."
+            ]
+    if errors:
+        raise ValidationError(errors)
+
+    selected = set(split_names(fields)) if fields is not None else set(available)
+    selected -= set(split_names(omit or ""))
+    if not selected:
+        raise ValidationError({"fields": ["No fields selected."]})
+    return tuple(name for name in available if name in selected)
+
+
+@lru_cache(maxsize=256)
+def get_columns(fields):
+    """
+    Return the model columns needed to serialize ``fields``.
+    """
+    columns = [*REQUIRED_COLUMNS]
+    for name in fields:
+        columns.extend(FIELD_COLUMNS.get(name, (name,)))
+    return tuple(dict.fromkeys(columns))
+
+
+def get_request_field_set(request):
+    # Works with both DRF requests and plain Django ones
+    params = getattr(request, "query_params", request.GET)
+    return get_field_set(params.get("fields"), params.get("omit"))
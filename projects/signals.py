@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_projects
+from .images import update_variants
+from .models import Project, Technology
+from .search import index_projects, remove_projects
+
+
+def projects_changed(pks):
+    pks = list(pks)
+    invalidate_projects(pks)
+    index_projects(pks)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    projects_changed([instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    invalidate_projects([instance.pk])
+    remove_projects([instance.pk])
+
+
+@receiver(post_save, sender=Project)
+def build_project_image_variants(sender, instance, raw=False, **kwargs):
+    if raw or settings.PROJECT_IMAGE_VARIANTS_MODE != "upload":
+        return
+    update_variants(instance)
+
+
+@receiver(post_save, sender=Technology)
+def technology_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    projects_changed(instance.technologies.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Technology)
+def collect_technology_projects(sender, instance, **kwargs):
+    instance._project_pks = list(instance.technologies.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Technology)
+def technology_deleted(sender, instance, **kwargs):
+    projects_changed(getattr(instance, "_project_pks", []))
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def project_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            projects_changed([instance.pk])
+        return
+
+    # `instance` is a Technology and `pk_set` holds project ids
+    if action == "pre_clear":
+        instance._project_pks = list(instance.technologies.values_list("pk", flat=True))
+    elif action == "post_clear":
+        projects_changed(getattr(instance, "_project_pks", []))
+    elif action in ("post_add", "post_remove"):
+        projects_changed(pk_set)
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from portfolio_api.renderers import FastJSONRenderer
+from portfolio_api.routers import pin_recent_write
+
+from .cache import LIST_GENERATION_KEY, generation_timestamp, get_generation
+from .fast import build_projects, get_values, is_enabled
+from .models import Project
+
+# Snapshots are built per origin because image URLs are absolute
+MAX_ORIGINS = 8
+
+renderer = FastJSONRenderer()
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+class Snapshot:
+    """
+    The rendered portfolio for one origin at one list generation.
+
+    ``projects`` holds the list representation in list order, ``content`` the
+    same list pre-rendered as JSON and ``detail_content`` the rendered detail
+    of each project by id. Snapshots are never mutated; a rebuild replaces the
+    whole object.
+    """
+
+    def __init__(self, generation, projects):
+        self.generation = generation
+        self.created = time.monotonic()
+        self.projects = projects
+        self.by_id = {project["id"]: project for project in projects}
+        self.content = renderer.render(projects)
+        self.detail_content = {
+            project["id"]: renderer.render(project) for project in projects
+        }
+
+    def is_current(self, generation):
+        age = time.monotonic() - self.created
+        return (
+            self.generation == generation and age < settings.PROJECTS_SNAPSHOT_MAX_AGE
+        )
+
+
+class SnapshotResponse(Response):
+    """
+    Response whose JSON body was already rendered when the snapshot was built.
+
+    Other renderers or media type parameters, such as the browsable API or
+    ``; indent=4``, render ``data`` as usual.
+    """
+
+    def __init__(self, data, content, **kwargs):
+        super().__init__(data, **kwargs)
+        self.prerendered_content = content
+
+    @property
+    def rendered_content(self):
+        if (
+            type(getattr(self, "accepted_renderer", None)) is type(renderer)
+            and self.accepted_media_type == renderer.media_type
+            and self.content_type is None
+        ):
+            self["Content-Type"] = renderer.media_type
+            return self.prerendered_content
+        return super().rendered_content
+
+
+def select_fields(projects, fields):
+    """
+    Return ``projects`` limited to the ``fields`` tuple, or as they are when
+    it is ``None``.
+    """
+    if fields is None:
+        return projects
+    return [{field: project[field] for field in fields} for project in projects]
+
+
+def get_queryset():
+    return Project.objects.order_by("-created_at", "-id")
+
+
+def build_snapshot(generation, request):
+    return Snapshot(generation, build_projects(get_values(get_queryset()), request))
+
+
+def get_snapshot(request, generation=None):
+    """
+    Return the snapshot of the list generation, rebuilding it when stale.
+
+    The list generation token is the version stamp shared by every worker:
+    any change to projects or technologies bumps it, so each process notices
+    on its next request and rebuilds its own copy. Returns ``None`` when the
+    snapshot is disabled or the cache does not keep the token.
+    """
+    if not settings.PROJECTS_SNAPSHOT or not is_enabled():
+        return None
+
+    if generation is None:
+        generation = get_generation(LIST_GENERATION_KEY)
+        if generation is None:
+            return None
+
+    origin = request.build_absolute_uri("/")
+    snapshot = _snapshots.get(origin)
+    if snapshot is not None and snapshot.is_current(generation):
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshots.get(origin)
+        if snapshot is None or not snapshot.is_current(generation):
+            pin_recent_write(generation_timestamp(generation))
+            # Tagged with the generation read before querying, so a write
+            # during the build makes the next request rebuild again
+            snapshot = build_snapshot(generation, request)
+            if origin not in _snapshots and len(_snapshots) >= MAX_ORIGINS:
+                _snapshots.clear()
+            _snapshots[origin] = snapshot
+    return snapshot
@@ -0,0 +1,11 @@
+import re
+
+# Directory under STATIC_ROOT, served by WhiteNoise at STATIC_URL + "api/"
+EXPORT_DIR = "api"
+
+# ``projects/3.0123456789ab.json``: same hash length as collectstatic
+HASHED_NAME_RE = re.compile(r"^.+\.[0-9a-f]{12}\.json$")
+
+
+def is_hashed_name(name):
+    return name.startswith(f"{EXPORT_DIR}/") and bool(HASHED_NAME_RE.match(name))
@@ -1,13 +1,50 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
 from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
+from PIL import Image
+
+from portfolio_api.middleware import AsyncWhiteNoiseMiddleware
+from portfolio_api.renderers import FastJSONRenderer
 
+from .cache import (
+    LIST_GENERATION_KEY,
+    get_cache,
+    get_generation,
+    get_stats,
+    project_generation_key,
+    reset_stats,
+)
+from .checks import check_snapshot_cache
 from .models import Project, Technology
-from .serializers import ProjectSerializer
+from .search import rebuild_index, search_project_ids
+from .snapshot import get_snapshot
+from .serializers import ProjectSerializer, get_field_set
 
 
 class TechnologyModelTest(TestCase):
@@ -235,6 +272,81 @@ class ProjectsListViewTest(TestCase):
         self.assertEqual(response.data, serializer.data)
 
 
+class ProjectsCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("projects")
+
+        # Varios proyectos comparten `created_at` para probar el desempate por `id`
+        created_at = timezone.now()
+        self.projects = [
+            Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Descripción del proyecto.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            for index in range(7)
+        ]
+        for index, project in enumerate(self.projects):
+            Project.objects.filter(pk=project.pk).update(
+                created_at=created_at - timedelta(days=index // 3)
+            )
+
+        self.expected_ids = list(
+            Project.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def collect_ids(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            ids.extend(project["id"] for project in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_cursor_walks_all_projects_in_order(self):
+        # Recorrer todas las páginas con el cursor devuelve cada proyecto una vez
+        ids = self.collect_ids(f"{self.url}?pagination=cursor&limit=2")
+        self.assertEqual(ids, self.expected_ids)
+
+    def test_cursor_response_has_no_count(self):
+        # El modo cursor no ejecuta COUNT(*)
+        response = self.client.get(f"{self.url}?pagination=cursor&limit=2")
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_previous_link(self):
+        # El enlace `previous` regresa a la página anterior
+        first = self.client.get(f"{self.url}?pagination=cursor&limit=3")
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+
+    def test_invalid_cursor(self):
+        # Un cursor inválido devuelve 404
+        response = self.client.get(f"{self.url}?cursor=invalido")
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
+    @override_settings(PROJECTS_PAGINATION_MODE="cursor", PROJECTS_CURSOR_PAGE_SIZE=4)
+    def test_cursor_mode_from_settings(self):
+        # El modo cursor se puede activar por configuración
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertEqual(self.collect_ids(self.url), self.expected_ids)
+
+    def test_limit_offset_is_default(self):
+        # Los clientes existentes siguen recibiendo limit/offset
+        response = self.client.get(f"{self.url}?limit=2&offset=2")
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual(
+            [project["id"] for project in response.data["results"]],
+            self.expected_ids[2:4],
+        )
+
+
 class ProjectDetailViewTest(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -271,3 +383,1312 @@ class ProjectDetailViewTest(TestCase):
         url = reverse("project", kwargs={"pk": 999})  # ID no existente
         response = self.client.get(url)
         self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
+
+class QueryBudgetMixin:
+    # Presupuesto máximo de consultas SQL por endpoint: {nombre_url: consultas}
+    query_budgets = {}
+
+    def assertQueryBudget(self, url_name, url, budget=None):
+        # Falla si la petición GET ejecuta más consultas de las declaradas
+        if budget is None:
+            budget = self.query_budgets[url_name]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = "\n".join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{url} ejecutó {executed} consultas, el presupuesto de "
+                f"'{url_name}' es {budget}:\n{queries}"
+            )
+
+        return response
+
+
+class ProjectsQueryBudgetTest(QueryBudgetMixin, TestCase):
+    query_budgets = {
+        # Proyectos + prefetch de tecnologías
+        "projects": 2,
+        # COUNT de la paginación + proyectos + prefetch de tecnologías
+        "projects_paginated": 3,
+        # Proyecto + prefetch de tecnologías
+        "project": 2,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.technologies = [
+            Technology.objects.create(name=name)
+            for name in ("Python", "Django", "PostgreSQL")
+        ]
+
+    def create_projects(self, total):
+        for index in range(total):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Descripción del proyecto.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.set(self.technologies)
+
+    def test_projects_list_query_budget(self):
+        # El número de consultas no debe crecer con el número de proyectos
+        for total in (1, 10, 50):
+            with self.subTest(total=total):
+                Project.objects.all().delete()
+                self.create_projects(total)
+                response = self.assertQueryBudget("projects", reverse("projects"))
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertEqual(len(response.data), total)
+                self.assertEqual(len(response.data[0]["technologies"]), 3)
+
+    def test_projects_paginated_query_budget(self):
+        # La paginación añade solo la consulta COUNT
+        self.create_projects(30)
+        response = self.assertQueryBudget(
+            "projects_paginated", f"{reverse('projects')}?limit=25"
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 25)
+
+    def test_project_detail_query_budget(self):
+        self.create_projects(1)
+        project = Project.objects.get()
+        response = self.assertQueryBudget(
+            "project", reverse("project", kwargs={"pk": project.id})
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            response.data["technologies"], ["Python", "Django", "PostgreSQL"]
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PROJECTS_SNAPSHOT=False,
+)
+class ProjectsCacheTest(QueryBudgetMixin, TestCase):
+    query_budgets = {"projects": 0, "project": 0}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tech = Technology.objects.create(name="Python")
+        self.project = Project.objects.create(
+            name="Proyecto Cache",
+            description="Proyecto para probar la caché.",
+            url="https://example.com",
+            project_status="available",
+        )
+        self.project.technologies.add(self.tech)
+        self.list_url = reverse("projects")
+        self.detail_url = reverse("project", kwargs={"pk": self.project.id})
+        reset_stats()
+
+    def test_repeated_reads_do_not_query_database(self):
+        # La segunda lectura se sirve desde la caché sin consultas SQL
+        for url_name, url in (
+            ("projects", self.list_url),
+            ("project", self.detail_url),
+        ):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first["X-Cache"], "MISS")
+                second = self.assertQueryBudget(url_name, url)
+                self.assertEqual(second["X-Cache"], "HIT")
+                self.assertEqual(second.data, first.data)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_backend_without_storage(self):
+        # Un backend que no almacena valores sigue sirviendo respuestas válidas,
+        # sin ETag ni caché porque el sello cambiaría en cada petición
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertNotIn("ETag", response)
+                self.assertNotIn("X-Cache", response)
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "other.example.com"])
+    def test_scheme_and_host_in_key(self):
+        # Las URL de imagen son absolutas, así que cada origen tiene su entrada
+        self.client.get(self.detail_url)
+        for kwargs in ({"secure": True}, {"HTTP_HOST": "other.example.com"}):
+            with self.subTest(**kwargs):
+                response = self.client.get(self.detail_url, **kwargs)
+                self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.detail_url)["X-Cache"], "HIT")
+
+    def test_generation_keys_expire(self):
+        # Las claves de proyectos inexistentes no quedan para siempre
+        key = project_generation_key(0)
+        self.client.get(reverse("project", kwargs={"pk": 0}))
+        self.assertIsNotNone(get_cache().get(key))
+        later = time.time() + settings.PROJECTS_CACHE_TIMEOUT + 1
+        with mock.patch("time.time", return_value=later):
+            self.assertIsNone(get_cache().get(key))
+
+    def test_hit_and_miss_counters(self):
+        # Los contadores registran aciertos y fallos
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.assertEqual(get_stats(), {"hits": 2, "misses": 1})
+
+    def test_project_save_invalidates(self):
+        # Guardar un proyecto invalida la lista y su detalle
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+        self.project.name = "Proyecto Renombrado"
+        self.project.save()
+
+        self.assertEqual(
+            self.client.get(self.list_url).data[0]["name"], "Proyecto Renombrado"
+        )
+        self.assertEqual(
+            self.client.get(self.detail_url).data["name"], "Proyecto Renombrado"
+        )
+
+    def test_other_project_detail_stays_cached(self):
+        # La invalidación del detalle solo afecta al proyecto modificado
+        other = Project.objects.create(
+            name="Otro Proyecto",
+            description="Otro proyecto.",
+            url="https://other.example.com",
+            project_status="available",
+        )
+        self.client.get(self.detail_url)
+        other.save()
+        self.assertEqual(self.client.get(self.detail_url)["X-Cache"], "HIT")
+
+    def test_project_delete_invalidates(self):
+        # Eliminar un proyecto lo quita de la lista y del detalle
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+        self.project.delete()
+
+        self.assertEqual(self.client.get(self.list_url).data, [])
+        self.assertEqual(
+            self.client.get(self.detail_url).status_code, HTTP_404_NOT_FOUND
+        )
+
+    def test_technologies_change_invalidates(self):
+        # Cambiar las tecnologías del proyecto invalida la caché
+        self.client.get(self.detail_url)
+        django = Technology.objects.create(name="Django")
+        self.project.technologies.add(django)
+        self.assertEqual(
+            self.client.get(self.detail_url).data["technologies"], ["Python", "Django"]
+        )
+
+        self.project.technologies.clear()
+        self.assertEqual(self.client.get(self.detail_url).data["technologies"], [])
+
+    def test_reverse_technologies_change_invalidates(self):
+        # Los cambios desde el lado de Technology también invalidan la caché
+        self.client.get(self.detail_url)
+        self.tech.technologies.clear()
+        self.assertEqual(self.client.get(self.detail_url).data["technologies"], [])
+
+        self.tech.technologies.add(self.project)
+        self.assertEqual(
+            self.client.get(self.detail_url).data["technologies"], ["Python"]
+        )
+
+    def test_technology_rename_and_delete_invalidate(self):
+        # Renombrar o eliminar una tecnología invalida los proyectos que la usan
+        self.client.get(self.list_url)
+        self.tech.name = "Python 3"
+        self.tech.save()
+        self.assertEqual(
+            self.client.get(self.list_url).data[0]["technologies"], ["Python 3"]
+        )
+
+        self.tech.delete()
+        self.assertEqual(self.client.get(self.list_url).data[0]["technologies"], [])
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ProjectsConditionalGetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.project = Project.objects.create(
+            name="Proyecto Condicional",
+            description="Proyecto para probar ETag.",
+            url="https://example.com",
+            project_status="available",
+        )
+        self.urls = [
+            reverse("projects"),
+            reverse("project", kwargs={"pk": self.project.id}),
+        ]
+
+    def test_validators_present(self):
+        # Las respuestas incluyen ETag fuerte y Last-Modified
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(response["ETag"].startswith('"'))
+                self.assertIn("Last-Modified", response)
+
+    def test_if_none_match_returns_304_without_queries(self):
+        # Un ETag coincidente devuelve 304 sin consultar la base de datos
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                self.client.credentials(HTTP_IF_NONE_MATCH=etag)
+                response = self.assertQueryBudget("conditional", url, budget=0)
+                self.client.credentials()
+                self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_returns_304(self):
+        # Una fecha If-Modified-Since vigente devuelve 304
+        for url in self.urls:
+            with self.subTest(url=url):
+                last_modified = self.client.get(url)["Last-Modified"]
+                self.client.credentials(HTTP_IF_MODIFIED_SINCE=last_modified)
+                response = self.client.get(url)
+                self.client.credentials()
+                self.assertEqual(response.status_code, HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_update(self):
+        # Modificar el proyecto cambia el ETag y la respuesta vuelve a ser 200
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                self.project.save()
+                self.client.credentials(HTTP_IF_NONE_MATCH=etag)
+                response = self.client.get(url)
+                self.client.credentials()
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_query(self):
+        # Cada combinación de parámetros tiene su propio ETag
+        url = self.urls[0]
+        self.assertNotEqual(
+            self.client.get(url)["ETag"], self.client.get(f"{url}?limit=1")["ETag"]
+        )
+
+
+class ProjectImageVariantsTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            PROJECT_IMAGE_WIDTHS=[100, 200, 800],
+            PROJECT_IMAGE_VARIANTS_MODE="upload",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+
+    def make_image(self, name="imagen.png", size=(400, 300), mode="RGBA"):
+        buffer = BytesIO()
+        Image.new(mode, size, (200, 30, 30, 255)[: len(mode)]).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def create_project(self, image=None):
+        return Project.objects.create(
+            name="Proyecto con imagen",
+            description="Proyecto para probar las variantes.",
+            url="https://example.com",
+            project_status="available",
+            project_image=image,
+        )
+
+    def test_variants_generated_on_upload(self):
+        # Al subir la imagen se generan las variantes en los anchos configurados
+        project = self.create_project(self.make_image())
+        project.refresh_from_db()
+        variants = project.project_image_variants
+
+        self.assertEqual(variants["original"], project.project_image.name)
+        self.assertEqual(sorted(variants["jpeg"]), ["100", "200"])
+        self.assertEqual(sorted(variants["webp"]), ["100", "200"])
+
+        storage = project.project_image.storage
+        with storage.open(variants["webp"]["100"]) as f:
+            image = Image.open(f)
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (100, 75))
+        with storage.open(variants["jpeg"]["200"]) as f:
+            image = Image.open(f)
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (200, 150))
+
+    def test_variant_names_are_content_hashed(self):
+        # La misma imagen reutiliza las variantes ya almacenadas
+        first = self.create_project(self.make_image("uno.png"))
+        second = self.create_project(self.make_image("dos.png"))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(
+            first.project_image_variants["webp"], second.project_image_variants["webp"]
+        )
+
+    def test_replaced_image_deletes_old_variants(self):
+        # Al cambiar la imagen se borran las variantes que nadie más usa
+        project = self.create_project(self.make_image("uno.png"))
+        shared = self.create_project(self.make_image("dos.png"))
+        project.refresh_from_db()
+        storage = project.project_image.storage
+        old_paths = list(project.project_image_variants["webp"].values())
+
+        project.project_image = self.make_image("tres.png", size=(300, 300))
+        project.save()
+        self.assertTrue(all(storage.exists(path) for path in old_paths))
+
+        shared.project_image = self.make_image("cuatro.png", size=(300, 300))
+        shared.save()
+        self.assertFalse(any(storage.exists(path) for path in old_paths))
+
+    def test_small_image_keeps_original_width(self):
+        # Una imagen más pequeña que todos los anchos conserva su tamaño
+        project = self.create_project(self.make_image(size=(50, 40), mode="RGB"))
+        project.refresh_from_db()
+        self.assertEqual(list(project.project_image_variants["jpeg"]), ["50"])
+
+    def test_serializer_exposes_variant_urls(self):
+        # La API expone las URLs absolutas de las variantes
+        project = self.create_project(self.make_image())
+        response = self.client.get(reverse("project", kwargs={"pk": project.id}))
+        variants = response.data["project_image_variants"]
+        self.assertEqual(sorted(variants["webp"]), ["100", "200"])
+        self.assertTrue(variants["webp"]["100"].startswith("http://testserver/media/"))
+        self.assertTrue(variants["jpeg"]["200"].endswith(".jpg"))
+
+    def test_project_without_image(self):
+        # Un proyecto sin imagen no tiene variantes
+        project = self.create_project()
+        response = self.client.get(reverse("project", kwargs={"pk": project.id}))
+        self.assertEqual(response.data["project_image_variants"], {})
+
+    def test_lazy_mode_generates_on_first_request(self):
+        # En modo diferido las variantes se generan en la primera lectura
+        with self.settings(PROJECT_IMAGE_VARIANTS_MODE="lazy"):
+            project = self.create_project(self.make_image())
+            project.refresh_from_db()
+            self.assertEqual(project.project_image_variants, {})
+
+            response = self.client.get(reverse("project", kwargs={"pk": project.id}))
+            self.assertIn("webp", response.data["project_image_variants"])
+            project.refresh_from_db()
+            self.assertIn("webp", project.project_image_variants)
+
+    def test_invalid_image_is_not_retried(self):
+        # Una imagen corrupta se registra sin variantes
+        image = SimpleUploadedFile("rota.png", b"no es una imagen")
+        with self.assertLogs("projects.images", level="WARNING"):
+            project = self.create_project(image)
+        project.refresh_from_db()
+        self.assertEqual(
+            project.project_image_variants, {"original": project.project_image.name}
+        )
+
+    def test_decompression_bomb_is_not_retried(self):
+        # Una imagen con demasiados píxeles se registra sin variantes
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            with self.assertLogs("projects.images", level="WARNING"):
+                project = self.create_project(self.make_image())
+        project.refresh_from_db()
+        self.assertEqual(
+            project.project_image_variants, {"original": project.project_image.name}
+        )
+
+
+class ProjectSearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("projects_search")
+        self.python = Technology.objects.create(name="Python")
+        self.react = Technology.objects.create(name="React")
+
+        self.api = Project.objects.create(
+            name="API de portafolio",
+            description="Servicio REST construido con Django.",
+            url="https://api.example.com",
+            project_status="available",
+        )
+        self.api.technologies.add(self.python)
+        self.web = Project.objects.create(
+            name="Sitio web",
+            description="Interfaz que consume la API del portafolio.",
+            url="https://web.example.com",
+            project_status="available",
+        )
+        self.web.technologies.add(self.react)
+
+        # Proyectos sin relación para que la relevancia tenga un corpus
+        for index in range(4):
+            Project.objects.create(
+                name=f"Juego {index}",
+                description="Videojuego de plataformas.",
+                url=f"https://game{index}.example.com",
+                project_status="unavailable",
+            )
+
+    def search(self, query):
+        response = self.client.get(self.url, {"q": query})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return [project["id"] for project in response.data]
+
+    def test_search_by_name_description_and_technology(self):
+        # La búsqueda cubre nombre, descripción y tecnologías
+        self.assertEqual(self.search("django"), [self.api.id])
+        self.assertEqual(self.search("react"), [self.web.id])
+        self.assertEqual(self.search("sitio"), [self.web.id])
+
+    def test_admin_search(self):
+        # El admin combina la búsqueda de texto con la de URL y estado
+        user = User.objects.create_superuser("admin", "admin@example.com")
+        self.client.force_login(user)
+        url = reverse("admin:projects_project_changelist")
+        for query, expected in (
+            ("django", [self.api]),
+            ("web.example.com", [self.web]),
+            ("unavailable", list(Project.objects.filter(name__startswith="Juego"))),
+        ):
+            with self.subTest(query=query):
+                response = self.client.get(url, {"q": query})
+                self.assertEqual(set(response.context["cl"].result_list), set(expected))
+
+    def test_name_matches_rank_first(self):
+        # Una coincidencia en el nombre pesa más que en la descripción
+        self.assertEqual(self.search("api"), [self.api.id, self.web.id])
+
+    def test_prefix_and_accents(self):
+        # Se admiten prefijos y se ignoran los acentos
+        self.assertEqual(self.search("constr"), [self.api.id])
+        self.assertEqual(self.search("interfáz"), [self.web.id])
+
+    def test_all_terms_must_match(self):
+        # Todos los términos deben coincidir
+        self.assertEqual(self.search("api react"), [self.web.id])
+        self.assertEqual(self.search("python react"), [])
+
+    def test_missing_query(self):
+        # El parámetro `q` es obligatorio
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_query_syntax_is_escaped(self):
+        # Los operadores de la consulta se tratan como texto
+        self.assertEqual(self.search('django" *'), [self.api.id])
+        self.assertEqual(self.search("***"), [])
+
+    def test_index_follows_changes(self):
+        # El índice se actualiza al modificar proyectos y tecnologías
+        self.api.name = "Backend"
+        self.api.save()
+        self.assertEqual(self.search("backend"), [self.api.id])
+
+        self.python.name = "Rust"
+        self.python.save()
+        self.assertEqual(self.search("rust"), [self.api.id])
+        self.assertEqual(self.search("python"), [])
+
+        self.web.technologies.add(self.python)
+        self.assertCountEqual(self.search("rust"), [self.web.id, self.api.id])
+
+        self.python.delete()
+        self.assertEqual(self.search("rust"), [])
+
+        self.web.delete()
+        self.assertEqual(self.search("sitio"), [])
+
+    def test_pagination(self):
+        # Los resultados se pueden paginar
+        response = self.client.get(self.url, {"q": "api", "limit": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["id"], self.api.id)
+
+    def test_rebuild_index(self):
+        # Reconstruir el índice conserva los resultados
+        rebuild_index()
+        self.assertEqual(search_project_ids("django"), [self.api.id])
+
+
+class ProjectFiltersAndFacetsTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.python = Technology.objects.create(name="Python")
+        self.django = Technology.objects.create(name="Django")
+        self.react = Technology.objects.create(name="React")
+        self.unused = Technology.objects.create(name="Go")
+
+        self.api = self.create_project("API", "available", [self.python, self.django])
+        self.script = self.create_project("Script", "unavailable", [self.python])
+        self.web = self.create_project("Web", "available", [self.react])
+
+    def create_project(self, name, status, technologies):
+        project = Project.objects.create(
+            name=name,
+            description=f"Proyecto {name}.",
+            url="https://example.com",
+            project_status=status,
+        )
+        project.technologies.set(technologies)
+        return project
+
+    def list_names(self, params):
+        response = self.client.get(reverse("projects"), params)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return sorted(project["name"] for project in response.data)
+
+    def test_filter_by_technology_name_and_id(self):
+        # El filtro acepta nombres (sin distinguir mayúsculas) e ids
+        self.assertEqual(self.list_names({"technology": "python"}), ["API", "Script"])
+        self.assertEqual(self.list_names({"technology": self.react.id}), ["Web"])
+
+    def test_filter_by_several_technologies(self):
+        # Varias tecnologías devuelven los proyectos que usan cualquiera, sin duplicados
+        self.assertEqual(
+            self.list_names({"technology": "Python,Django"}), ["API", "Script"]
+        )
+
+    def test_filter_by_status(self):
+        # Filtrar por estado
+        self.assertEqual(
+            self.list_names({"project_status": "available"}), ["API", "Web"]
+        )
+
+    def test_combined_filters(self):
+        # Los filtros se combinan
+        self.assertEqual(
+            self.list_names({"technology": "Python", "project_status": "unavailable"}),
+            ["Script"],
+        )
+
+    def test_invalid_status(self):
+        # Un estado inválido devuelve 400
+        response = self.client.get(reverse("projects"), {"project_status": "otro"})
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_technology_values_that_are_not_ids(self):
+        # "²" es un dígito para isdigit pero no un número; se trata como nombre
+        self.assertEqual(self.list_names({"technology": "²"}), [])
+        # Un id fuera del rango de 64 bits devuelve 400 en la lista y las facetas
+        for url_name in ("projects", "projects_facets"):
+            with self.subTest(url_name=url_name):
+                response = self.client.get(
+                    reverse(url_name), {"technology": "99999999999999999999999"}
+                )
+                self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(
+                reverse("projects_facets"), {"technology": "²"}
+            ).status_code,
+            HTTP_200_OK,
+        )
+
+    def test_facets_single_query(self):
+        # Los conteos se calculan en una sola consulta agrupada
+        response = self.assertQueryBudget(
+            "projects_facets", reverse("projects_facets"), budget=1
+        )
+        self.assertEqual(
+            response.data["technologies"],
+            [
+                {"id": self.python.id, "name": "Python", "count": 2},
+                {"id": self.django.id, "name": "Django", "count": 1},
+                {"id": self.react.id, "name": "React", "count": 1},
+                {"id": self.unused.id, "name": "Go", "count": 0},
+            ],
+        )
+        self.assertEqual(
+            response.data["project_status"],
+            [
+                {"value": "available", "count": 2},
+                {"value": "unavailable", "count": 1},
+            ],
+        )
+
+    def test_facets_ignore_their_own_filter(self):
+        # Cada faceta aplica los filtros de las demás
+        response = self.client.get(
+            reverse("projects_facets"),
+            {"technology": "React", "project_status": "available"},
+        )
+        technologies = {
+            item["name"]: item["count"] for item in response.data["technologies"]
+        }
+        self.assertEqual(technologies["Python"], 1)
+        self.assertEqual(technologies["React"], 1)
+        self.assertEqual(
+            response.data["project_status"],
+            [
+                {"value": "available", "count": 1},
+                {"value": "unavailable", "count": 0},
+            ],
+        )
+
+
+class AsyncProjectViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        python = Technology.objects.create(name="Python")
+        for index in range(5):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Descripción del proyecto.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.add(python)
+        self.project = project
+
+    async def test_list_matches_sync_view(self):
+        # La vista asíncrona devuelve el mismo JSON que la síncrona
+        queries = (
+            "",
+            "?limit=2",
+            "?limit=2&offset=2",
+            "?limit=2&offset=4",
+            # Un límite no positivo devuelve la lista completa, no una página vacía
+            "?limit=0",
+            "?limit=-1&offset=2",
+        )
+        for query in queries:
+            with self.subTest(query=query):
+                expected = await sync_to_async(self.client.get)(
+                    reverse("projects") + query
+                )
+                response = await self.async_client.get(
+                    reverse("async_projects") + query
+                )
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertEqual(
+                    response.json(),
+                    self.replace_prefix(expected.json()),
+                )
+
+    async def test_detail_matches_sync_view(self):
+        # El detalle asíncrono coincide con el síncrono
+        expected = await sync_to_async(self.client.get)(
+            reverse("project", kwargs={"pk": self.project.id})
+        )
+        response = await self.async_client.get(
+            reverse("async_project", kwargs={"pk": self.project.id})
+        )
+        self.assertEqual(response.content, expected.content)
+
+    async def test_detail_not_found(self):
+        # Un proyecto inexistente devuelve 404
+        response = await self.async_client.get(
+            reverse("async_project", kwargs={"pk": 999})
+        )
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
+    def test_list_query_count(self):
+        # La lista asíncrona usa una consulta de proyectos y una de prefetch
+        with CaptureQueriesContext(connection) as context:
+            async_to_sync(self.async_client.get)(reverse("async_projects"))
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def replace_prefix(self, data):
+        # Los enlaces de paginación apuntan a la ruta asíncrona
+        if isinstance(data, dict):
+            for key in ("next", "previous"):
+                if data.get(key):
+                    data[key] = data[key].replace(
+                        "/api/projects/", "/api/async/projects/"
+                    )
+        return data
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+)
+class FastReadPathTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, PROJECT_IMAGE_WIDTHS=[100]
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+
+        technologies = [
+            Technology.objects.create(name=name)
+            for name in ("Python", "Django", "Árbol ")
+        ]
+        buffer = BytesIO()
+        Image.new("RGB", (200, 100)).save(buffer, "PNG")
+        image = SimpleUploadedFile("imagen.png", buffer.getvalue())
+        for index in range(5):
+            project = Project.objects.create(
+                name=f'Proyecto {index} «ñ»   "comillas"',
+                description="Descripción con emoji 🚀, \u2028 y </script>",
+                url=f"https://example.com/{index}",
+                project_status="available" if index % 2 else "unavailable",
+                project_image=image if index == 0 else None,
+            )
+            project.technologies.set(technologies[index % 3 :])
+        self.project = Project.objects.order_by("id").first()
+
+    def get_both(self, url):
+        # Devuelve las respuestas de la ruta rápida y del serializador
+        responses = []
+        for fast in (True, False):
+            with override_settings(PROJECTS_FAST_READ_PATH=fast):
+                responses.append(self.client.get(url))
+        return responses
+
+    def test_responses_are_byte_identical(self):
+        # La ruta rápida produce exactamente los mismos bytes que el serializador
+        cursor = self.client.get(
+            reverse("projects") + "?pagination=cursor&limit=2"
+        ).data["next"]
+        urls = [
+            reverse("projects"),
+            reverse("projects") + "?limit=2&offset=1",
+            reverse("projects") + "?pagination=cursor&limit=2",
+            cursor,
+            reverse("projects") + "?project_status=available",
+            reverse("project", args=[self.project.pk]),
+            reverse("project", args=[0]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                fast, slow = self.get_both(url)
+                self.assertEqual(fast.status_code, slow.status_code)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_image_and_technologies_present(self):
+        fast, _ = self.get_both(reverse("project", args=[self.project.pk]))
+        data = fast.json()
+        self.assertTrue(data["project_image"].startswith("http://testserver/"))
+        self.assertIn("100", data["project_image_variants"]["webp"])
+        self.assertEqual(data["technologies"], ["Python", "Django", "Árbol "])
+
+    def test_renderer_matches_json_renderer(self):
+        # FastJSONRenderer produce los mismos bytes con y sin orjson
+        data = ProjectSerializer(
+            Project.objects.order_by("id"), many=True, context={"request": None}
+        ).data
+        payload = {"results": data, "when": timezone.now(), "delta": timedelta(1)}
+        expected = JSONRenderer().render(payload)
+
+        self.assertEqual(FastJSONRenderer().render(payload), expected)
+        with mock.patch("portfolio_api.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(payload), expected)
+
+    def test_renderer_keeps_indent(self):
+        data = {"name": "Proyecto"}
+        context = {"indent": 4}
+        self.assertEqual(
+            FastJSONRenderer().render(data, renderer_context=context),
+            JSONRenderer().render(data, renderer_context=context),
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PROJECTS_SNAPSHOT=True,
+)
+class ProjectsSnapshotTest(QueryBudgetMixin, TestCase):
+    query_budgets = {"projects": 0, "projects_paginated": 0, "project": 0}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tech = Technology.objects.create(name="Python")
+        self.projects = []
+        for index in range(3):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Proyecto para probar el snapshot.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.add(self.tech)
+            self.projects.append(project)
+        self.list_url = reverse("projects")
+        self.detail_url = reverse("project", args=[self.projects[0].pk])
+
+    def test_steady_state_reads_do_not_query_database(self):
+        # Tras construir el snapshot, las lecturas no ejecutan SQL
+        self.client.get(self.list_url)
+        response = self.assertQueryBudget("projects", self.list_url)
+        self.assertEqual(response["X-Cache"], "SNAPSHOT")
+        self.assertEqual(len(response.data), 3)
+        self.assertQueryBudget("projects_paginated", self.list_url + "?limit=2")
+        self.assertQueryBudget("project", self.detail_url)
+        self.assertEqual(
+            self.client.get(reverse("project", args=[0])).status_code,
+            HTTP_404_NOT_FOUND,
+        )
+
+    def test_responses_match_database_path(self):
+        urls = [
+            self.list_url,
+            self.list_url + "?limit=2&offset=1",
+            self.detail_url,
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response["X-Cache"], "SNAPSHOT")
+                with override_settings(PROJECTS_SNAPSHOT=False):
+                    expected = self.client.get(url)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+        # Otros renderizadores no usan los bytes precalculados
+        response = self.client.get(self.list_url + "?format=api")
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertContains(response, "Proyecto 2")
+
+    def test_filtered_and_cursor_lists_use_database(self):
+        for query in ("?project_status=available", "?pagination=cursor"):
+            with self.subTest(query=query):
+                response = self.client.get(self.list_url + query)
+                self.assertEqual(response["X-Cache"], "MISS")
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_skipped_without_generation(self):
+        # Sin sello de versión persistente no se construye un snapshot por petición
+        with mock.patch("projects.snapshot.build_snapshot") as build:
+            response = self.client.get(self.list_url)
+        build.assert_not_called()
+        self.assertNotIn("X-Cache", response)
+        self.assertEqual(len(response.data), 3)
+
+    def test_check_requires_shared_cache(self):
+        # Con una caché local del proceso, las escrituras del CLI no llegarían
+        self.assertEqual(
+            [error.id for error in check_snapshot_cache(None)], ["projects.E001"]
+        )
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(CACHES=redis):
+            self.assertEqual(check_snapshot_cache(None), [])
+        with override_settings(PROJECTS_SNAPSHOT=False):
+            self.assertEqual(check_snapshot_cache(None), [])
+
+    def test_rebuilt_on_write(self):
+        # Un cambio cambia el sello de versión y el snapshot se reconstruye
+        first = self.client.get(self.list_url)
+        snapshot = get_snapshot(first.wsgi_request)
+        self.projects[0].name = "Proyecto Renombrado"
+        self.projects[0].save()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data["name"], "Proyecto Renombrado")
+        self.assertIsNot(get_snapshot(first.wsgi_request), snapshot)
+
+        self.projects[1].delete()
+        self.assertEqual(len(self.client.get(self.list_url).data), 2)
+
+    def test_rebuilt_after_max_age(self):
+        request = self.client.get(self.list_url).wsgi_request
+        snapshot = get_snapshot(request)
+        self.assertIs(get_snapshot(request), snapshot)
+        with override_settings(PROJECTS_SNAPSHOT_MAX_AGE=0):
+            self.assertIsNot(get_snapshot(request), snapshot)
+
+
+@override_settings(PROJECTS_SNAPSHOT=False)
+class StaticExportTest(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.client = APIClient()
+        tech = Technology.objects.create(name="Python")
+        self.projects = []
+        for index in range(3):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Proyecto para probar la exportación.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.add(tech)
+            self.projects.append(project)
+
+    def export(self, *args):
+        output = StringIO()
+        call_command(
+            "export_static_api",
+            "--output",
+            self.root,
+            "--base-url",
+            "http://testserver",
+            "--page-size",
+            "2",
+            *args,
+            stdout=output,
+        )
+        self.output = output.getvalue()
+        return self.read("manifest.json")
+
+    def read(self, name):
+        with open(os.path.join(self.root, "api", name), "rb") as f:
+            content = f.read()
+        with gzip.open(os.path.join(self.root, "api", f"{name}.gz")) as f:
+            self.assertEqual(f.read(), content)
+        return content
+
+    def test_files_match_api_responses(self):
+        paths = json.loads(self.export())["paths"]
+        project = self.projects[0]
+        expected = {
+            "projects.json": reverse("projects"),
+            f"projects/{project.pk}.json": reverse("project", args=[project.pk]),
+            "projects/facets.json": reverse("projects_facets"),
+        }
+        for name, url in expected.items():
+            with self.subTest(name=name):
+                content = self.client.get(url).content
+                self.assertEqual(self.read(name), content)
+                self.assertEqual(self.read(paths[name]), content)
+
+        page = json.loads(self.read("projects/pages/1.json"))
+        self.assertEqual(page["count"], 3)
+        self.assertEqual(len(page["results"]), 2)
+        self.assertEqual(
+            page["next"], "http://testserver/static/api/projects/pages/2.json"
+        )
+
+    def test_incremental_only_rewrites_changes(self):
+        old_paths = json.loads(self.export())["paths"]
+        self.export("--incremental")
+        self.assertIn("Written: 0,", self.output)
+
+        self.projects[0].name = "Proyecto Renombrado"
+        self.projects[0].save()
+        self.projects[1].delete()
+        paths = json.loads(self.export("--incremental"))["paths"]
+
+        name = f"projects/{self.projects[0].pk}.json"
+        self.assertNotEqual(paths[name], old_paths[name])
+        self.assertIn(b"Proyecto Renombrado", self.read(paths[name]))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, "api", old_paths[name]))
+        )
+        self.assertEqual(
+            paths[f"projects/{self.projects[2].pk}.json"],
+            old_paths[f"projects/{self.projects[2].pk}.json"],
+        )
+        removed = f"projects/{self.projects[1].pk}.json"
+        self.assertNotIn(removed, paths)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "api", removed)))
+
+    @override_settings(STATIC_ROOT=None)
+    def test_without_static_root(self):
+        # Sin STATIC_ROOT el comando no falla, así build.sh sigue adelante
+        output = StringIO()
+        call_command("export_static_api", stdout=output)
+        self.assertIn("skipping", output.getvalue())
+
+    def test_hashed_files_are_immutable(self):
+        middleware = AsyncWhiteNoiseMiddleware(lambda request: None)
+        self.assertTrue(
+            middleware.immutable_file_test(
+                "", "/static/api/projects/1.0123456789ab.json"
+            )
+        )
+        self.assertFalse(
+            middleware.immutable_file_test("", "/static/api/projects/1.json")
+        )
+        self.assertFalse(
+            middleware.immutable_file_test("", "/static/api/manifest.json")
+        )
+
+
+class ProjectDataExportTest(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        python = Technology.objects.create(name="Python")
+        django = Technology.objects.create(name="Django")
+        for index in range(3):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Proyecto para probar la exportación de datos.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.add(python, django)
+
+    def test_jsonl_command_includes_technologies(self):
+        path = os.path.join(self.root, "projects.jsonl.gz")
+        stdout = StringIO()
+        call_command(
+            "export_projects",
+            "--format",
+            "jsonl",
+            "--output",
+            path,
+            "--chunk-size",
+            "2",
+            stdout=stdout,
+        )
+        self.assertIn("Exported 3 rows", stdout.getvalue())
+
+        # La extensión .gz activa la compresión
+        with gzip.open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(
+            [row["name"] for row in rows], [f"Proyecto {i}" for i in range(3)]
+        )
+        self.assertEqual(rows[0]["technologies"], ["Python", "Django"])
+
+    def test_admin_action_streams_csv(self):
+        user = User.objects.create_superuser("admin", "admin@example.com")
+        self.client.force_login(user)
+        response = self.client.post(
+            reverse("admin:projects_project_changelist"),
+            {
+                "action": "export_csv",
+                "select_across": 1,
+                "index": 0,
+                "_selected_action": [Project.objects.first().pk],
+            },
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].endswith(",Python|Django"))
+
+    def test_admin_action_invalid_options(self):
+        # Unas opciones inválidas vuelven a mostrar el formulario con sus errores
+        user = User.objects.create_superuser("admin", "admin@example.com")
+        self.client.force_login(user)
+        data = {
+            "action": "export_csv",
+            "select_across": 0,
+            "index": 0,
+            "_selected_action": [Project.objects.first().pk],
+            "export_from": "ayer",
+        }
+        url = reverse("admin:projects_project_changelist")
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "admin/export_options.html")
+        self.assertTrue(response.context["form"].has_error("export_from"))
+        self.assertContains(response, 'name="action" value="export_csv"')
+
+        # Corregido el formulario, la exportación se descarga
+        data["export_from"] = "2000-01-01"
+        response = self.client.post(url, data)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+
+
+class ProjectImportTest(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        Technology.objects.create(name="Python")
+        self.rows = [
+            {
+                "name": f"Proyecto {index}",
+                "description": "Proyecto para probar la importación.",
+                "url": f"https://example.com/{index}",
+                "project_status": "available",
+                "technologies": ["Python", "Django"],
+            }
+            for index in range(3)
+        ]
+
+    def write(self, name, rows):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            json.dump(rows, f)
+        return path
+
+    def import_rows(self, rows, *args):
+        stdout = StringIO()
+        call_command(
+            "import_projects", self.write("projects.json", rows), *args, stdout=stdout
+        )
+        return stdout.getvalue()
+
+    def test_import_is_idempotent(self):
+        output = self.import_rows(self.rows, "--batch-size", "2")
+        self.assertIn("3 created, 0 updated, 0 unchanged", output)
+        self.assertIn("rows/s", output)
+        self.assertEqual(
+            list(Technology.objects.values_list("name", flat=True)),
+            ["Python", "Django"],
+        )
+        project = Project.objects.get(url="https://example.com/0")
+        self.assertEqual(
+            list(project.technologies.values_list("name", flat=True)),
+            ["Python", "Django"],
+        )
+
+        # Importar otra vez el mismo archivo no escribe nada
+        generation = get_generation(LIST_GENERATION_KEY)
+        with CaptureQueriesContext(connection) as queries:
+            output = self.import_rows(self.rows)
+        self.assertEqual(get_generation(LIST_GENERATION_KEY), generation)
+        self.assertIn("0 created, 0 updated, 3 unchanged", output)
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if query["sql"].startswith(("UPDATE", "DELETE"))
+            ]
+        )
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(Project.technologies.through.objects.count(), 6)
+
+    def test_updates_fields_technologies_and_caches(self):
+        self.import_rows(self.rows)
+        project = Project.objects.get(url="https://example.com/1")
+        client = APIClient()
+        client.get(reverse("project", args=[project.pk]))
+
+        self.rows[1]["description"] = "Descripción nueva."
+        self.rows[2]["technologies"] = ["Python", "Rust"]
+        output = self.import_rows(self.rows)
+
+        self.assertIn("0 created, 2 updated, 1 unchanged", output)
+        response = client.get(reverse("project", args=[project.pk]))
+        self.assertEqual(response.data["description"], "Descripción nueva.")
+        project = Project.objects.get(url="https://example.com/2")
+        self.assertEqual(
+            list(project.technologies.values_list("name", flat=True)),
+            ["Python", "Rust"],
+        )
+        self.assertEqual(search_project_ids("rust"), [project.pk])
+
+    def test_csv_round_trip(self):
+        self.import_rows(self.rows)
+        path = os.path.join(self.root, "projects.csv.gz")
+        call_command("export_projects", "--output", path, stdout=StringIO())
+
+        Project.objects.all().delete()
+        stdout = StringIO()
+        call_command("import_projects", path, stdout=stdout)
+        self.assertIn("3 created", stdout.getvalue())
+        project = Project.objects.get(url="https://example.com/0")
+        self.assertEqual(
+            list(project.technologies.values_list("name", flat=True)),
+            ["Python", "Django"],
+        )
+
+    def test_invalid_row(self):
+        self.rows[1]["project_status"] = "borrador"
+        with self.assertRaisesMessage(CommandError, "Row 2: project_status"):
+            self.import_rows(self.rows, "--batch-size", "1")
+        # Los lotes anteriores quedan importados
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_unique_technology_names(self):
+        with self.assertRaises(ValidationError):
+            Technology(name="Python").full_clean()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+    PROJECTS_SNAPSHOT=False,
+)
+class ProjectSparseFieldsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        python = Technology.objects.create(name="Python")
+        for index in range(3):
+            project = Project.objects.create(
+                name=f"Proyecto {index}",
+                description="Descripción larga que el menú no necesita.",
+                url=f"https://example.com/{index}",
+                project_status="available",
+            )
+            project.technologies.add(python)
+        self.project = project
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, [query["sql"] for query in context.captured_queries]
+
+    def test_fields_limit_serializer_and_columns(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(
+                PROJECTS_FAST_READ_PATH=fast
+            ):
+                response, queries = self.get(
+                    f"{reverse('projects')}?fields=name,url&limit=2"
+                )
+                self.assertEqual(response.status_code, HTTP_200_OK)
+                self.assertEqual(
+                    response.data["results"][0],
+                    {"name": "Proyecto 2", "url": "https://example.com/2"},
+                )
+                # Ni la descripción ni las tecnologías se leen de la base de datos
+                self.assertFalse([sql for sql in queries if "description" in sql])
+                self.assertFalse([sql for sql in queries if "technology" in sql])
+
+    def test_omit_on_detail(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(
+                PROJECTS_FAST_READ_PATH=fast
+            ):
+                response, queries = self.get(
+                    f"{reverse('project', args=[self.project.pk])}?omit=description"
+                )
+                self.assertNotIn("description", response.data)
+                self.assertEqual(response.data["technologies"], ["Python"])
+                self.assertFalse([sql for sql in queries if "description" in sql])
+
+    def test_snapshot_is_sliced(self):
+        url = f"{reverse('projects')}?fields=id,technologies"
+        expected = self.client.get(url).data
+        with override_settings(
+            PROJECTS_SNAPSHOT=True,
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            },
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response["X-Cache"], "SNAPSHOT")
+            self.assertEqual(response.data, expected)
+            response = self.client.get(
+                f"{reverse('project', args=[self.project.pk])}?fields=name"
+            )
+            self.assertEqual(response.data, {"name": "Proyecto 2"})
+
+    def test_async_views(self):
+        response, queries = self.get(f"{reverse('async_projects')}?fields=name&limit=1")
+        self.assertEqual(response.json()["results"], [{"name": "Proyecto 2"}])
+        self.assertFalse([sql for sql in queries if "description" in sql])
+
+        response = self.client.get(f"{reverse('async_projects')}?omit=nada")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_invalid_fields(self):
+        response = self.client.get(f"{reverse('projects')}?fields=name,secreto")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertIn("secreto", str(response.data["fields"]))
+
+        response = self.client.get(f"{reverse('projects')}?fields=")
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_field_set_validation_is_cached(self):
+        get_field_set.cache_clear()
+        url = f"{reverse('projects')}?fields=name"
+        self.client.get(url)
+        self.client.get(url)
+        info = get_field_set.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertGreater(info.hits, 0)
@@ -1,8 +1,18 @@
 from django.urls import path
 
-from .views import ProjectsListView, ProjectDetailView
+from .async_views import project_detail, projects_list
+from .views import (
+    ProjectsListView,
+    ProjectDetailView,
+    ProjectFacetsView,
+    ProjectSearchView,
+)
 
 urlpatterns = [
     path("projects/", ProjectsListView.as_view(), name="projects"),
+    path("projects/facets/", ProjectFacetsView.as_view(), name="projects_facets"),
+    path("projects/search/", ProjectSearchView.as_view(), name="projects_search"),
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project"),
+    path("async/projects/", projects_list, name="async_projects"),
+    path("async/projects/<int:pk>/", project_detail, name="async_project"),
 ]
@@ -1,16 +1,241 @@
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
 
+from portfolio_api.routers import pin_recent_write
+
+from . import snapshot
+from .cache import (
+    LIST_GENERATION_KEY,
+    generation_timestamp,
+    get_cached,
+    get_generation,
+    make_etag,
+    project_generation_key,
+    response_cache_key,
+    set_cached,
+)
+from .facets import get_facets
+from .fast import build_projects, get_values, is_enabled
+from .filters import ProjectFilterBackend
 from .models import Project
-from .serializers import ProjectSerializer
+from .pagination import LIMIT_OFFSET, ProjectPagination
+from .search import search_project_ids
+from .serializers import ProjectSerializer, get_columns, get_request_field_set
+
+
+class CachedResponseMixin:
+    """
+    Serve GET requests from the project version stamps before touching the DB.
+
+    The generation token of the resource gives the ETag, the Last-Modified
+    date and the response cache key, so a conditional request is answered
+    with a 304 and a repeated one from the cache without running the queryset
+    or the serializer.
+    """
+
+    def get_generation_key(self, request):
+        raise NotImplementedError
+
+    def get_snapshot_response(self, request, generation):
+        """
+        Return a response built from the in-memory snapshot, or ``None``.
+        """
+        return None
+
+    def get(self, request, *args, **kwargs):
+        generation_key = self.get_generation_key(request)
+        generation = get_generation(generation_key)
+        if generation is None:
+            # Without a stable token there is nothing to validate or cache by
+            return super().get(request, *args, **kwargs)
+
+        etag = make_etag(generation, request)
+        last_modified = int(generation_timestamp(generation))
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            not_modified["Last-Modified"] = http_date(last_modified)
+            return not_modified
+
+        # A response built now is kept for the whole generation, so it must
+        # not come from a replica that has not seen the change yet
+        pin_recent_write(generation_timestamp(generation))
+
+        response = self.get_snapshot_response(request, generation)
+        if response is not None:
+            response["X-Cache"] = "SNAPSHOT"
+        else:
+            key = response_cache_key(generation_key, generation, request)
+            data = get_cached(key)
+            if data is not None:
+                response = Response(data, headers={"X-Cache": "HIT"})
+            else:
+                response = super().get(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                set_cached(key, response.data)
+                response["X-Cache"] = "MISS"
 
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
 
-class ProjectsListView(ListAPIView):
-    queryset = Project.objects.all().order_by("-created_at")
+
+class SparseFieldsMixin:
+    """
+    Limit project responses to the fields named by ``?fields=`` or not named
+    by ``?omit=``.
+
+    The same field set drives the serializer and ``only()`` on the queryset,
+    so the columns of unrequested fields, such as ``description``, are not
+    read either. Responses are cached by full path, so each field set gets
+    its own cache entries.
+    """
+
+    def get_field_set(self):
+        return get_request_field_set(self.request)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_field_set()
+        if fields is None:
+            return queryset
+        if "technologies" not in fields:
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*get_columns(fields))
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_field_set())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ProjectsListView(CachedResponseMixin, SparseFieldsMixin, ListAPIView):
+    queryset = (
+        Project.objects.all()
+        .prefetch_related("technologies")
+        .order_by("-created_at", "-id")
+    )
     serializer_class = ProjectSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = ProjectPagination
+    filter_backends = [ProjectFilterBackend]
+
+    def get_generation_key(self, request):
+        return LIST_GENERATION_KEY
+
+    def get_snapshot_response(self, request, generation):
+        # Filtered and cursor paginated lists are answered by the database
+        if ProjectFilterBackend().is_filtered(request):
+            return None
+        if self.paginator.get_mode(request) != LIMIT_OFFSET:
+            return None
+
+        current = snapshot.get_snapshot(request, generation)
+        if current is None:
+            return None
 
+        fields = self.get_field_set()
+        page = self.paginate_queryset(current.projects)
+        if page is not None:
+            return self.get_paginated_response(snapshot.select_fields(page, fields))
+        if fields is not None:
+            return Response(snapshot.select_fields(current.projects, fields))
+        return snapshot.SnapshotResponse(current.projects, current.content)
 
-class ProjectDetailView(RetrieveAPIView):
+    def list(self, request, *args, **kwargs):
+        if not is_enabled():
+            return super().list(request, *args, **kwargs)
+
+        fields = self.get_field_set()
+        rows = get_values(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(build_projects(rows, request, fields))
+        return self.get_paginated_response(build_projects(page, request, fields))
+
+
+class ProjectDetailView(CachedResponseMixin, SparseFieldsMixin, RetrieveAPIView):
+    queryset = Project.objects.all().prefetch_related("technologies")
+    serializer_class = ProjectSerializer
+
+    def get_generation_key(self, request):
+        return project_generation_key(self.kwargs["pk"])
+
+    def get_snapshot_response(self, request, generation):
+        current = snapshot.get_snapshot(request)
+        if current is None:
+            return None
+
+        pk = self.kwargs["pk"]
+        if pk not in current.by_id:
+            raise Http404("No Project matches the given query.")
+        fields = self.get_field_set()
+        if fields is not None:
+            return Response(snapshot.select_fields([current.by_id[pk]], fields)[0])
+        return snapshot.SnapshotResponse(current.by_id[pk], current.detail_content[pk])
+
+    def retrieve(self, request, *args, **kwargs):
+        if not is_enabled():
+            return super().retrieve(request, *args, **kwargs)
+
+        fields = self.get_field_set()
+        rows = build_projects(
+            get_values(self.get_queryset().filter(pk=self.kwargs["pk"]), fields),
+            request,
+            fields,
+        )
+        if not rows:
+            raise Http404("No Project matches the given query.")
+        return Response(rows[0])
+
+
+class ProjectFacetsView(CachedResponseMixin, ListAPIView):
     queryset = Project.objects.all()
+    pagination_class = None
+
+    def get_generation_key(self, request):
+        return LIST_GENERATION_KEY
+
+    def list(self, request, *args, **kwargs):
+        backend = ProjectFilterBackend()
+        projects = self.get_queryset()
+        return Response(
+            get_facets(
+                technology_projects=backend.filter_statuses(request, projects),
+                status_projects=backend.filter_technologies(request, projects),
+            )
+        )
+
+
+class ProjectSearchView(CachedResponseMixin, SparseFieldsMixin, ListAPIView):
+    queryset = Project.objects.all().prefetch_related("technologies")
     serializer_class = ProjectSerializer
+    pagination_class = LimitOffsetPagination
+
+    def get_generation_key(self, request):
+        return LIST_GENERATION_KEY
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This parameter is required."]})
+
+        ids = search_project_ids(query)
+        page = self.paginate_queryset(ids)
+        selected = ids if page is None else page
+
+        projects = self.get_queryset().in_bulk(selected)
+        serializer = self.get_serializer(
+            [projects[pk] for pk in selected if pk in projects], many=True
+        )
+
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)